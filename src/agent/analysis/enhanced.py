@@ -34,6 +34,9 @@ from config.prompts.enhanced_analysis_prompt import (
 # Import memory QA (simple markdown-based memory)
 from ..feedback.memory_qa import MemoryQA
 from ..feedback.memory_engine import MemoryEngine
+from ..validators.playbook_index import get_playbook_index
+from ..core.playbook_retrieval import SCOPED_PLAYBOOK_NOTE, scope_playbook_for_prompt
+from ..core.protocol_projection import format_protocol_for_prompt
 
 # Import alert rules and suggestion validator (Wave 4.1 - Intelligence improvements)
 from .alert_rules import (
@@ -141,6 +144,10 @@ class EnhancedAnalyzer:
         self.impact_scorer = ImpactScorer()
         self.cost_estimator = CostEstimator()
         self.memory_qa = MemoryQA()  # Sistema simples de memória via markdown
+        # Chunks do playbook usados no último prompt (None = playbook completo)
+        self._playbook_context = None
+        # Projeção compacta do protocolo no último prompt (None = JSON completo)
+        self._protocol_projection = None
         logger.info(f"EnhancedAnalyzer initialized with model: {model}")
 
     def analyze_comprehensive(
@@ -203,6 +210,7 @@ class EnhancedAnalyzer:
         # Step 2: Build enhanced prompt
         logger.info("Step 2: Building enhanced analysis prompt...")
         # Base analysis vazio (V2 integration opcional para MVP)
+        # Playbook completo continua sendo usado na validação de referências
         base_analysis = {}
         prompt_structure = self._build_enhanced_prompt(
             protocol_json=protocol_json,
@@ -218,6 +226,10 @@ class EnhancedAnalyzer:
             logger.error(f"LLM analysis failed: {e}")
             raise
         
+        # Aliases da projeção compacta (node_id, json_path...) -> IDs originais
+        if self._protocol_projection is not None and isinstance(llm_result, dict):
+            llm_result = self._protocol_projection.restore_ids(llm_result)
+        
         # Step 4: Extract and process suggestions
         logger.info("Step 4: Extracting and processing suggestions...")
         suggestions = self._extract_suggestions(llm_result)
@@ -289,7 +301,10 @@ class EnhancedAnalyzer:
         memory_engine = MemoryEngine()
         memory_engine.load_memory()
         pre_memory_count = len(suggestions)
-        suggestions, memory_debug = memory_engine.filter_suggestions(suggestions)
+        suggestions, memory_debug = memory_engine.filter_suggestions(
+            suggestions,
+            protocol_id=Path(protocol_path).stem if protocol_path else None
+        )
         post_memory_count = len(suggestions)
 
         if pre_memory_count != post_memory_count:
@@ -490,21 +505,17 @@ class EnhancedAnalyzer:
         Returns:
             Prompt structure (string ou dict com caching)
         """
-        # Format protocol as JSON
-        try:
-            protocol_formatted = json.dumps(
-                protocol_json,
-                indent=2,
-                ensure_ascii=False,
-                sort_keys=False
-            )
-        except (TypeError, ValueError) as e:
-            logger.error(f"Failed to format protocol JSON: {e}")
-            protocol_formatted = str(protocol_json)
+        # Format protocol: projeção compacta com aliases ou JSON completo
+        protocol_formatted, self._protocol_projection = format_protocol_for_prompt(protocol_json)
         
         # Format base analysis as JSON
         base_analysis_formatted = json.dumps(base_analysis, indent=2, ensure_ascii=False) if base_analysis else "{}"
         
+        # Recuperação opcional: só os chunks do playbook relevantes ao protocolo
+        playbook_content, self._playbook_context = scope_playbook_for_prompt(playbook_content, protocol_json)
+        if self._playbook_context is not None:
+            playbook_content = SCOPED_PLAYBOOK_NOTE + playbook_content
+        
         # Carregar memória QA (memory_qa.md) - ANTES da análise
         memory_qa_content = self.memory_qa.get_memory_content(max_length=3000)
 
@@ -1211,8 +1222,9 @@ CRITICAL OUTPUT REQUIREMENTS:
         validated = []
         removed = []
 
-        # Normalizar playbook para comparação (case-insensitive, remove espaços extras)
-        playbook_normalized = " ".join(playbook_content.lower().split())
+        # Índice do playbook normalizado (case-insensitive, sem espaços extras),
+        # compartilhado com o ReferenceValidator
+        playbook_index = get_playbook_index(playbook_content)
 
         for sug in suggestions:
             should_keep = True
@@ -1270,7 +1282,7 @@ CRITICAL OUTPUT REQUIREMENTS:
                     found = False
                     for i in range(len(words) - 5):
                         snippet = " ".join(words[i:i+6])
-                        if len(snippet) >= 30 and snippet in playbook_normalized:
+                        if len(snippet) >= 30 and playbook_index.contains_phrase(words[i:i+6]):
                             found = True
                             break
                     
@@ -1278,7 +1290,7 @@ CRITICAL OUTPUT REQUIREMENTS:
                     if not found and len(words) >= 5:
                         for i in range(len(words) - 4):
                             snippet = " ".join(words[i:i+5])
-                            if len(snippet) >= 25 and snippet in playbook_normalized:
+                            if len(snippet) >= 25 and playbook_index.contains_phrase(words[i:i+5]):
                                 found = True
                                 break
 
@@ -103,6 +103,10 @@ def analyze(protocol_path: str, playbook_path: Optional[str] = None, model: Opti
         logger.error(f"LLM analysis failed: {e}")
         raise
     
+    # Translate protocol ID aliases (compact projection) back to the original IDs
+    if builder.last_protocol_projection is not None and isinstance(llm_result, dict):
+        llm_result = builder.last_protocol_projection.restore_ids(llm_result)
+    
     # Step 5: Validate response
     logger.info("Step 5: Validating LLM response")
     try:
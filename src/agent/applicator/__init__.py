@@ -8,10 +8,18 @@ Componentes:
 - ProtocolReconstructor: Reconstrução de protocolo JSON (MVP)
 - LLMClient: Cliente LLM especializado (skeleton)
 - version_utils: Utilitários para versionamento de protocolos
+- json_patch: Aplicação local de operações JSON Patch (RFC 6902)
+- DeterministicApplicator: Aplicação local de sugestões com implementation_path
+- ReconstructionCache: Cache em disco das seções reconstruídas
+- SuggestionRouter: Roteamento de sugestões para os nós afetados
 """
 
 from .improvement_applicator import ImprovementApplicator, ApplyResult
 from .protocol_reconstructor import ProtocolReconstructor, ReconstructionResult
+from .json_patch import apply_patch, JsonPatchError
+from .deterministic_applicator import DeterministicApplicator, DeterministicApplyResult
+from .reconstruction_cache import ReconstructionCache, section_cache_key
+from .suggestion_router import SuggestionRouter
 from .version_utils import (
     extract_version_from_protocol,
     increment_version,
@@ -26,6 +34,13 @@ __all__ = [
     "ApplyResult",
     "ProtocolReconstructor",
     "ReconstructionResult",
+    "apply_patch",
+    "JsonPatchError",
+    "DeterministicApplicator",
+    "DeterministicApplyResult",
+    "ReconstructionCache",
+    "section_cache_key",
+    "SuggestionRouter",
     "extract_version_from_protocol",
     "increment_version",
     "extract_version_from_filename",
@@ -0,0 +1,348 @@
+"""
+Deterministic Applicator - Aplicação local de sugestões com implementation_path
+
+Responsabilidades:
+- Executar edições totalmente especificadas (json_path + modification_type +
+  proposed_value) diretamente no dict do protocolo, sem LLM
+- Validar condicionais introduzidas com logic_validator antes de aplicar
+- Registrar changelog no nó modificado (mesmo formato usado pelo LLM)
+- Devolver as sugestões que não puderam ser aplicadas mecanicamente,
+  que seguem para a reconstrução via LLM
+
+Formato esperado (ver SuggestionValidator._has_required_fields):
+    "implementation_path": {
+        "json_path": "nodes[14].data.condutaDataNode.mensagem",
+        "modification_type": "add_message",
+        "proposed_value": {"id": "msg-...", "nome": "...", "conteudo": "<p>...</p>"}
+    }
+"""
+
+import copy
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..core.logger import logger
+
+
+# modification_type -> lista alvo quando json_path aponta para o container
+ADD_TYPE_TARGET_KEYS = {
+    "add_message": "mensagem",
+    "add_alert": "mensagem",
+    "add_orientation": "orientacao",
+    "add_exam": "exame",
+    "add_medication": "medicamento",
+    "add_referral": "encaminhamento",
+    "add_option": "options",
+    "add_question": "questions",
+}
+
+ADD_TYPES = set(ADD_TYPE_TARGET_KEYS) | {"add"}
+MODIFY_TYPES = {"modify_condition", "modify_text", "modify_option", "update", "conditional"}
+
+# Campos que contêm expressões condicionais
+CONDITIONAL_FIELDS = ("condicao", "expressao")
+
+_PATH_TOKEN_RE = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+_PLACEHOLDER_RE = re.compile(r"\[[^\]]*\]")
+
+
+class DeterministicApplyError(ValueError):
+    """Sugestão não pode ser aplicada mecanicamente."""
+
+
+@dataclass
+class DeterministicApplyResult:
+    """Resultado da aplicação determinística."""
+    protocol: Dict
+    applied: List[Dict] = field(default_factory=list)
+    pending: List[Dict] = field(default_factory=list)
+    details: List[Dict] = field(default_factory=list)
+
+
+def parse_json_path(json_path: str) -> List[Union[str, int]]:
+    """
+    Converte json_path no formato das sugestões em tokens.
+
+    Args:
+        json_path: Ex: "nodes[14].data.condutaDataNode.mensagem"
+
+    Returns:
+        Ex: ["nodes", 14, "data", "condutaDataNode", "mensagem"]
+    """
+    if not isinstance(json_path, str) or not json_path.strip():
+        raise DeterministicApplyError("Empty json_path")
+
+    path = json_path.strip()
+    if path.startswith("$"):
+        path = path[1:].lstrip(".")
+
+    tokens: List[Union[str, int]] = []
+    position = 0
+    for match in _PATH_TOKEN_RE.finditer(path):
+        gap = path[position:match.start()].strip(".")
+        if gap:
+            raise DeterministicApplyError(f"Unparseable json_path: {json_path!r}")
+        key, index = match.groups()
+        tokens.append(int(index) if index is not None else key)
+        position = match.end()
+
+    if path[position:].strip(".") or not tokens:
+        raise DeterministicApplyError(f"Unparseable json_path: {json_path!r}")
+    return tokens
+
+
+class DeterministicApplicator:
+    """
+    Aplica localmente sugestões com implementation_path bem formado.
+
+    Sugestões que não puderem ser aplicadas (tipo não suportado, path
+    inexistente, placeholder, conflito de id, condicional inválida)
+    são devolvidas em `pending` sem alterar o protocolo.
+    """
+
+    def __init__(self, add_changelog: bool = True):
+        """
+        Inicializa o applicator.
+
+        Args:
+            add_changelog: Registrar [CHANGELOG] na descricao do nó modificado
+        """
+        self.add_changelog = add_changelog
+
+    def apply(
+        self,
+        protocol: Dict,
+        suggestions: List[Dict],
+        new_version: Optional[str] = None
+    ) -> DeterministicApplyResult:
+        """
+        Aplica as sugestões possíveis em uma cópia do protocolo.
+
+        Args:
+            protocol: Protocolo original (não é modificado)
+            suggestions: Sugestões a aplicar
+            new_version: Versão para as entradas de changelog
+
+        Returns:
+            DeterministicApplyResult com protocolo alterado, aplicadas e pendentes
+        """
+        result = DeterministicApplyResult(protocol=copy.deepcopy(protocol))
+        validator = self._build_conditional_validator(result.protocol)
+
+        for suggestion in suggestions:
+            sug_id = suggestion.get("id", "N/A")
+            try:
+                node = self._apply_one(result.protocol, suggestion, validator)
+            except DeterministicApplyError as e:
+                result.pending.append(suggestion)
+                result.details.append({"suggestion_id": sug_id, "status": "pending", "reason": str(e)})
+                logger.debug(f"Suggestion {sug_id} routed to LLM: {e}")
+                continue
+
+            if self.add_changelog and node is not None and new_version:
+                self._append_changelog(node, suggestion, new_version)
+
+            result.applied.append(suggestion)
+            result.details.append({
+                "suggestion_id": sug_id,
+                "status": "applied",
+                "node_id": node.get("id") if node else None
+            })
+
+        logger.info(
+            f"Deterministic applicator: {len(result.applied)} applied locally, "
+            f"{len(result.pending)} pending for LLM"
+        )
+        return result
+
+    def _apply_one(
+        self,
+        protocol: Dict,
+        suggestion: Dict,
+        validator: Any
+    ) -> Optional[Dict]:
+        """
+        Aplica uma sugestão. Levanta DeterministicApplyError sem alterar nada se não for possível.
+
+        Returns:
+            Nó afetado (para changelog) ou None
+        """
+        impl_path = suggestion.get("implementation_path")
+        if not isinstance(impl_path, dict):
+            raise DeterministicApplyError("No implementation_path")
+
+        mod_type = str(impl_path.get("modification_type") or "").strip().lower()
+        proposed = copy.deepcopy(impl_path.get("proposed_value"))
+        if mod_type not in ADD_TYPES and mod_type not in MODIFY_TYPES:
+            raise DeterministicApplyError(f"Unsupported modification_type: {mod_type or 'N/A'}")
+        if proposed in (None, "", {}):
+            raise DeterministicApplyError("Empty proposed_value")
+
+        tokens = parse_json_path(impl_path.get("json_path", ""))
+        tokens = self._resolve_node_index(protocol, tokens, suggestion)
+        node = self._owning_node(protocol, tokens)
+        parent, key, target = self._resolve(protocol, tokens)
+
+        if mod_type in ADD_TYPES:
+            if isinstance(target, dict) and mod_type in ADD_TYPE_TARGET_KEYS:
+                list_key = ADD_TYPE_TARGET_KEYS[mod_type]
+                if list_key not in target:
+                    raise DeterministicApplyError(f"Target has no '{list_key}' list")
+                target = target[list_key]
+            if not isinstance(target, list):
+                raise DeterministicApplyError("add target is not a list")
+            if not isinstance(proposed, dict) or not proposed.get("id"):
+                raise DeterministicApplyError("add proposed_value must be an object with 'id'")
+            self._check_no_placeholder_id(proposed)
+
+            existing = [item for item in target if isinstance(item, dict) and item.get("id") == proposed["id"]]
+            if existing:
+                if existing[0] == proposed:
+                    return None  # Já aplicado (idempotente, sem novo changelog)
+                raise DeterministicApplyError(f"Item id already exists: {proposed['id']}")
+
+            self._validate_conditionals(validator, proposed, context=str(proposed["id"]))
+            target.append(proposed)
+            return node
+
+        # MODIFY
+        if isinstance(target, dict):
+            if isinstance(proposed, str):
+                if mod_type not in ("modify_condition", "conditional"):
+                    raise DeterministicApplyError("Ambiguous string value for object target")
+                updates = {"condicao": proposed}
+            elif isinstance(proposed, dict):
+                if proposed.get("id") and target.get("id") and proposed["id"] != target["id"]:
+                    raise DeterministicApplyError(
+                        f"proposed_value id {proposed['id']} does not match target {target['id']}"
+                    )
+                updates = {k: v for k, v in proposed.items() if k != "id"}
+            else:
+                raise DeterministicApplyError("Unsupported proposed_value type")
+
+            self._validate_conditionals(validator, updates, context=str(target.get("id", key)))
+            target.update(updates)
+            return node
+
+        if isinstance(target, (str, int, float, bool)) or target is None:
+            if isinstance(proposed, (dict, list)):
+                raise DeterministicApplyError("Object proposed_value for scalar target")
+            if key in CONDITIONAL_FIELDS:
+                self._validate_conditionals(validator, {key: proposed}, context=str(key))
+            parent[key] = proposed
+            return node
+
+        raise DeterministicApplyError(f"Cannot modify target of type {type(target).__name__}")
+
+    def _resolve_node_index(
+        self,
+        protocol: Dict,
+        tokens: List[Union[str, int]],
+        suggestion: Dict
+    ) -> List[Union[str, int]]:
+        """
+        Corrige nodes[i] quando specific_location.node_id aponta para outro nó.
+
+        Índices gerados pelo LLM nem sempre batem com a posição real; o
+        node_id é mais confiável quando identifica um nó do protocolo.
+        """
+        if len(tokens) < 2 or tokens[0] != "nodes" or not isinstance(tokens[1], int):
+            return tokens
+
+        location = suggestion.get("specific_location") or {}
+        node_id = location.get("node_id") if isinstance(location, dict) else getattr(location, "node_id", None)
+        if not node_id:
+            return tokens
+
+        nodes = protocol.get("nodes") or []
+        if tokens[1] < len(nodes) and nodes[tokens[1]].get("id") == node_id:
+            return tokens
+
+        for index, node in enumerate(nodes):
+            if node.get("id") == node_id:
+                return ["nodes", index] + list(tokens[2:])
+        return tokens
+
+    def _owning_node(self, protocol: Dict, tokens: List[Union[str, int]]) -> Optional[Dict]:
+        """Nó que contém o path (para changelog)."""
+        if len(tokens) >= 2 and tokens[0] == "nodes" and isinstance(tokens[1], int):
+            nodes = protocol.get("nodes") or []
+            if tokens[1] < len(nodes):
+                return nodes[tokens[1]]
+        return None
+
+    def _resolve(
+        self,
+        document: Any,
+        tokens: List[Union[str, int]]
+    ) -> Tuple[Any, Union[str, int], Any]:
+        """Retorna (pai, chave, valor) do path; erro se algum segmento não existir."""
+        parent, key, current = None, None, document
+        for token in tokens:
+            parent, key = current, token
+            if isinstance(current, dict) and isinstance(token, str) and token in current:
+                current = current[token]
+            elif isinstance(current, list) and isinstance(token, int) and 0 <= token < len(current):
+                current = current[token]
+            else:
+                raise DeterministicApplyError(f"Path segment not found: {token!r}")
+        return parent, key, current
+
+    def _check_no_placeholder_id(self, proposed: Dict) -> None:
+        """Rejeita ids de template (ex: "msg-medico-[identificador]")."""
+        if _PLACEHOLDER_RE.search(str(proposed.get("id", ""))):
+            raise DeterministicApplyError(f"Placeholder id: {proposed['id']}")
+
+    def _build_conditional_validator(self, protocol: Dict):
+        """ConditionalExpressionValidator com os UIDs/option ids do protocolo (ou None)."""
+        try:
+            from ..validators.logic_validator import ConditionalExpressionValidator
+        except ImportError:
+            logger.warning("logic_validator not available, skipping conditional checks")
+            return None
+
+        valid_uids, valid_option_ids = set(), set()
+        for node in protocol.get("nodes") or []:
+            for question in (node.get("data") or {}).get("questions") or []:
+                if not isinstance(question, dict):
+                    continue
+                if question.get("uid"):
+                    valid_uids.add(question["uid"])
+                for option in question.get("options") or []:
+                    if isinstance(option, dict) and option.get("id"):
+                        valid_option_ids.add(option["id"])
+        return ConditionalExpressionValidator(valid_uids, valid_option_ids)
+
+    def _validate_conditionals(self, validator: Any, values: Dict, context: str) -> None:
+        """Sanitiza e valida condicionais em `values` (in-place); erro se inválidas."""
+        if validator is None:
+            return
+        from ..validators.logic_validator import sanitize_conditional_expression
+
+        for field_name in CONDITIONAL_FIELDS:
+            expression = values.get(field_name)
+            if not expression or not isinstance(expression, str):
+                continue
+            expression = sanitize_conditional_expression(expression)
+            is_valid, warnings = validator.validate(expression, context=f"{context}.{field_name}")
+            if not is_valid:
+                raise DeterministicApplyError(f"Invalid {field_name}: {warnings[:1]}")
+            values[field_name] = expression
+
+    def _append_changelog(self, node: Dict, suggestion: Dict, new_version: str) -> None:
+        """Adiciona entrada [CHANGELOG] à descricao do nó."""
+        data = node.setdefault("data", {})
+        impl_path = suggestion.get("implementation_path") or {}
+        reason = suggestion.get("rationale") or suggestion.get("description") or "N/A"
+        if len(reason) > 200:
+            reason = reason[:197] + "..."
+
+        entry = (
+            f"[CHANGELOG v{new_version}]: {suggestion.get('title', 'N/A')}\n"
+            f"- Changed: {impl_path.get('modification_type')} em {impl_path.get('json_path')}\n"
+            f"- Reason: {reason}\n"
+            f"- Suggestion ID: {suggestion.get('id', 'N/A')}"
+        )
+        existing = data.get("descricao") or ""
+        data["descricao"] = f"{existing}\n\n{entry}" if existing else entry
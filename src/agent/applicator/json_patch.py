@@ -0,0 +1,176 @@
+"""
+JSON Patch - Aplicação local de operações RFC 6902
+
+Responsabilidades:
+- Interpretar JSON Pointers (RFC 6901)
+- Aplicar operações add/remove/replace/move/copy/test em um documento
+- Rejeitar patches malformados com JsonPatchError (sem aplicar parcialmente)
+
+Usado pela reconstrução em modo patch: o LLM devolve apenas as operações
+e o documento é alterado localmente.
+"""
+
+import copy
+from typing import Any, Dict, List
+
+
+class JsonPatchError(ValueError):
+    """Patch inválido ou que não se aplica ao documento."""
+
+
+VALID_OPERATIONS = {"add", "remove", "replace", "move", "copy", "test"}
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    Converte JSON Pointer em lista de tokens.
+
+    Args:
+        pointer: Ex: "/node-1/data/questions/0/options/-"
+
+    Returns:
+        Lista de tokens (com ~1 -> "/" e ~0 -> "~" decodificados)
+    """
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"Pointer must be a string, got {type(pointer).__name__}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Pointer must start with '/': {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _list_index(container: List, token: str, allow_end: bool = False) -> int:
+    """Resolve token de lista ("-" só é válido para add)."""
+    if token == "-":
+        if allow_end:
+            return len(container)
+        raise JsonPatchError("'-' index only valid for add")
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"Invalid list index: {token!r}")
+    index = int(token)
+    upper = len(container) if allow_end else len(container) - 1
+    if index > upper:
+        raise JsonPatchError(f"List index out of range: {index}")
+    return index
+
+
+def _resolve_parent(document: Any, tokens: List[str]):
+    """Retorna (container pai, último token)."""
+    if not tokens:
+        raise JsonPatchError("Operation on document root is not allowed")
+
+    current = document
+    for token in tokens[:-1]:
+        if isinstance(current, dict):
+            if token not in current:
+                raise JsonPatchError(f"Path segment not found: {token!r}")
+            current = current[token]
+        elif isinstance(current, list):
+            current = current[_list_index(current, token)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into {type(current).__name__} at {token!r}")
+    return current, tokens[-1]
+
+
+def get_value(document: Any, pointer: str) -> Any:
+    """Lê o valor apontado por `pointer`."""
+    current = document
+    for token in parse_pointer(pointer):
+        if isinstance(current, dict):
+            if token not in current:
+                raise JsonPatchError(f"Path not found: {pointer}")
+            current = current[token]
+        elif isinstance(current, list):
+            current = current[_list_index(current, token)]
+        else:
+            raise JsonPatchError(f"Path not found: {pointer}")
+    return current
+
+
+def _add(document: Any, pointer: str, value: Any) -> None:
+    parent, token = _resolve_parent(document, parse_pointer(pointer))
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add into {type(parent).__name__}: {pointer}")
+
+
+def _remove(document: Any, pointer: str) -> Any:
+    parent, token = _resolve_parent(document, parse_pointer(pointer))
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {pointer}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, token))
+    raise JsonPatchError(f"Cannot remove from {type(parent).__name__}: {pointer}")
+
+
+def _replace(document: Any, pointer: str, value: Any) -> None:
+    parent, token = _resolve_parent(document, parse_pointer(pointer))
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {pointer}")
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent[_list_index(parent, token)] = value
+    else:
+        raise JsonPatchError(f"Cannot replace in {type(parent).__name__}: {pointer}")
+
+
+def apply_patch(document: Any, operations: List[Dict], in_place: bool = False) -> Any:
+    """
+    Aplica uma lista de operações RFC 6902.
+
+    A aplicação é atômica: se qualquer operação falhar, JsonPatchError é
+    levantado e o documento original não é alterado (a menos que in_place=True).
+
+    Args:
+        document: Documento JSON (dict/list)
+        operations: Lista de operações {"op", "path", "value"/"from"}
+        in_place: Alterar o documento recebido em vez de uma cópia
+
+    Returns:
+        Documento com o patch aplicado
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("Patch must be a list of operations")
+
+    result = document if in_place else copy.deepcopy(document)
+
+    for i, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise JsonPatchError(f"Operation #{i} is not an object")
+
+        op = operation.get("op")
+        path = operation.get("path")
+        if op not in VALID_OPERATIONS:
+            raise JsonPatchError(f"Operation #{i} has invalid op: {op!r}")
+        if path is None:
+            raise JsonPatchError(f"Operation #{i} missing 'path'")
+
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"Operation #{i} ({op}) missing 'value'")
+        if op in ("move", "copy") and "from" not in operation:
+            raise JsonPatchError(f"Operation #{i} ({op}) missing 'from'")
+
+        if op == "add":
+            _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(result, path)
+        elif op == "replace":
+            _replace(result, path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            if path.startswith(operation["from"] + "/"):
+                raise JsonPatchError(f"Operation #{i} moves a value into itself")
+            _add(result, path, _remove(result, operation["from"]))
+        elif op == "copy":
+            _add(result, path, copy.deepcopy(get_value(result, operation["from"])))
+        elif op == "test":
+            if get_value(result, path) != operation["value"]:
+                raise JsonPatchError(f"Operation #{i} test failed at {path}")
+
+    return result
@@ -15,15 +15,47 @@ import sys
 import json
 import time
 import re
-from typing import Dict, List, Optional, Tuple
+import asyncio
+import copy
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
 from ..core.logger import logger
-from ..core.llm_client import LLMClient
+from ..core.llm_client import LLMClient, run_sync
+from ..core.protocol_projection import COMPACT_NODES_NOTE, ProtocolProjection
 from ..cost_control import CostEstimator, CostEstimate
 from ..analysis.enhanced import ExpandedAnalysisResult
+from .json_patch import JsonPatchError, apply_patch, get_value, parse_pointer
+from .reconstruction_cache import ReconstructionCache, section_cache_key
+from .suggestion_router import SuggestionRouter
+
+
+# Listas de itens de um nó de conduta (chunking por item id)
+CONDUCT_ITEM_KEYS = ("exame", "mensagem", "medicamento", "orientacao", "encaminhamento")
+
+# Versão dos prompts de seção (entra na chave do cache de reconstrução).
+# Incrementar sempre que _build_section_*_prompt mudar de forma relevante.
+SECTION_PROMPT_VERSION = "sections-2"
+
+
+def _mentions(text: str, term: str, identifier: bool = False) -> bool:
+    """
+    term aparece em text como palavra inteira (identificadores também não
+    podem continuar com "-": "ex1" não casa com "ex10" nem com "ex1-b").
+    """
+    edge = r"[\w-]" if identifier else r"\w"
+    return re.search(rf"(?<!{edge}){re.escape(term)}(?!{edge})", text) is not None
+
+
+def _reconstruction_setting(name: str, default):
+    """Lê uma opção de config.yaml -> reconstruction (default se indisponível)."""
+    try:
+        from ..core.config_loader import get_config
+        return getattr(get_config().reconstruction, name, default)
+    except Exception:
+        return default
 
 
 @dataclass
@@ -41,7 +73,7 @@ class ReconstructionResult:
 class SectionReconstructionStatus:
     """Status de reconstrução de uma seção do protocolo."""
     section_id: str
-    status: str  # "pending", "in_progress", "completed", "failed"
+    status: str  # "pending", "in_progress", "completed", "failed", "cancelled"
     reconstructed_data: Optional[Dict] = None
     error_message: Optional[str] = None
     retry_count: int = 0
@@ -56,16 +88,35 @@ class ProtocolReconstructor:
     com controle rigoroso de custos e autorização.
     """
 
-    def __init__(self, model: str = "google/gemini-2.5-flash-lite"):
+    def __init__(
+        self,
+        model: str = "google/gemini-2.5-flash-lite",
+        section_callback: Optional[Callable[[str, str], None]] = None
+    ):
         """
         Inicializa o reconstrutor de protocolo.
         
         Args:
             model: Modelo LLM a ser utilizado (default: Gemini 2.5 Flash Lite - barato e estável)
+            section_callback: Chamado com (section_id, cache_key) a cada seção
+                concluída via LLM ou cache (ex: checkpoints de sessão)
         """
         self.model = model
         self.llm_client = LLMClient(model=model)
         self.cost_estimator = CostEstimator()
+        self.section_callback = section_callback
+        # Cache endereçado por conteúdo das seções concluídas (retomada após falha)
+        self.section_cache: Optional[ReconstructionCache] = None
+        if _reconstruction_setting("section_cache", True):
+            self.section_cache = ReconstructionCache(
+                _reconstruction_setting("section_cache_dir", ".reconstruction_cache")
+            )
+        # Estatísticas da última reconstrução (seções locais vs LLM)
+        self.last_section_stats: Dict = {}
+        # Sugestões sem nó identificável na última enumeração (enviadas com a 1ª seção de nós)
+        self.last_unrouted_suggestions: List[Dict] = []
+        # Projeção do protocolo inteiro: mapa de aliases compartilhado pelas seções
+        self._protocol_projection: Optional[ProtocolProjection] = None
         logger.info(f"ProtocolReconstructor initialized with model: {model}")
 
     def reconstruct_protocol(
@@ -158,7 +209,9 @@ class ProtocolReconstructor:
                     "timestamp": datetime.now().isoformat(),
                     "model_used": self.model,
                     "original_version": current_version,
-                    "new_version": new_version if current_version else None
+                    "new_version": new_version if current_version else None,
+                    "llm_calls_saved": self.last_section_stats.get("llm_calls_saved", 0),
+                    "section_stats": dict(self.last_section_stats)
                 }
             )
             
@@ -230,6 +283,23 @@ class ProtocolReconstructor:
         current_version = extract_version_from_protocol(original_protocol)
         new_version = increment_version(current_version, "patch") if current_version else "1.0.1"
 
+        # Aliases do protocolo recebido (mesma numeração da análise), antes das edições locais
+        self._protocol_projection = None
+        if _reconstruction_setting("compact_protocol_prompt", True):
+            self._protocol_projection = ProtocolProjection(original_protocol)
+
+        # Step 1.5: Apply fully specified implementation_path edits locally
+        deterministic_applied = 0
+        if _reconstruction_setting("deterministic_apply", True):
+            from .deterministic_applicator import DeterministicApplicator
+            applicator = DeterministicApplicator(
+                add_changelog=_reconstruction_setting("add_changelog_to_nodes", True)
+            )
+            deterministic = applicator.apply(original_protocol, suggestions, new_version=new_version)
+            original_protocol = deterministic.protocol
+            suggestions = deterministic.pending
+            deterministic_applied = len(deterministic.applied)
+
         # Step 2: Enumerate sections
         sections = self._enumerate_sections(original_protocol, suggestions)
         logger.info(f"Protocol divided into {len(sections)} sections")
@@ -237,33 +307,100 @@ class ProtocolReconstructor:
         # Step 3: Initialize tracking
         section_statuses = self._track_section_progress(sections)
 
-        # Step 4: Reconstruct each section
+        # Step 3.5: Resolve sections that don't need the LLM (metadata bump, untouched nodes)
+        llm_sections = []
         for section in sections:
-            section_id = section["section_id"]
-            logger.info(f"Processing {section_id}...")
-
-            try:
-                section_statuses[section_id].status = "in_progress"
+            local_data = self._reconstruct_section_locally(section, new_version)
+            if local_data is None:
+                llm_sections.append(section)
+                continue
+            status = section_statuses[section["section_id"]]
+            status.status = "completed"
+            status.reconstructed_data = local_data
+            status.timestamp = datetime.now().isoformat()
+        local_sections = len(sections) - len(llm_sections)
+
+        # Step 3.6: Reuse sections completed by a previous (failed/interrupted) run
+        cache_hits = 0
+        if self.section_cache is not None:
+            pending_sections = []
+            for section in llm_sections:
+                cached = self._load_cached_section(section, new_version)
+                if cached is None:
+                    pending_sections.append(section)
+                    continue
+                status = section_statuses[section["section_id"]]
+                status.status = "completed"
+                status.reconstructed_data = cached
+                status.timestamp = datetime.now().isoformat()
+                cache_hits += 1
+            llm_sections = pending_sections
+
+        self.last_section_stats = {
+            "sections_total": len(sections),
+            "llm_sections": len(llm_sections),
+            "local_sections": local_sections,
+            "cache_hits": cache_hits,
+            "llm_calls_saved": len(sections) - len(llm_sections),
+            "deterministic_suggestions": deterministic_applied,
+            "llm_suggestions": len(suggestions),
+            "unrouted_suggestions": len(self.last_unrouted_suggestions),
+            "cache_keys": {
+                section["section_id"]: section["_cache_key"]
+                for section in sections if section.get("_cache_key")
+            },
+        }
+        logger.info(
+            f"{local_sections}/{len(sections)} sections resolved locally, {cache_hits} from cache "
+            f"({len(llm_sections)} LLM calls needed)"
+        )
+        all_sections = sections
+        sections = llm_sections
+
+        # Step 4: Reconstruct each section (parallel when enabled)
+        max_retries = _reconstruction_setting("max_section_retries", 3)
+        parallel = _reconstruction_setting("parallel_sections", True)
+        max_workers = _reconstruction_setting("max_parallel_sections", 4)
+
+        if parallel and max_workers > 1 and len(sections) > 1:
+            logger.info(f"Reconstructing {len(sections)} sections in parallel (workers={max_workers})")
+            run_sync(self._reconstruct_sections_parallel(
+                sections=sections,
+                section_statuses=section_statuses,
+                new_version=new_version,
+                max_retries=max_retries,
+                max_workers=max_workers
+            ))
+        else:
+            for section in sections:
+                section_id = section["section_id"]
+                logger.info(f"Processing {section_id}...")
+
+                try:
+                    section_statuses[section_id].status = "in_progress"
+
+                    # Reconstruct with retry
+                    reconstructed_data = self._reconstruct_section_with_retry(
+                        section=section,
+                        new_version=new_version,
+                        max_retries=max_retries
+                    )
 
-                # Reconstruct with retry
-                reconstructed_data = self._reconstruct_section_with_retry(
-                    section=section,
-                    new_version=new_version,
-                    max_retries=3
-                )
+                    # Update status
+                    section_statuses[section_id].status = "completed"
+                    section_statuses[section_id].reconstructed_data = reconstructed_data
+                    section_statuses[section_id].timestamp = datetime.now().isoformat()
 
-                # Update status
-                section_statuses[section_id].status = "completed"
-                section_statuses[section_id].reconstructed_data = reconstructed_data
-                section_statuses[section_id].timestamp = datetime.now().isoformat()
+                    logger.info(f"{section_id} completed successfully")
 
-                logger.info(f"{section_id} completed successfully")
+                except Exception as e:
+                    section_statuses[section_id].status = "failed"
+                    section_statuses[section_id].error_message = str(e)
+                    logger.error(f"{section_id} failed: {e}", exc_info=True)
+                    raise ValueError(f"Section reconstruction failed: {section_id}") from e
 
-            except Exception as e:
-                section_statuses[section_id].status = "failed"
-                section_statuses[section_id].error_message = str(e)
-                logger.error(f"{section_id} failed: {e}", exc_info=True)
-                raise ValueError(f"Section reconstruction failed: {section_id}") from e
+        # Step 4.5: Reassemble chunked nodes
+        section_statuses = self._merge_node_chunks(all_sections, section_statuses)
 
         # Step 5: Assemble protocol
         assembled_protocol = self._assemble_protocol(original_protocol, section_statuses)
@@ -291,6 +428,75 @@ class ProtocolReconstructor:
         logger.info("Chunked reconstruction completed successfully")
         return assembled_protocol
 
+    async def _reconstruct_sections_parallel(
+        self,
+        sections: List[Dict],
+        section_statuses: Dict[str, SectionReconstructionStatus],
+        new_version: str,
+        max_retries: int = 3,
+        max_workers: int = 4
+    ) -> None:
+        """
+        Reconstrói seções concorrentemente (no máximo max_workers ao mesmo tempo).
+
+        Cada seção é independente até _assemble_protocol, então as chamadas LLM
+        podem se sobrepor. Fail-fast: quando uma seção esgota os retries, as
+        seções pendentes/em andamento são canceladas e o erro é propagado.
+
+        Args:
+            sections: Descritores de seções
+            section_statuses: Tracking por seção (atualizado in-place)
+            new_version: Nova versão
+            max_retries: Tentativas por seção
+            max_workers: Seções simultâneas
+
+        Raises:
+            ValueError: Se alguma seção falhar
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run_section(section: Dict) -> None:
+            section_id = section["section_id"]
+            status = section_statuses[section_id]
+
+            try:
+                async with semaphore:
+                    logger.info(f"Processing {section_id}...")
+                    status.status = "in_progress"
+                    reconstructed_data = await self._reconstruct_section_with_retry_async(
+                        section=section,
+                        new_version=new_version,
+                        max_retries=max_retries
+                    )
+            except asyncio.CancelledError:
+                status.status = "cancelled"
+                status.timestamp = datetime.now().isoformat()
+                raise
+            except Exception as e:
+                status.status = "failed"
+                status.error_message = str(e)
+                logger.error(f"{section_id} failed: {e}", exc_info=True)
+                raise ValueError(f"Section reconstruction failed: {section_id}") from e
+
+            status.status = "completed"
+            status.reconstructed_data = reconstructed_data
+            status.timestamp = datetime.now().isoformat()
+            logger.info(f"{section_id} completed successfully")
+
+        tasks = [asyncio.create_task(run_section(section)) for section in sections]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Fail fast: cancelar seções ainda pendentes ou em andamento
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            cancelled = sum(1 for st in section_statuses.values() if st.status == "cancelled")
+            if cancelled:
+                logger.warning(f"Cancelled {cancelled} outstanding section(s) after failure")
+            raise
+
     def _build_reconstruction_prompt(
         self,
         original_protocol: Dict,
@@ -745,10 +951,11 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
         """
         Enumera seções do protocolo para reconstrução chunked.
 
-        Divide o protocolo em seções lógicas baseadas no tamanho:
-        - Small (< 50KB): 2-3 nodes por seção
-        - Medium (50-100KB): 2 nodes por seção
-        - Large (> 100KB): 1-2 nodes por seção
+        Divide o protocolo em seções empacotando nós sob um orçamento de
+        tokens (reconstruction.section_token_budget), preferindo agrupar nós
+        adjacentes no grafo de edges (ver _partition_nodes). Cada seção recebe
+        apenas as sugestões roteadas para os seus nós (ver SuggestionRouter);
+        as que não puderem ser roteadas vão com a primeira seção de nós.
 
         Args:
             protocol: Protocolo original
@@ -759,14 +966,7 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
         """
         # Calculate protocol size
         protocol_size = len(json.dumps(protocol, ensure_ascii=False))
-
-        # Determine nodes per section based on size
-        if protocol_size < 50000:  # < 50KB
-            nodes_per_section = 3
-        elif protocol_size < 100000:  # 50-100KB
-            nodes_per_section = 2
-        else:  # > 100KB
-            nodes_per_section = 1
+        token_budget = _reconstruction_setting("section_token_budget", 8000)
 
         nodes = protocol.get("nodes", [])
         edges = protocol.get("edges", [])
@@ -781,14 +981,26 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
             "metadata": metadata
         })
 
-        # Create node sections
+        # Route each suggestion once to the nodes it affects
+        router = SuggestionRouter(protocol)
+        suggestion_targets = [set(router.route(sug)) for sug in suggestions]
+        self.last_unrouted_suggestions = [
+            sug for sug, targets in zip(suggestions, suggestion_targets) if not targets
+        ]
+        if self.last_unrouted_suggestions:
+            logger.warning(
+                f"{len(self.last_unrouted_suggestions)} suggestion(s) could not be routed to any node, "
+                f"sending them with the first node section: "
+                f"{[sug.get('id') for sug in self.last_unrouted_suggestions]}"
+            )
+
+        # Create node sections (token-budgeted, graph-aware packing)
+        node_groups = self._partition_nodes(nodes, edges, token_budget)
         idx = 1
-        for i in range(0, len(nodes), nodes_per_section):
-            node_group = nodes[i:i + nodes_per_section]
-            
+        for node_group in node_groups:
             # CRITICAL FIX: Skip empty sections (prevents empty payload error)
             if not node_group:
-                logger.warning(f"Skipping empty section at index {i} (no nodes in slice)")
+                logger.warning(f"Skipping empty section {idx} (no nodes in group)")
                 continue
             
             node_ids = set(n["id"] for n in node_group)
@@ -798,71 +1010,15 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
                 if e.get("source") in node_ids or e.get("target") in node_ids
             ]
 
-            # CRITICAL FIX: Filter suggestions relevant to this section
-            # Handle multiple sources for node_id since specific_location.node_id is often NULL
-            def get_suggestion_node_id(sug: Dict) -> Optional[str]:
-                """Extract node_id from suggestion using multiple fallback strategies."""
-                # Strategy 1: specific_location.node_id (original)
-                spec_loc = sug.get("specific_location", {})
-                if spec_loc:
-                    # Handle both dict and Pydantic object
-                    if hasattr(spec_loc, 'node_id'):
-                        node_id = spec_loc.node_id
-                    elif isinstance(spec_loc, dict):
-                        node_id = spec_loc.get("node_id")
-                    else:
-                        node_id = None
-                    if node_id:
-                        return node_id
-                
-                # Strategy 2: location.node_id (CLI conversion)
-                location = sug.get("location", {})
-                if location:
-                    if hasattr(location, 'node_id'):
-                        node_id = location.node_id
-                    elif isinstance(location, dict):
-                        node_id = location.get("node_id")
-                    else:
-                        node_id = None
-                    if node_id:
-                        return node_id
-                
-                # Strategy 3: implementation_strategy.node_id (Wave 2)
-                impl_strategy = sug.get("implementation_strategy", {})
-                if impl_strategy and isinstance(impl_strategy, dict):
-                    node_id = impl_strategy.get("node_id")
-                    if node_id:
-                        return node_id
-                
-                # Strategy 4: implementation_path.json_path parsing
-                impl_path = sug.get("implementation_path", {})
-                if impl_path and isinstance(impl_path, dict):
-                    json_path = impl_path.get("json_path", "")
-                    # Try to extract node_id from json_path like "nodes[2].data.questions[0]"
-                    import re
-                    node_match = re.search(r'nodes\[(\d+)\]', json_path)
-                    if node_match:
-                        # Can't directly map index to node_id, skip
-                        pass
-                
-                return None
-            
+            # Sugestões sem nó identificável vão com a primeira seção de nós
+            # (o roteamento restringe o contexto, não descarta sugestões aprovadas)
+            first_node_section = idx == 1
             section_suggestions = [
-                sug for sug in suggestions
-                if get_suggestion_node_id(sug) in node_ids
+                sug for sug, targets in zip(suggestions, suggestion_targets)
+                if targets & node_ids or (first_node_section and not targets)
             ]
-            
-            # CRITICAL FIX: If no suggestions matched by node_id, assign ALL suggestions
-            # to at least the first section to ensure they get processed
-            if not section_suggestions and idx == 1 and suggestions:
-                # First node section gets all unassigned suggestions
-                logger.warning(
-                    f"No suggestions have node_id matching section nodes. "
-                    f"Assigning all {len(suggestions)} suggestions to first node section."
-                )
-                section_suggestions = suggestions
 
-            sections.append({
+            section = {
                 "section_id": f"section_{idx}",
                 "type": "nodes",
                 "node_ids": node_ids,
@@ -870,17 +1026,273 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
                 "edges": section_edges,
                 "relevant_suggestions": section_suggestions,
                 "metadata_context": metadata  # Read-only context
-            })
+            }
+            # Oversized conduct node: split into item-level chunks
+            sections.extend(self._split_oversized_section(section, token_budget))
             idx += 1
 
         logger.info(
             f"Enumerated {len(sections)} sections: "
             f"1 metadata + {len(sections)-1} node sections "
-            f"(protocol_size={protocol_size/1024:.1f}KB, nodes_per_section={nodes_per_section})"
+            f"(protocol_size={protocol_size/1024:.1f}KB, token_budget={token_budget})"
         )
 
         return sections
 
+    @staticmethod
+    def _estimate_node_tokens(node: Dict) -> int:
+        """Estimativa de tokens de um nó serializado (chars / CHARS_TO_TOKENS)."""
+        size = len(json.dumps(node, ensure_ascii=False))
+        return max(1, size // CostEstimator.CHARS_TO_TOKENS)
+
+    def _partition_nodes(
+        self,
+        nodes: List[Dict],
+        edges: List[Dict],
+        token_budget: int
+    ) -> List[List[Dict]]:
+        """
+        Empacota nós em grupos (seções) sob um orçamento de tokens.
+
+        Estratégia gulosa:
+        1. Cada grupo começa pelo primeiro nó ainda não alocado (ordem original)
+        2. Cresce com o maior vizinho no grafo de edges que ainda caiba no orçamento
+        3. Sem vizinhos que caibam, completa com o primeiro nó (qualquer) que caiba
+        Nós maiores que o orçamento ficam sozinhos em sua seção.
+
+        Args:
+            nodes: Nós do protocolo
+            edges: Edges do protocolo
+            token_budget: Máximo de tokens por seção
+
+        Returns:
+            Lista de grupos de nós (cada grupo na ordem original do protocolo)
+        """
+        sizes = [self._estimate_node_tokens(n) for n in nodes]
+        index_by_id = {n.get("id"): i for i, n in enumerate(nodes)}
+
+        adjacency: Dict[int, set] = {i: set() for i in range(len(nodes))}
+        for edge in edges:
+            src = index_by_id.get(edge.get("source"))
+            tgt = index_by_id.get(edge.get("target"))
+            if src is not None and tgt is not None and src != tgt:
+                adjacency[src].add(tgt)
+                adjacency[tgt].add(src)
+
+        unassigned = set(range(len(nodes)))
+        groups: List[List[int]] = []
+
+        for seed in range(len(nodes)):
+            if seed not in unassigned:
+                continue
+
+            group = [seed]
+            unassigned.discard(seed)
+            used = sizes[seed]
+            frontier = set(adjacency[seed]) & unassigned
+
+            while used < token_budget:
+                remaining = token_budget - used
+                fitting_neighbors = [i for i in frontier if sizes[i] <= remaining]
+                if fitting_neighbors:
+                    # Maior vizinho que cabe (empacotamento mais justo)
+                    pick = max(fitting_neighbors, key=lambda i: (sizes[i], -i))
+                else:
+                    pick = next((i for i in sorted(unassigned) if sizes[i] <= remaining), None)
+                    if pick is None:
+                        break
+
+                group.append(pick)
+                unassigned.discard(pick)
+                used += sizes[pick]
+                frontier.discard(pick)
+                frontier |= adjacency[pick] & unassigned
+
+            groups.append(sorted(group))
+
+        logger.debug(
+            f"Partitioned {len(nodes)} nodes into {len(groups)} sections "
+            f"(budget={token_budget} tokens, sizes={[sum(sizes[i] for i in g) for g in groups]})"
+        )
+        return [[nodes[i] for i in group] for group in groups]
+
+    def _split_oversized_section(
+        self,
+        section: Dict,
+        token_budget: int
+    ) -> List[Dict]:
+        """
+        Divide uma seção de nó único acima do orçamento em chunks de itens.
+
+        Aplica-se a nós com itens em data.condutaDataNode (exame, mensagem,
+        medicamento, orientacao, encaminhamento). Cada chunk é um "nó parcial"
+        com o mesmo id, contendo apenas um intervalo contíguo de itens; o
+        chunk 0 carrega também o restante de data (label, descricao, ...).
+        Sugestões vão apenas para os chunks cujos itens elas citam (id ou nome
+        como palavra inteira); as demais vão para o chunk 0.
+
+        Args:
+            section: Seção de nós (type == "nodes")
+            token_budget: Máximo de tokens por seção
+
+        Returns:
+            [section] inalterada, ou lista de seções type == "node_chunk"
+        """
+        if len(section["nodes"]) != 1:
+            return [section]
+
+        node = section["nodes"][0]
+        if self._estimate_node_tokens(node) <= token_budget:
+            return [section]
+
+        conduta_data = (node.get("data") or {}).get("condutaDataNode") or {}
+        items = [
+            (key, item)
+            for key in CONDUCT_ITEM_KEYS
+            for item in (conduta_data.get(key) or [])
+            if isinstance(item, dict) and item.get("id")
+        ]
+        if len(items) < 2:
+            return [section]
+
+        # Shell: nó sem as listas de itens
+        shell = copy.deepcopy(node)
+        shell_conduta = shell["data"]["condutaDataNode"]
+        for key in CONDUCT_ITEM_KEYS:
+            if key in shell_conduta:
+                shell_conduta[key] = []
+        item_budget = max(1, token_budget - self._estimate_node_tokens(shell))
+
+        # Empacotar itens (ordem original) em chunks sob o orçamento
+        chunks: List[List[Tuple[str, Dict]]] = [[]]
+        used = 0
+        for key, item in items:
+            item_tokens = self._estimate_node_tokens(item)
+            if chunks[-1] and used + item_tokens > item_budget:
+                chunks.append([])
+                used = 0
+            chunks[-1].append((key, item))
+            used += item_tokens
+
+        if len(chunks) < 2:
+            return [section]
+
+        # Rotear sugestões para os chunks que citam seus itens
+        chunk_suggestions: List[List[Dict]] = [[] for _ in chunks]
+        for sug in section["relevant_suggestions"]:
+            sug_text = json.dumps(sug, ensure_ascii=False, default=str).lower()
+            touched = [
+                k for k, chunk in enumerate(chunks)
+                if any(
+                    _mentions(sug_text, str(item["id"]).lower(), identifier=True)
+                    or (item.get("nome") and len(item["nome"]) > 3 and _mentions(sug_text, item["nome"].lower()))
+                    for _, item in chunk
+                )
+            ]
+            for k in (touched or [0]):
+                chunk_suggestions[k].append(sug)
+
+        chunk_sections = []
+        for k, chunk in enumerate(chunks):
+            if k == 0:
+                partial = copy.deepcopy(shell)
+            else:
+                partial = {"id": node["id"], "type": node.get("type"), "data": {"condutaDataNode": {}}}
+            partial_conduta = partial["data"]["condutaDataNode"]
+            for key, item in chunk:
+                partial_conduta.setdefault(key, []).append(item)
+
+            chunk_sections.append({
+                "section_id": f"{section['section_id']}_chunk_{k}",
+                "type": "node_chunk",
+                "parent_section_id": section["section_id"],
+                "chunk_index": k,
+                "node_ids": {node["id"]},
+                "item_ids": [item["id"] for _, item in chunk],
+                "nodes": [partial],
+                "edges": section["edges"] if k == 0 else [],
+                "relevant_suggestions": chunk_suggestions[k],
+                "metadata_context": section["metadata_context"]
+            })
+
+        logger.info(
+            f"{section['section_id']}: node {node['id']} over budget "
+            f"({self._estimate_node_tokens(node)} tokens) split into {len(chunks)} item chunks, "
+            f"{sum(1 for c in chunk_sections if c['relevant_suggestions'])} touched by suggestions"
+        )
+        return chunk_sections
+
+    def _merge_node_chunks(
+        self,
+        sections: List[Dict],
+        section_statuses: Dict[str, SectionReconstructionStatus]
+    ) -> Dict[str, SectionReconstructionStatus]:
+        """
+        Remonta nós divididos em chunks a partir dos chunks reconstruídos.
+
+        Data do nó vem do chunk 0; cada lista de itens é a concatenação dos
+        chunks em ordem (preservando a ordem original dos itens).
+
+        Args:
+            sections: Todas as seções enumeradas
+            section_statuses: Status por seção
+
+        Returns:
+            Novo dict de status com um status por nó remontado no lugar dos chunks
+        """
+        chunk_groups: Dict[str, List[Dict]] = {}
+        chunk_parent: Dict[str, str] = {}
+        for section in sections:
+            if section["type"] == "node_chunk":
+                chunk_groups.setdefault(section["parent_section_id"], []).append(section)
+                chunk_parent[section["section_id"]] = section["parent_section_id"]
+
+        if not chunk_groups:
+            return section_statuses
+
+        merged_statuses: Dict[str, SectionReconstructionStatus] = {}
+        emitted = set()
+        for section_id, status in section_statuses.items():
+            parent_id = chunk_parent.get(section_id)
+            if parent_id is None:
+                merged_statuses[section_id] = status
+                continue
+            if parent_id in emitted:
+                continue
+            emitted.add(parent_id)
+
+            chunks = sorted(chunk_groups[parent_id], key=lambda c: c["chunk_index"])
+            chunk_statuses = [section_statuses[c["section_id"]] for c in chunks]
+            failed = [st for st in chunk_statuses if st.status != "completed"]
+            if failed:
+                merged_statuses[parent_id] = SectionReconstructionStatus(
+                    section_id=parent_id,
+                    status=failed[0].status,
+                    error_message=failed[0].error_message,
+                    timestamp=datetime.now().isoformat()
+                )
+                continue
+
+            partials = [st.reconstructed_data[0] for st in chunk_statuses]
+            merged = copy.deepcopy(partials[0])
+            merged_conduta = merged.setdefault("data", {}).setdefault("condutaDataNode", {})
+            for key in CONDUCT_ITEM_KEYS:
+                combined = []
+                for partial in partials:
+                    combined.extend(((partial.get("data") or {}).get("condutaDataNode") or {}).get(key) or [])
+                if combined or key in merged_conduta:
+                    merged_conduta[key] = combined
+
+            merged_statuses[parent_id] = SectionReconstructionStatus(
+                section_id=parent_id,
+                status="completed",
+                reconstructed_data=[merged],
+                timestamp=datetime.now().isoformat()
+            )
+            logger.debug(f"{parent_id}: merged {len(chunks)} chunks into node {merged.get('id')}")
+
+        return merged_statuses
+
     def _validate_section(
         self,
         section: Dict,
@@ -911,6 +1323,30 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
 
             return True, ""
 
+        elif section_type == "node_chunk":
+            # Validate item chunk: same node, all original item IDs preserved
+            if not isinstance(reconstructed, list) or len(reconstructed) != 1:
+                return False, "Chunk must be a list with exactly one (partial) node"
+
+            node = reconstructed[0]
+            expected_node_id = next(iter(section["node_ids"]))
+            if not isinstance(node, dict) or node.get("id") != expected_node_id:
+                return False, f"Node ID mismatch: expected {expected_node_id}, got {node.get('id') if isinstance(node, dict) else node}"
+
+            conduta_data = (node.get("data") or {}).get("condutaDataNode") or {}
+            reconstructed_item_ids = set()
+            for key in CONDUCT_ITEM_KEYS:
+                for item in conduta_data.get(key) or []:
+                    if not isinstance(item, dict) or not item.get("id"):
+                        return False, f"Item in '{key}' missing 'id'"
+                    reconstructed_item_ids.add(item["id"])
+
+            missing = set(section["item_ids"]) - reconstructed_item_ids
+            if missing:
+                return False, f"Item ID mismatch: missing {sorted(missing)}"
+
+            return True, ""
+
         else:
             # Validate node section
             if not isinstance(reconstructed, list):
@@ -960,7 +1396,8 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
     def _build_section_reconstruction_prompt(
         self,
         section: Dict,
-        new_version: str
+        new_version: str,
+        projection: Optional[ProtocolProjection] = None
     ) -> str:
         """
         Constrói prompt para reconstrução de uma seção.
@@ -968,20 +1405,18 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no explanations, no code blocks.
         Args:
             section: Descritor da seção
             new_version: Nova versão para changelog
+            projection: Projeção compacta dos nós da seção (None = JSON completo);
+                a resposta volta pelo projection.restore
 
         Returns:
             Prompt formatado
         """
         section_id = section["section_id"]
         section_type = section["type"]
+        alias = projection.alias if projection is not None else (lambda node_id: node_id)
 
         # Check for retry context
-        retry_context = section.get("_retry_context", {})
-        retry_instruction = ""
-        if retry_context:
-            retry_instruction = f"\n⚠️ RETRY ATTEMPT #{retry_context.get('attempt', 0)}\n"
-            retry_instruction += f"Previous error: {retry_context.get('last_error', 'Unknown')}\n"
-            retry_instruction += f"{retry_context.get('instruction', '')}\n\n"
+        retry_instruction = self._retry_instruction(section)
 
         if section_type == "metadata":
             # Metadata section: Only update version
@@ -1017,20 +1452,21 @@ CRITICAL: Return ONLY valid JSON. No explanations, no markdown code blocks.
                     f"\n{i+1}. [{s.get('id', 'N/A')}] {s.get('category', 'N/A')} - {s.get('priority', 'N/A')}:\n"
                     f"   Title: {s.get('title', 'N/A')}\n"
                     f"   Description: {s.get('description', 'N/A')}\n"
-                    f"   Target Node: {s.get('specific_location', {}).get('node_id', 'N/A')}\n"
+                    f"   Target Node: {alias(s.get('specific_location', {}).get('node_id', 'N/A'))}\n"
                     for i, s in enumerate(section["relevant_suggestions"])
                 ])
             else:
                 suggestions_text = "No suggestions for this section"
 
             # Build list of required node IDs to emphasize to LLM
-            required_node_ids = [n["id"] for n in section["nodes"]]
+            required_node_ids = [alias(n["id"]) for n in section["nodes"]]
             node_ids_str = ", ".join(required_node_ids)
+            nodes_text, edges_text = self._format_section_nodes(section, projection)
             
             return f"""{retry_instruction}You are an expert medical protocol developer.
 
 TASK: Reconstruct section "{section_id}" by applying improvement suggestions.
-
+{self._chunk_prompt_note(section)}
 🚨 CRITICAL - EXACT NODE IDs REQUIRED 🚨
 You MUST return EXACTLY these node IDs (copy-paste them): {node_ids_str}
 Do NOT generate new IDs. Do NOT modify IDs. Copy them EXACTLY.
@@ -1041,10 +1477,10 @@ PROTOCOL CONTEXT (read-only):
 - Version: {new_version}
 
 SECTION NODES TO RECONSTRUCT (preserve IDs exactly):
-{json.dumps(section["nodes"], ensure_ascii=False, indent=2)}
+{nodes_text}
 
 EDGES (relationships):
-{json.dumps(section["edges"], ensure_ascii=False, indent=2)}
+{edges_text}
 
 IMPROVEMENT SUGGESTIONS FOR THIS SECTION:
 {suggestions_text}
@@ -1090,10 +1526,363 @@ CRITICAL REQUIREMENTS:
 - DOCUMENT ALL CHANGES in node descriptions with [CHANGELOG] entries
 """
 
+    def _format_section_nodes(
+        self,
+        section: Dict,
+        projection: Optional[ProtocolProjection]
+    ) -> Tuple[str, str]:
+        """
+        Nós e arestas da seção para o prompt: JSON com indent=2 ou, com
+        projeção, nós compactos e arestas como pares source/target com aliases.
+        """
+        if projection is None:
+            return (
+                json.dumps(section["nodes"], ensure_ascii=False, indent=2),
+                json.dumps(section["edges"], ensure_ascii=False, indent=2)
+            )
+        edges = [
+            {"source": projection.alias(e.get("source")), "target": projection.alias(e.get("target"))}
+            for e in section.get("edges") or []
+        ]
+        return (
+            COMPACT_NODES_NOTE + projection.to_json(),
+            json.dumps(edges, ensure_ascii=False, separators=(",", ":"))
+        )
+
+    def _section_projection(self, section: Dict) -> Optional[ProtocolProjection]:
+        """
+        Projeção compacta dos nós da seção (reconstruction.compact_protocol_prompt).
+
+        Reutiliza o mapa de aliases do protocolo inteiro, para que cada nó
+        tenha o mesmo alias na análise e em todas as seções.
+        """
+        if section["type"] not in ("nodes", "node_chunk"):
+            return None
+        if not _reconstruction_setting("compact_protocol_prompt", True):
+            return None
+        return ProtocolProjection(section["nodes"], shared=self._protocol_projection)
+
+    def _retry_instruction(self, section: Dict) -> str:
+        """Aviso de nova tentativa com o erro anterior ("" na primeira tentativa)."""
+        retry_context = section.get("_retry_context", {})
+        if not retry_context:
+            return ""
+        retry_instruction = f"\n⚠️ RETRY ATTEMPT #{retry_context.get('attempt', 0)}\n"
+        retry_instruction += f"Previous error: {retry_context.get('last_error', 'Unknown')}\n"
+        retry_instruction += f"{retry_context.get('instruction', '')}\n\n"
+        return retry_instruction
+
+    def _chunk_prompt_note(self, section: Dict) -> str:
+        """Aviso de visão parcial para seções type == "node_chunk" ("" caso contrário)."""
+        if section.get("type") != "node_chunk":
+            return ""
+        return (
+            f"\n⚠️ PARTIAL NODE VIEW: this is chunk {section['chunk_index']} of a large node. "
+            f"It contains ONLY some items of data.condutaDataNode. Keep every existing item "
+            f"(ids: {len(section['item_ids'])} items) in the same order; add new items only if a "
+            f"suggestion requires it. Other items of the node are handled separately.\n"
+        )
+
+    def _build_section_patch_prompt(
+        self,
+        section: Dict,
+        new_version: str,
+        projection: Optional[ProtocolProjection] = None
+    ) -> str:
+        """
+        Constrói prompt de reconstrução em modo patch (RFC 6902).
+
+        O LLM recebe os nós da seção como um objeto indexado por node ID e
+        devolve apenas operações de patch, em vez de reemitir os nós completos.
+
+        Args:
+            section: Descritor da seção (type == "nodes")
+            new_version: Nova versão para changelog
+            projection: Projeção compacta dos nós da seção (None = JSON completo);
+                o documento fica indexado pelos aliases dos nós
+
+        Returns:
+            Prompt formatado
+        """
+        section_id = section["section_id"]
+        alias = projection.alias if projection is not None else (lambda node_id: node_id)
+        if projection is not None:
+            nodes_by_id = {node["id"]: node for node in projection.data}
+            document_text = COMPACT_NODES_NOTE + json.dumps(nodes_by_id, ensure_ascii=False, separators=(",", ":"))
+        else:
+            nodes_by_id = {n["id"]: n for n in section["nodes"]}
+            document_text = json.dumps(nodes_by_id, ensure_ascii=False, indent=2)
+        node_ids_str = ", ".join(nodes_by_id.keys())
+
+        suggestions_text = "\n".join([
+            f"\n{i+1}. [{s.get('id', 'N/A')}] {s.get('category', 'N/A')} - {s.get('priority', 'N/A')}:\n"
+            f"   Title: {s.get('title', 'N/A')}\n"
+            f"   Description: {s.get('description', 'N/A')}\n"
+            f"   Target Node: {alias((s.get('specific_location') or {}).get('node_id', 'N/A'))}\n"
+            for i, s in enumerate(section["relevant_suggestions"])
+        ])
+
+        return f"""{self._retry_instruction(section)}You are an expert medical protocol developer.
+
+TASK: Apply the improvement suggestions to section "{section_id}" by returning JSON Patch (RFC 6902) operations.
+Do NOT return the full nodes. Return ONLY the operations needed.
+{self._chunk_prompt_note(section)}
+PROTOCOL CONTEXT (read-only):
+- Company: {section["metadata_context"].get("company", "N/A")}
+- Protocol: {section["metadata_context"].get("name", "N/A")}
+- Version: {new_version}
+
+DOCUMENT (object keyed by node ID; valid node IDs: {node_ids_str}):
+{document_text}
+
+IMPROVEMENT SUGGESTIONS FOR THIS SECTION:
+{suggestions_text}
+
+PATCH RULES:
+1. Every "path" MUST start with "/<node_id>/" using one of the node IDs above
+2. Allowed ops: "add", "replace", "remove", "move", "copy", "test"
+3. Use "/-" to append to an array (e.g. "/<node_id>/data/condutaDataNode/mensagem/-")
+4. NEVER change or remove a node's "id", "type" or the node itself
+5. Document each modified node by replacing "/<node_id>/data/descricao" with the
+   existing text plus a changelog entry:
+
+[CHANGELOG v{new_version}]: <summary>
+- Changed: <specific detail>
+- Reason: <justification from suggestion>
+- Suggestion ID: <suggestion_id>
+
+EXAMPLE:
+{{
+  "patch": [
+    {{"op": "add", "path": "/conduta-1/data/condutaDataNode/mensagem/-",
+      "value": {{"id": "msg-alerta-idosos", "nome": "Alerta", "condicional": "visivel", "condicao": "idade >= 65", "conteudo": "<p>ATENÇÃO: ...</p>"}}}},
+    {{"op": "replace", "path": "/node-3/data/questions/0/options/1/label", "value": "Febre (≥37.8°C)"}}
+  ]
+}}
+
+OUTPUT FORMAT (JSON only, no markdown):
+{{"patch": [ ...operations... ]}}
+"""
+
+    def _apply_section_patch(
+        self,
+        section: Dict,
+        operations: List[Dict]
+    ) -> List[Dict]:
+        """
+        Aplica operações de patch aos nós de uma seção.
+
+        Valida que cada operação está restrita aos node IDs da seção e não
+        altera id/type nem remove o nó inteiro.
+
+        Args:
+            section: Descritor da seção
+            operations: Operações RFC 6902 devolvidas pelo LLM
+
+        Returns:
+            Lista de nós reconstruídos (mesma ordem da seção)
+
+        Raises:
+            JsonPatchError: Se o patch estiver fora de escopo ou não se aplicar
+        """
+        node_ids = [n["id"] for n in section["nodes"]]
+        allowed = set(node_ids)
+
+        if not isinstance(operations, list):
+            raise JsonPatchError("'patch' must be a list")
+
+        for i, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                raise JsonPatchError(f"Operation #{i} is not an object")
+            for key in ("path", "from"):
+                if key not in operation:
+                    continue
+                tokens = parse_pointer(operation[key])
+                if not tokens or tokens[0] not in allowed:
+                    raise JsonPatchError(
+                        f"Operation #{i} {key} outside section nodes: {operation[key]!r}"
+                    )
+                if len(tokens) == 1 and operation.get("op") != "test":
+                    raise JsonPatchError(f"Operation #{i} targets a whole node: {operation[key]!r}")
+                if len(tokens) == 2 and tokens[1] in ("id", "type") and operation.get("op") != "test":
+                    raise JsonPatchError(f"Operation #{i} modifies node {tokens[1]}: {operation[key]!r}")
+
+        document = {n["id"]: n for n in section["nodes"]}
+        patched = apply_patch(document, operations)
+        return [patched[node_id] for node_id in node_ids]
+
+    async def _reconstruct_section_patch_async(
+        self,
+        section: Dict,
+        new_version: str
+    ) -> List[Dict]:
+        """
+        Reconstrói uma seção de nós em modo patch.
+
+        Args:
+            section: Descritor da seção
+            new_version: Nova versão
+
+        Returns:
+            Lista de nós reconstruídos
+
+        Raises:
+            JsonPatchError / ValueError: Se a resposta não contiver um patch aplicável
+        """
+        projection = self._section_projection(section)
+        prompt = self._build_section_patch_prompt(section, new_version, projection)
+        response = await self.llm_client.analyze_async(prompt)
+
+        if not isinstance(response, dict) or "patch" not in response:
+            raise ValueError("Invalid patch response: missing 'patch' key")
+
+        operations = response["patch"]
+        if projection is not None and isinstance(operations, list):
+            operations = self._restore_patch_aliases(section, operations, projection)
+        reconstructed = self._apply_section_patch(section, operations)
+        logger.info(
+            f"{section['section_id']}: applied {len(response['patch'])} patch operation(s) locally"
+        )
+        return reconstructed
+
+    def _restore_patch_aliases(
+        self,
+        section: Dict,
+        operations: List[Dict],
+        projection: ProtocolProjection
+    ) -> List[Dict]:
+        """
+        Traduz aliases (paths e valores) de um patch gerado sobre a projeção
+        e, em "replace", reinsere no valor novo os campos que a projeção omitiu
+        do valor atual (ex: iid das opções ao substituir a lista inteira).
+        Elementos novos ("add", ou sem par no valor atual) recebem nodeId/iid.
+        """
+        operations = projection.restore_ids(operations)
+        document = {n["id"]: n for n in section["nodes"]}
+        for operation in operations:
+            if not isinstance(operation, dict) or operation.get("op") not in ("add", "replace"):
+                continue
+            if not isinstance(operation.get("value"), (dict, list)):
+                continue
+            try:
+                tokens = parse_pointer(operation.get("path", ""))
+                current = get_value(document, operation["path"]) if operation["op"] == "replace" else None
+            except JsonPatchError:
+                continue
+            # Chave do valor (último segmento que não é índice) e nó dono (1º segmento)
+            names = [t for t in tokens[1:] if not (t.isdigit() or t == "-")]
+            operation["value"] = projection.restore_dropped(
+                operation["value"], current, names[-1] if names else None, tokens[0] if tokens else None
+            )
+        return operations
+
+    def _reconstruct_section_locally(
+        self,
+        section: Dict,
+        new_version: str
+    ) -> Optional[object]:
+        """
+        Reconstrói uma seção sem LLM quando o resultado é determinístico.
+
+        - Metadata: só atualiza "version" (via version_utils.update_protocol_version)
+        - Seção de nós sem sugestões relevantes: nós passam inalterados
+
+        Args:
+            section: Descritor da seção
+            new_version: Nova versão
+
+        Returns:
+            Dados reconstruídos (metadata dict ou nodes list) ou None se a
+            seção precisa do LLM
+        """
+        if section["type"] == "metadata":
+            from .version_utils import update_protocol_version
+            bumped = update_protocol_version({"metadata": dict(section["metadata"] or {})}, new_version)
+            logger.debug(f"{section['section_id']}: version bumped locally to {new_version}")
+            return bumped["metadata"]
+
+        if not section.get("relevant_suggestions"):
+            logger.debug(f"{section['section_id']}: no relevant suggestions, passing nodes through")
+            return copy.deepcopy(section["nodes"])
+
+        return None
+
+    def _section_prompt_version(self) -> str:
+        """Versão efetiva do prompt de seção (modo patch usa outro prompt)."""
+        version = SECTION_PROMPT_VERSION
+        if _reconstruction_setting("patch_mode", True):
+            version += "+patch"
+        if _reconstruction_setting("compact_protocol_prompt", True):
+            version += "+compact2"
+        return version
+
+    def _load_cached_section(self, section: Dict, new_version: str) -> Optional[object]:
+        """
+        Busca a seção no cache de reconstrução.
+
+        A chave é gravada em section["_cache_key"] para que o resultado do LLM
+        seja armazenado depois com a mesma chave.
+
+        Args:
+            section: Descritor da seção
+            new_version: Nova versão
+
+        Returns:
+            Dados reconstruídos (validados) ou None
+        """
+        key = section_cache_key(section, self.model, self._section_prompt_version(), new_version)
+        section["_cache_key"] = key
+
+        cached = self.section_cache.get(key)
+        if cached is None:
+            return None
+
+        is_valid, error_msg = self._validate_section(section, cached)
+        if not is_valid:
+            logger.warning(f"{section['section_id']}: ignoring invalid cache entry ({error_msg})")
+            return None
+
+        logger.info(f"{section['section_id']}: reused from reconstruction cache ({key[:12]})")
+        self._notify_section_done(section)
+        return cached
+
+    def _store_cached_section(self, section: Dict, reconstructed: object) -> None:
+        """Persiste uma seção concluída via LLM no cache de reconstrução."""
+        if self.section_cache is None or not section.get("_cache_key"):
+            return
+        self.section_cache.put(section["_cache_key"], reconstructed, section_id=section["section_id"])
+        self._notify_section_done(section)
+
+    def _notify_section_done(self, section: Dict) -> None:
+        """Repassa (section_id, cache_key) ao section_callback (checkpoints)."""
+        if self.section_callback is None:
+            return
+        try:
+            self.section_callback(section["section_id"], section["_cache_key"])
+        except Exception as e:
+            logger.warning(f"Section callback failed for {section['section_id']}: {e}")
+
     def _reconstruct_section_llm(
         self,
         section: Dict,
         new_version: str
+    ) -> Dict:
+        """
+        Reconstrói uma seção usando LLM (wrapper síncrono).
+
+        Args:
+            section: Descritor da seção
+            new_version: Nova versão
+
+        Returns:
+            Dados reconstruídos (metadata dict ou nodes list)
+        """
+        return run_sync(self._reconstruct_section_llm_async(section, new_version))
+
+    async def _reconstruct_section_llm_async(
+        self,
+        section: Dict,
+        new_version: str
     ) -> Dict:
         """
         Reconstrói uma seção usando LLM.
@@ -1111,8 +1900,23 @@ CRITICAL REQUIREMENTS:
         section_id = section["section_id"]
         logger.info(f"Reconstructing {section_id}...")
 
+        # Patch mode: LLM returns only RFC 6902 operations (falls back to full re-emission)
+        if (
+            section["type"] in ("nodes", "node_chunk")
+            and not section.get("_patch_failed")
+            and _reconstruction_setting("patch_mode", True)
+        ):
+            try:
+                return await self._reconstruct_section_patch_async(section, new_version)
+            except (JsonPatchError, ValueError) as e:
+                section["_patch_failed"] = True
+                logger.warning(
+                    f"{section_id}: patch did not apply ({e}), falling back to full re-emission"
+                )
+
         # Build prompt
-        prompt = self._build_section_reconstruction_prompt(section, new_version)
+        projection = self._section_projection(section)
+        prompt = self._build_section_reconstruction_prompt(section, new_version, projection)
 
         # CRITICAL FIX: Validate prompt is not empty before calling LLM
         if not prompt or not prompt.strip():
@@ -1130,7 +1934,7 @@ CRITICAL REQUIREMENTS:
             )
 
         # Call LLM (auto-continue enabled)
-        response = self.llm_client.analyze(prompt)
+        response = await self.llm_client.analyze_async(prompt)
 
         # Parse based on section type
         if section["type"] == "metadata":
@@ -1141,19 +1945,42 @@ CRITICAL REQUIREMENTS:
 
         else:
             if "reconstructed_nodes" in response:
-                return response["reconstructed_nodes"]
+                nodes = response["reconstructed_nodes"]
             elif "nodes" in response:
-                return response["nodes"]
+                nodes = response["nodes"]
             else:
                 raise ValueError(
                     f"Invalid node section response: missing 'reconstructed_nodes' or 'nodes' key"
                 )
+            # Aliases -> IDs originais e campos omitidos pela projeção de volta
+            if projection is not None and isinstance(nodes, list):
+                nodes = projection.restore(nodes)
+            return nodes
 
     def _reconstruct_section_with_retry(
         self,
         section: Dict,
         new_version: str,
         max_retries: int = 3
+    ) -> Dict:
+        """
+        Reconstrói seção com retry automático (wrapper síncrono).
+
+        Args:
+            section: Descritor da seção
+            new_version: Nova versão
+            max_retries: Número máximo de tentativas
+
+        Returns:
+            Dados reconstruídos validados
+        """
+        return run_sync(self._reconstruct_section_with_retry_async(section, new_version, max_retries))
+
+    async def _reconstruct_section_with_retry_async(
+        self,
+        section: Dict,
+        new_version: str,
+        max_retries: int = 3
     ) -> Dict:
         """
         Reconstrói seção com retry automático em caso de falha.
@@ -1183,13 +2010,14 @@ CRITICAL REQUIREMENTS:
                     }
 
                 # Attempt reconstruction
-                reconstructed = self._reconstruct_section_llm(section, new_version)
+                reconstructed = await self._reconstruct_section_llm_async(section, new_version)
 
                 # Validate
                 is_valid, error_msg = self._validate_section(section, reconstructed)
 
                 if is_valid:
                     logger.info(f"{section_id} completed successfully (attempt {attempt + 1})")
+                    self._store_cached_section(section, reconstructed)
                     return reconstructed
                 else:
                     last_error = error_msg
@@ -1201,7 +2029,7 @@ CRITICAL REQUIREMENTS:
                     if attempt < max_retries - 1:
                         delay = 2 ** attempt
                         logger.info(f"Retrying in {delay}s...")
-                        time.sleep(delay)
+                        await asyncio.sleep(delay)
 
             except json.JSONDecodeError as e:
                 last_error = f"JSON parse error: {e}"
@@ -1209,7 +2037,7 @@ CRITICAL REQUIREMENTS:
 
                 if attempt < max_retries - 1:
                     delay = 2 ** attempt
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
 
             except Exception as e:
                 last_error = f"Unexpected error: {e}"
@@ -1220,7 +2048,7 @@ CRITICAL REQUIREMENTS:
 
                 if attempt < max_retries - 1:
                     delay = 2 ** attempt
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
 
         # All retries exhausted
         raise ValueError(
@@ -1281,8 +2109,12 @@ CRITICAL REQUIREMENTS:
                 logger.warning(f"Section {section_id} has unexpected data type: {type(status.reconstructed_data)}")
                 continue
 
-        # Step 3: Sort nodes by position.x (maintain visual flow)
-        all_nodes.sort(key=lambda n: n.get("position", {}).get("x", 0))
+        # Step 3: Restore original node order (sections may group non-contiguous nodes)
+        original_order = {n.get("id"): i for i, n in enumerate(original_protocol.get("nodes", []))}
+        all_nodes.sort(key=lambda n: (
+            original_order.get(n.get("id"), len(original_order)),
+            n.get("position", {}).get("x", 0)
+        ))
 
         # Step 4: Validate node count
         original_node_count = len(original_protocol.get("nodes", []))
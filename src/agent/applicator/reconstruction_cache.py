@@ -0,0 +1,132 @@
+"""
+Reconstruction Cache - Cache endereçado por conteúdo das seções reconstruídas
+
+Responsabilidades:
+- Calcular a chave de uma seção (hash dos nós de entrada, sugestões relevantes,
+  modelo e versão do prompt)
+- Persistir o reconstructed_data de cada seção concluída em disco
+- Reaproveitar seções já concluídas em reruns ou sessões retomadas
+
+Como a chave depende apenas do conteúdo, uma falha na seção 9 de 12 não
+descarta as seções 1–8: a próxima tentativa encontra-as no cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.logger import logger
+
+
+def _canonical_json(value: Any) -> str:
+    """Serialização estável (chaves ordenadas) para hashing."""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def section_cache_key(
+    section: Dict,
+    model: str,
+    prompt_version: str,
+    new_version: str = ""
+) -> str:
+    """
+    Calcula a chave de cache de uma seção.
+
+    Args:
+        section: Descritor da seção (nodes/metadata + relevant_suggestions)
+        model: Modelo LLM usado na reconstrução
+        prompt_version: Versão do prompt de reconstrução
+        new_version: Versão alvo do protocolo (entra no changelog dos nós)
+
+    Returns:
+        Hash SHA-256 hexadecimal
+    """
+    payload = {
+        "type": section.get("type"),
+        "nodes": section.get("nodes") if section.get("type") != "metadata" else section.get("metadata"),
+        "suggestions": section.get("relevant_suggestions", []),
+        "model": model,
+        "prompt_version": prompt_version,
+        "new_version": new_version,
+    }
+    return hashlib.sha256(_canonical_json(payload).encode("utf-8")).hexdigest()
+
+
+class ReconstructionCache:
+    """
+    Cache em disco de seções reconstruídas (um arquivo JSON por chave).
+
+    Escritas são atômicas (arquivo temporário + os.replace), então um crash
+    no meio da gravação nunca deixa uma entrada corrompida.
+    """
+
+    def __init__(self, cache_dir: str = ".reconstruction_cache"):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Retorna o reconstructed_data armazenado ou None.
+
+        Args:
+            key: Chave calculada por section_cache_key
+        """
+        path = self._entry_path(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            self.hits += 1
+            return entry["reconstructed_data"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable reconstruction cache entry {path.name}: {e}")
+            self.misses += 1
+            return None
+
+    def put(self, key: str, data: Any, section_id: Optional[str] = None) -> Optional[Path]:
+        """
+        Persiste o reconstructed_data de uma seção concluída.
+
+        Args:
+            key: Chave calculada por section_cache_key
+            data: Dados reconstruídos (metadata dict ou nodes list)
+            section_id: ID da seção (apenas informativo)
+
+        Returns:
+            Path da entrada ou None se não foi possível gravar
+        """
+        path = self._entry_path(key)
+        entry = {
+            "key": key,
+            "section_id": section_id,
+            "timestamp": datetime.now().isoformat(),
+            "reconstructed_data": data,
+        }
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            logger.debug(f"Cached {section_id or 'section'} as {key[:12]}")
+            return path
+        except OSError as e:
+            logger.warning(f"Failed to write reconstruction cache entry: {e}")
+            return None
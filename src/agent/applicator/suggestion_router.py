@@ -0,0 +1,185 @@
+"""
+Suggestion Router - Índice sugestão -> nós para a reconstrução chunked
+
+Responsabilidades:
+- Indexar (uma vez por protocolo) os identificadores de cada nó: id do nó,
+  uid/id das perguntas, id das opções e id dos itens de conduta
+- Resolver quais nós uma sugestão afeta, mesmo sem specific_location
+- Permitir que cada seção receba apenas as sugestões que a afetam
+
+Ordem de resolução:
+1. Referências explícitas (specific_location/location/implementation_strategy)
+2. Índice nodes[i] de implementation_path.json_path (ou specific_location.path)
+3. Itens de conduta (add_message, add_exam, ...) quando há um único nó de conduta
+4. Identificadores citados no texto da sugestão (apenas os não ambíguos)
+"""
+
+import re
+from typing import Dict, List, Optional, Set
+
+from ..core.logger import logger
+
+
+NODE_INDEX_PATTERN = re.compile(r"nodes\[(\d+)\]")
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z0-9_][\w\-]{3,}")
+
+# Campos de texto livre varridos em busca de identificadores
+TEXT_FIELDS = ("title", "description", "current_state", "proposed_change", "rationale")
+
+# modification_type cujo alvo é uma lista de condutaDataNode
+CONDUCT_MODIFICATION_TYPES = {
+    "add_message", "add_alert", "add_orientation", "add_exam",
+    "add_medication", "add_referral",
+}
+
+
+def _field(container, name: str) -> Optional[str]:
+    """Lê um campo de dict ou objeto Pydantic."""
+    if not container:
+        return None
+    if isinstance(container, dict):
+        return container.get(name)
+    return getattr(container, name, None)
+
+
+class SuggestionRouter:
+    """
+    Índice de roteamento sugestão -> IDs de nós, construído uma vez por protocolo.
+
+    Uso:
+        router = SuggestionRouter(protocol)
+        node_ids = router.route(suggestion)  # [] se não for possível rotear
+    """
+
+    def __init__(self, protocol: Dict):
+        self.node_ids: List[str] = []
+        # Posição em protocol["nodes"] -> id (None para nós sem id), para nodes[i]
+        self.ids_by_position: List[Optional[str]] = []
+        self.conduct_node_ids: List[str] = []
+        # identificador -> nós que o contêm
+        self._owners: Dict[str, Set[str]] = {}
+
+        for node in protocol.get("nodes", []):
+            node_id = node.get("id") if isinstance(node, dict) else None
+            self.ids_by_position.append(node_id or None)
+            if not node_id:
+                continue
+            self.node_ids.append(node_id)
+            if node.get("type") == "conduct":
+                self.conduct_node_ids.append(node_id)
+            for identifier in self._node_identifiers(node):
+                self._owners.setdefault(identifier, set()).add(node_id)
+
+        logger.debug(
+            f"SuggestionRouter indexed {len(self._owners)} identifiers "
+            f"across {len(self.node_ids)} nodes"
+        )
+
+    @staticmethod
+    def _node_identifiers(node: Dict) -> List[str]:
+        """IDs de um nó: o próprio nó, perguntas, opções e itens de conduta."""
+        identifiers = [node["id"]]
+        data = node.get("data") or {}
+
+        for question in data.get("questions") or []:
+            if not isinstance(question, dict):
+                continue
+            identifiers.extend(v for v in (question.get("uid"), question.get("id")) if v)
+            for option in question.get("options") or []:
+                if isinstance(option, dict) and option.get("id"):
+                    identifiers.append(option["id"])
+
+        conduta = data.get("condutaDataNode") or {}
+        if isinstance(conduta, dict):
+            for items in conduta.values():
+                if not isinstance(items, list):
+                    continue
+                identifiers.extend(
+                    item["id"] for item in items if isinstance(item, dict) and item.get("id")
+                )
+
+        return [str(identifier) for identifier in identifiers]
+
+    def owners(self, identifier: Optional[str]) -> Set[str]:
+        """Nós que contêm o identificador (vazio se desconhecido)."""
+        if not identifier:
+            return set()
+        return self._owners.get(str(identifier), set())
+
+    def route(self, suggestion: Dict) -> List[str]:
+        """
+        Resolve os nós afetados por uma sugestão.
+
+        Args:
+            suggestion: Sugestão (dict ou com specific_location Pydantic)
+
+        Returns:
+            IDs de nós na ordem do protocolo ([] se não roteável)
+        """
+        targets = self._explicit_targets(suggestion)
+        if not targets:
+            targets = self._path_targets(suggestion)
+        if not targets:
+            targets = self._conduct_targets(suggestion)
+        if not targets:
+            targets = self._text_targets(suggestion)
+
+        return [node_id for node_id in self.node_ids if node_id in targets]
+
+    def _explicit_targets(self, suggestion: Dict) -> Set[str]:
+        """specific_location / location / implementation_strategy."""
+        references = []
+        for key in ("specific_location", "location", "implementation_strategy"):
+            container = suggestion.get(key)
+            references.append(_field(container, "node_id"))
+            references.append(_field(container, "question_id"))
+
+        targets = set()
+        for reference in references:
+            targets |= self.owners(reference)
+        return targets
+
+    def _path_targets(self, suggestion: Dict) -> Set[str]:
+        """Índice nodes[i] do json_path."""
+        paths = [
+            _field(suggestion.get("implementation_path"), "json_path"),
+            _field(suggestion.get("specific_location"), "path"),
+        ]
+        targets = set()
+        for path in paths:
+            if not isinstance(path, str):
+                continue
+            for match in NODE_INDEX_PATTERN.finditer(path):
+                index = int(match.group(1))
+                if index < len(self.ids_by_position) and self.ids_by_position[index]:
+                    targets.add(self.ids_by_position[index])
+        return targets
+
+    def _text_targets(self, suggestion: Dict) -> Set[str]:
+        """
+        Identificadores citados no texto (ignora os presentes em mais de um nó).
+
+        Condicionais do proposed_value não são varridas: os uids citados nelas
+        pertencem a outros nós (são referências, não o alvo da edição).
+        """
+        texts = [suggestion.get(name) for name in TEXT_FIELDS]
+        proposed = _field(suggestion.get("implementation_path"), "proposed_value")
+        if isinstance(proposed, dict):
+            texts.append(proposed.get("id"))
+
+        targets = set()
+        for text in texts:
+            if not isinstance(text, str):
+                continue
+            for token in IDENTIFIER_PATTERN.findall(text):
+                owners = self._owners.get(token)
+                if owners and len(owners) == 1:
+                    targets |= owners
+        return targets
+
+    def _conduct_targets(self, suggestion: Dict) -> Set[str]:
+        """Itens de conduta vão para o nó de conduta quando ele é único."""
+        modification_type = _field(suggestion.get("implementation_path"), "modification_type")
+        if modification_type in CONDUCT_MODIFICATION_TYPES and len(self.conduct_node_ids) == 1:
+            return {self.conduct_node_ids[0]}
+        return set()
@@ -121,6 +121,11 @@ class InteractiveCLI:
         # Load external config
         self.config = get_config()
         
+        # Pré-carrega o modelo de embeddings enquanto o usuário navega no onboarding
+        if self.config.feedback.preload_embeddings:
+            from ..feedback.embedding_provider import get_embedding_provider
+            get_embedding_provider().start_background_load()
+        
         # Initialize session state for checkpoints
         self.checkpoint_state = get_session_state()
         
@@ -854,7 +859,13 @@ class InteractiveCLI:
             
             # Reconstruir (sem exibir custo novamente)
             with self.display.spinner("Aplicando sugestões..."):
-                reconstructor = ProtocolReconstructor(model=self.session_state.model)
+                section_callback = None
+                if self.config.session.enable_checkpoints:
+                    section_callback = self.checkpoint_state.record_reconstruction_section
+                reconstructor = ProtocolReconstructor(
+                    model=self.session_state.model,
+                    section_callback=section_callback
+                )
                 reconstruction_result = reconstructor.reconstruct_protocol(
                     original_protocol=protocol_json,
                     suggestions=suggestions_for_reconstruction,
@@ -892,7 +903,23 @@ class InteractiveCLI:
                 # Exibir resultados com feedback detalhado (Wave 4.3)
                 changes = reconstruction_result.changes_applied
                 metadata = reconstruction_result.metadata or {}
-                
+
+                section_stats = metadata.get("section_stats", {})
+                if section_stats.get("llm_calls_saved"):
+                    self.display.show_info(
+                        f"⚡ {section_stats['llm_calls_saved']}/{section_stats.get('sections_total', 0)} "
+                        f"seções resolvidas sem chamada ao LLM"
+                    )
+                if section_stats.get("unrouted_suggestions"):
+                    self.display.show_warning(
+                        f"{section_stats['unrouted_suggestions']} sugestão(ões) sem nó identificável "
+                        f"enviada(s) com a primeira seção de nós"
+                    )
+                if section_stats.get("cache_hits"):
+                    self.display.show_info(
+                        f"♻️  {section_stats['cache_hits']} seção(ões) reaproveitada(s) do cache de reconstrução"
+                    )
+
                 # 1. Mostrar verificação de mudanças (O QUE foi realmente modificado)
                 verification = metadata.get("verification", {})
                 if verification:
@@ -25,6 +25,8 @@ class LLMConfig(BaseModel):
     reconstruction_temperature: float = Field(default=0.1, ge=0.0, le=1.0)
     max_tokens: int = Field(default=8192, ge=1000, le=100000)
     api_timeout: int = Field(default=120, ge=30, le=600)
+    max_concurrent_requests: int = Field(default=8, ge=1, le=64)
+    connection_pool_size: int = Field(default=16, ge=1, le=128)
 
 
 class CostControlConfig(BaseModel):
@@ -42,6 +44,11 @@ class AnalysisConfig(BaseModel):
     learned_filter_threshold: int = Field(default=1, ge=1)
     validate_playbook_references: bool = True
     block_generic_suggestions: bool = True
+    playbook_retrieval: bool = False
+    playbook_retrieval_top_k: int = Field(default=12, ge=1, le=100)
+    playbook_retrieval_token_budget: int = Field(default=6000, ge=500, le=200000)
+    playbook_chunk_max_chars: int = Field(default=4000, ge=200)
+    compact_protocol_prompt: bool = True
 
 
 class ReconstructionConfig(BaseModel):
@@ -49,6 +56,14 @@ class ReconstructionConfig(BaseModel):
     use_chunking: bool = True
     chunk_size_kb: int = Field(default=30, ge=10, le=100)
     max_section_retries: int = Field(default=3, ge=1, le=10)
+    parallel_sections: bool = True
+    max_parallel_sections: int = Field(default=4, ge=1, le=32)
+    patch_mode: bool = True
+    compact_protocol_prompt: bool = True
+    deterministic_apply: bool = True
+    section_cache: bool = True
+    section_cache_dir: str = ".reconstruction_cache"
+    section_token_budget: int = Field(default=8000, ge=500, le=200000)
     generate_audit_report: bool = True
     add_changelog_to_nodes: bool = True
 
@@ -59,6 +74,22 @@ class FeedbackConfig(BaseModel):
     max_active_patterns: int = Field(default=100, ge=10)
     pattern_expiry_days: int = Field(default=90, ge=7)
     auto_backup_sessions: bool = True
+    embeddings_enabled: bool = False
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"  # torch | torch_int8 | onnx | onnx_int8 | tfidf
+    preload_embeddings: bool = True
+    similarity_prefilter_top_k: int = Field(default=5, ge=1, le=50)
+    similarity_prefilter_min_score: float = Field(default=0.1, ge=0.0, le=1.0)
+    llm_similarity_batch_size: int = Field(default=25, ge=1, le=200)
+    ann_min_rules: int = Field(default=5000, ge=1)
+    ann_n_probe: int = Field(default=8, ge=1, le=1024)
+    store_backend: str = "markdown"  # markdown | sqlite
+    store_path: str = "memory_qa.sqlite3"
+    rules_journal: bool = True
+    journal_compact_bytes: int = Field(default=262144, ge=0)
+    journal_compact_age_hours: float = Field(default=24.0, ge=0.0)
+    rule_partitioning: bool = True
+    partition_fallback: str = "company"  # none | company | all
 
 
 class PathsConfig(BaseModel):
@@ -68,6 +99,14 @@ class PathsConfig(BaseModel):
     reports_dir: str = "reports"
     logs_dir: str = "logs"
     feedback_sessions_dir: str = "feedback_sessions"
+    playbook_cache_dir: str = ".cache/playbooks"
+
+
+class PlaybookConfig(BaseModel):
+    """Configurações de carregamento de playbooks."""
+    pdf_workers: int = Field(default=0, ge=0)  # 0 = os.cpu_count()
+    pdf_parallel_min_bytes: int = Field(default=5 * 1024 * 1024, ge=0)
+    pdf_pages_per_task: int = Field(default=8, ge=1)
 
 
 class CLIConfig(BaseModel):
@@ -112,6 +151,7 @@ class AppConfig(BaseModel):
     reconstruction: ReconstructionConfig = Field(default_factory=ReconstructionConfig)
     feedback: FeedbackConfig = Field(default_factory=FeedbackConfig)
     paths: PathsConfig = Field(default_factory=PathsConfig)
+    playbook: PlaybookConfig = Field(default_factory=PlaybookConfig)
     cli: CLIConfig = Field(default_factory=CLIConfig)
     session: SessionConfig = Field(default_factory=SessionConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
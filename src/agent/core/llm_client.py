@@ -5,11 +5,14 @@ Responsibility: Communicate with LLM API to send prompts and receive responses.
 NO medical validation, NO clinical interpretation, NO content analysis.
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, Union, Tuple
 from datetime import datetime
@@ -41,6 +44,7 @@ if str(src_dir) not in sys.path:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     _REQUESTS_AVAILABLE = True
 except ImportError:
     _REQUESTS_AVAILABLE = False
@@ -50,6 +54,91 @@ except ImportError:
 # Logger - usar logger do core
 from .logger import logger
 
+# Defaults do transporte (sobrescritos por config.yaml -> llm)
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+DEFAULT_CONNECTION_POOL_SIZE = 16
+DEFAULT_API_TIMEOUT = 120
+
+# Transporte compartilhado pelo processo: um pool keep-alive + limite de concorrência
+_shared_session = None
+_request_slots: Optional[threading.BoundedSemaphore] = None
+_transport_lock = threading.Lock()
+
+
+def _load_transport_settings() -> Tuple[int, int, int]:
+    """Lê (max_concurrent_requests, connection_pool_size, api_timeout) do config.yaml."""
+    try:
+        from .config_loader import get_config
+        llm_config = get_config().llm
+        return (
+            llm_config.max_concurrent_requests,
+            llm_config.connection_pool_size,
+            llm_config.api_timeout,
+        )
+    except Exception:
+        return DEFAULT_MAX_CONCURRENT_REQUESTS, DEFAULT_CONNECTION_POOL_SIZE, DEFAULT_API_TIMEOUT
+
+
+def get_shared_transport(
+    max_concurrency: Optional[int] = None,
+    pool_size: Optional[int] = None
+):
+    """
+    Retorna (session, slots) compartilhados por todos os LLMClient do processo.
+
+    A session mantém conexões keep-alive com o OpenRouter (sem novo handshake
+    TCP/TLS por chamada) e `slots` limita o número de requisições simultâneas.
+    Os parâmetros só têm efeito na primeira chamada (ou após close_shared_transport).
+    """
+    global _shared_session, _request_slots
+
+    if not _REQUESTS_AVAILABLE:
+        raise ImportError("requests library not available. Install with: pip install requests")
+
+    with _transport_lock:
+        if _shared_session is None:
+            default_concurrency, default_pool, _ = _load_transport_settings()
+            concurrency = max_concurrency or default_concurrency
+            pool = max(pool_size or default_pool, concurrency)
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            _shared_session = session
+            _request_slots = threading.BoundedSemaphore(concurrency)
+            logger.debug(f"LLM transport initialized (pool={pool}, max_concurrency={concurrency})")
+
+        return _shared_session, _request_slots
+
+
+def close_shared_transport() -> None:
+    """Fecha o pool de conexões compartilhado (recriado na próxima chamada)."""
+    global _shared_session, _request_slots
+    with _transport_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+        _shared_session = None
+        _request_slots = None
+
+
+def run_sync(coro):
+    """
+    Executa uma coroutine a partir de código síncrono.
+
+    Se já existe um event loop rodando nesta thread (ex: chamada síncrona
+    feita de dentro de código async), executa em uma thread auxiliar para
+    não bloquear/reentrar no loop atual.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class LLMClient:
     """
@@ -59,7 +148,12 @@ class LLMClient:
     All medical intelligence is in the prompt, not in this code.
     """
     
-    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None
+    ):
         """
         Initialize LLM client.
         
@@ -68,6 +162,9 @@ class LLMClient:
         Args:
             model: LLM model identifier (default: from environment or model catalog)
             api_key: API key (default: from environment)
+            max_concurrency: Max simultaneous requests on the shared connection pool
+                (default: config.yaml llm.max_concurrent_requests). Only applies when
+                the shared transport is first created.
         """
         # Get API key from parameter first, then environment
         # .env is already loaded at module import time
@@ -142,6 +239,8 @@ class LLMClient:
         
         self.base_url = "https://openrouter.ai/api/v1"
         self.available = bool(self.api_key)
+        self.timeout = _load_transport_settings()[2]
+        self._max_concurrency = max_concurrency
         
         if not self.api_key:
             raise ValueError(
@@ -184,6 +283,19 @@ class LLMClient:
         return any(grok_model in model.lower() for grok_model in grok_models)
 
     def _run_with_auto_continue(self, prompt: Union[str, Dict], max_tokens: int = 20000) -> str:
+        """
+        Sync wrapper over _run_with_auto_continue_async.
+
+        Args:
+            prompt: String prompt OR structured dict with system/messages
+            max_tokens: Maximum tokens per call (default: 20000)
+
+        Returns:
+            Complete output as string (concatenated if continued)
+        """
+        return run_sync(self._run_with_auto_continue_async(prompt, max_tokens=max_tokens))
+
+    async def _run_with_auto_continue_async(self, prompt: Union[str, Dict], max_tokens: int = 20000) -> str:
         """
         Universal auto-continue wrapper for LLM completions.
 
@@ -205,7 +317,7 @@ class LLMClient:
         while True:
             # Call low-level API
             call_start = time.time()
-            content, finish_reason, usage = self._call_api(current_prompt, attempt=0, max_tokens=max_tokens)
+            content, finish_reason, usage = await self._call_api_async(current_prompt, attempt=0, max_tokens=max_tokens)
             call_latency = int((time.time() - call_start) * 1000)
             
             # Track usage (Wave 3)
@@ -267,6 +379,25 @@ class LLMClient:
     def analyze(self, prompt: Union[str, Dict], max_retries: int = 3) -> Dict:
         """
         Send analysis prompt to LLM and return parsed JSON response.
+
+        Thin sync wrapper over analyze_async (same arguments, return and errors).
+
+        Example:
+            >>> client = LLMClient()
+            >>> prompt = "Analyze this protocol..."
+            >>> result = client.analyze(prompt)
+            >>> "clinical_extraction" in result
+            True
+        """
+        return run_sync(self.analyze_async(prompt, max_retries=max_retries))
+
+    async def analyze_async(self, prompt: Union[str, Dict], max_retries: int = 3) -> Dict:
+        """
+        Send analysis prompt to LLM and return parsed JSON response (asyncio).
+
+        Network waits run on the shared keep-alive pool, so several coroutines
+        (reconstruction sections, similarity checks, batch runs) can overlap
+        their requests up to the configured concurrency limit.
         
         Simple API call and JSON parsing only.
         NO medical validation, NO clinical interpretation.
@@ -289,8 +420,7 @@ class LLMClient:
             
         Example:
             >>> client = LLMClient()
-            >>> prompt = "Analyze this protocol..."
-            >>> result = client.analyze(prompt)
+            >>> result = await client.analyze_async("Analyze this protocol...")
             >>> "clinical_extraction" in result
             True
         """
@@ -303,7 +433,7 @@ class LLMClient:
         for attempt in range(max_retries):
             try:
                 # Call LLM API with auto-continue (handles truncation automatically)
-                response_text = self._run_with_auto_continue(prompt, max_tokens=20000)
+                response_text = await self._run_with_auto_continue_async(prompt, max_tokens=20000)
 
                 # Extract and parse JSON from response
                 analysis_result = self._extract_json_from_response(response_text)
@@ -324,7 +454,7 @@ class LLMClient:
                 )
                 if attempt < max_retries - 1:
                     wait_time = 2 ** attempt  # Exponential backoff
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     raise Exception(f"LLM API timeout after {max_retries} attempts")
             
@@ -335,7 +465,7 @@ class LLMClient:
                         logger.warning(f"Rate limited (attempt {attempt + 1}/{max_retries})")
                         if attempt < max_retries - 1:
                             wait_time = 5 * (attempt + 1)
-                            time.sleep(wait_time)
+                            await asyncio.sleep(wait_time)
                         else:
                             raise Exception(f"Rate limited after {max_retries} attempts")
                     elif e.response.status_code == 402:
@@ -414,7 +544,7 @@ class LLMClient:
                         f"Transient error (attempt {attempt + 1}/{max_retries}): {e}. "
                         f"Retrying in {wait_time}s..."
                     )
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
                 
                 logger.error(f"Unexpected error in LLM call: {e}", exc_info=True)
@@ -426,6 +556,23 @@ class LLMClient:
                     "partial_result": None
                 }
     
+    async def _call_api_async(
+        self,
+        prompt: Union[str, Dict],
+        attempt: int = 0,
+        max_tokens: int = 20000
+    ) -> Tuple[str, str, Dict]:
+        """
+        Async version of _call_api.
+
+        The blocking HTTP call runs on a worker thread over the shared pooled
+        session, so the event loop stays free while the request is in flight.
+
+        Returns:
+            Tuple of (content, finish_reason, usage_dict)
+        """
+        return await asyncio.to_thread(self._call_api, prompt, attempt, max_tokens)
+
     def _call_api(self, prompt: Union[str, Dict], attempt: int = 0, max_tokens: int = 20000) -> Tuple[str, str, Dict]:
         """
         Make API call to OpenRouter with support for prompt caching.
@@ -566,12 +713,15 @@ class LLMClient:
                 payload["max_tokens"] = max_tokens
             logger.debug(f"Using string prompt (no caching, attempt {attempt + 1}, free_model={is_free_model}, grok={is_grok_model}, max_tokens={'N/A' if is_grok_model else payload.get('max_tokens', 'N/A')})")
         
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=120  # Increased timeout for large responses
-        )
+        # Shared keep-alive pool; slots bound concurrent requests across all clients
+        session, slots = get_shared_transport(max_concurrency=self._max_concurrency)
+        with slots:
+            response = session.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout  # Increased timeout for large responses
+            )
         
         # Tratamento de erro 402 (Payment Required)
         if response.status_code == 402:
@@ -0,0 +1,152 @@
+"""
+Playbook Cache - Cache em disco do playbook pré-processado
+
+Guarda, por hash do arquivo do playbook:
+- Texto extraído (evita reextrair páginas de PDFs com PyPDF2)
+- Texto normalizado, offsets e tokens das sentenças (PlaybookIndex)
+
+Layout (paths.playbook_cache_dir, relativo à raiz do projeto):
+    manifest.json          caminho -> {mtime_ns, size, sha1}
+    <sha1 do arquivo>.json  {"version", "text", "preprocessed"}
+
+O manifest valida por mtime e tamanho (sem ler o arquivo); se mudarem, o
+arquivo é lido e o hash decide se o pré-processamento existente serve
+(ex: arquivo copiado ou apenas "tocado").
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .logger import logger
+
+# extract(path, on_chunk) -> texto; on_chunk recebe as partes em ordem
+Extractor = Callable[[Path, Callable[[str], None]], str]
+
+# Versão do formato (incrementar ao mudar o pré-processamento)
+CACHE_VERSION = 1
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parent.parent.parent.parent
+
+
+def resolve_cache_dir() -> Optional[Path]:
+    """Diretório do cache (None se desativado em config.yaml)."""
+    cache_dir = ".cache/playbooks"
+    try:
+        from .config_loader import get_config
+        cache_dir = get_config().paths.playbook_cache_dir
+    except Exception:
+        pass
+    if not cache_dir:
+        return None
+    path = Path(cache_dir)
+    return path if path.is_absolute() else _project_root() / path
+
+
+def _write_json_atomic(path: Path, data: Dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class PlaybookCache:
+    """Cache de playbooks extraídos e pré-processados."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_path = self.cache_dir / MANIFEST_FILENAME
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_entry(self, file_sha1: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.cache_dir / f"{file_sha1}.json", 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("version") == CACHE_VERSION else None
+
+    def load(self, path: Path, extract: Extractor) -> Dict[str, Any]:
+        """
+        Texto e pré-processamento do playbook, extraindo só em cache miss.
+
+        Args:
+            path: Arquivo do playbook
+            extract: Extração do texto (chamada só quando não há cache); as
+                partes extraídas alimentam o pré-processamento à medida que chegam
+
+        Returns:
+            Entrada {"version", "text", "preprocessed", "text_sha1"}
+        """
+        from ..validators.playbook_index import PlaybookPreprocessor, content_hash
+
+        key = str(path.resolve())
+        stat = path.stat()
+        manifest = self._read_manifest()
+        known = manifest.get(key)
+
+        # Caminho rápido: mesmo mtime e tamanho
+        if known and known.get("mtime_ns") == stat.st_mtime_ns and known.get("size") == stat.st_size:
+            entry = self._read_entry(known.get("sha1", ""))
+            if entry is not None:
+                logger.info(f"Playbook cache hit: {path.name}")
+                return entry
+
+        file_sha1 = hashlib.sha1(path.read_bytes()).hexdigest()
+        entry = self._read_entry(file_sha1)
+        if entry is None:
+            preprocessor = PlaybookPreprocessor()
+            text = extract(path, preprocessor.feed)
+            entry = {
+                "version": CACHE_VERSION,
+                "text": text,
+                "text_sha1": content_hash(text),
+                "preprocessed": preprocessor.finish(),
+            }
+            _write_json_atomic(self.cache_dir / f"{file_sha1}.json", entry)
+            logger.info(f"Playbook cached: {path.name} ({file_sha1[:12]})")
+
+        manifest[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": file_sha1}
+        _write_json_atomic(self.manifest_path, manifest)
+        return entry
+
+
+def load_cached_playbook(path: Path, extract: Extractor) -> Optional[str]:
+    """
+    Carrega o playbook pelo cache e registra o pré-processamento no PlaybookIndex.
+
+    Returns:
+        Texto do playbook, ou None se o cache estiver desativado/indisponível
+        (o chamador extrai normalmente)
+    """
+    cache_dir = resolve_cache_dir()
+    if cache_dir is None:
+        return None
+
+    try:
+        entry = PlaybookCache(cache_dir).load(path, extract)
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Playbook cache unavailable ({e}), loading without cache")
+        return None
+
+    from ..validators.playbook_index import register_preprocessed
+    register_preprocessed(entry["text_sha1"], entry["preprocessed"])
+    return entry["text"]
@@ -0,0 +1,277 @@
+"""
+Playbook Retrieval - Contexto do playbook restrito ao que o protocolo usa
+
+Etapa opcional (analysis.playbook_retrieval) antes da montagem do prompt:
+1. Divide o playbook em chunks por títulos markdown (seções longas são
+   quebradas em parágrafos até analysis.playbook_chunk_max_chars)
+2. Indexa os chunks com BM25
+3. Consulta com os títulos das perguntas, exames, mensagens, medicamentos,
+   orientações e encaminhamentos do protocolo
+4. Inclui os top-k chunks que cabem no orçamento de tokens, na ordem do
+   documento, cada um com seu ID ([[C007 | título]])
+
+O texto de cada chunk é um trecho literal do playbook, então citações
+(playbook_reference) continuam verificáveis contra o texto completo, que é
+o que os validadores de referência recebem.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .logger import logger
+from ..validators.playbook_index import REFERENCE_STOPWORDS
+
+# Títulos markdown (# a ######)
+_HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$', re.MULTILINE)
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+# Mesma estimativa do CostEstimator (~4 caracteres por token)
+CHARS_PER_TOKEN = 4
+
+# Aviso incluído no prompt quando o playbook vai recortado
+SCOPED_PLAYBOOK_NOTE = (
+    "NOTE: The playbook below contains only the sections relevant to this protocol, "
+    "each introduced by a [[chunk_id | section]] marker. Quote playbook text exactly "
+    "as written, without the markers.\n\n"
+)
+
+
+def _analysis_setting(name: str, default):
+    """Lê uma opção de config.yaml -> analysis (default se indisponível)."""
+    try:
+        from .config_loader import get_config
+        return getattr(get_config().analysis, name, default)
+    except Exception:
+        return default
+
+
+def _terms(text: str) -> List[str]:
+    """Termos para BM25 (minúsculas, sem acentos, sem stopwords)."""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return [w for w in re.findall(r'\w+', folded) if len(w) > 2 and w not in REFERENCE_STOPWORDS]
+
+
+@dataclass
+class PlaybookChunk:
+    """Trecho literal do playbook (content[start:end])."""
+    chunk_id: str
+    heading: str
+    start: int
+    end: int
+    text: str
+
+
+def chunk_playbook(content: str, max_chars: int = 4000) -> List[PlaybookChunk]:
+    """
+    Chunks do playbook por título markdown.
+
+    Args:
+        content: Playbook completo
+        max_chars: Tamanho máximo de um chunk (seções maiores são quebradas
+            em limites de parágrafo)
+
+    Returns:
+        Chunks na ordem do documento, cobrindo o texto inteiro
+    """
+    headings = [(m.start(), m.group(2).strip()) for m in _HEADING.finditer(content)]
+    if not headings or headings[0][0] > 0:
+        headings.insert(0, (0, ""))
+
+    chunks: List[PlaybookChunk] = []
+    for number, (start, heading) in enumerate(headings):
+        end = headings[number + 1][0] if number + 1 < len(headings) else len(content)
+        for piece_start, piece_end in _paragraph_blocks(content, start, end, max_chars):
+            text = content[piece_start:piece_end]
+            if not text.strip():
+                continue
+            chunks.append(PlaybookChunk(
+                chunk_id=f"C{len(chunks) + 1:03d}",
+                heading=heading,
+                start=piece_start,
+                end=piece_end,
+                text=text
+            ))
+    return chunks
+
+
+def _paragraph_blocks(content: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """
+    Blocos consecutivos de [start, end) com até max_chars, cortados em
+    quebras de parágrafo (um parágrafo maior que max_chars vira um bloco).
+    """
+    if end - start <= max_chars:
+        return [(start, end)]
+    cuts = [m.end() for m in _PARAGRAPH_BREAK.finditer(content, start, end)] + [end]
+    blocks, block_start, last_cut = [], start, start
+    for cut in cuts:
+        if cut - block_start > max_chars and last_cut > block_start:
+            blocks.append((block_start, last_cut))
+            block_start = last_cut
+        last_cut = cut
+    blocks.append((block_start, end))
+    return blocks
+
+
+class BM25Index:
+    """BM25 (Okapi) sobre os chunks do playbook."""
+
+    def __init__(self, chunks: List[PlaybookChunk], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(_terms(f"{chunk.heading} {chunk.text}")) for chunk in chunks]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        document_frequency: Counter = Counter()
+        for counts in self.term_counts:
+            document_frequency.update(counts.keys())
+        total = len(chunks)
+        self.idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def scores(self, query_terms: List[str]) -> List[float]:
+        """Score BM25 de cada chunk (termos repetidos na consulta contam uma vez)."""
+        terms = [term for term in set(query_terms) if term in self.idf]
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1.0))
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            results.append(score)
+        return results
+
+
+def protocol_query_text(protocol_json: Dict) -> str:
+    """
+    Texto de consulta do protocolo: rótulos dos nós, títulos das perguntas e
+    nomes/conteúdos de exames, mensagens, medicamentos, orientações e
+    encaminhamentos.
+    """
+    parts: List[str] = []
+    for node in (protocol_json or {}).get("nodes", []) or []:
+        data = node.get("data") or {}
+        parts.append(str(data.get("label") or ""))
+        for question in data.get("questions") or []:
+            parts.append(str(question.get("titulo") or ""))
+        conduta = data.get("condutaDataNode") or {}
+        for items in conduta.values():
+            for item in items if isinstance(items, list) else []:
+                if isinstance(item, dict):
+                    parts.append(str(item.get("nome") or ""))
+                    parts.append(str(item.get("conteudo") or ""))
+    return _HTML_TAG.sub(" ", " ".join(part for part in parts if part))
+
+
+@dataclass
+class PlaybookContext:
+    """Contexto selecionado para o prompt."""
+    text: str
+    chunk_ids: List[str]
+    total_chunks: int
+    full_chars: int
+
+
+def select_playbook_context(
+    content: str,
+    protocol_json: Dict,
+    top_k: int = 12,
+    token_budget: int = 6000,
+    max_chunk_chars: int = 4000
+) -> PlaybookContext:
+    """
+    Top-k chunks do playbook para o protocolo, dentro do orçamento de tokens.
+
+    Args:
+        content: Playbook completo
+        protocol_json: Protocolo (fonte da consulta)
+        top_k: Máximo de chunks
+        token_budget: Máximo de tokens estimados do contexto
+        max_chunk_chars: Tamanho máximo de um chunk
+
+    Returns:
+        PlaybookContext (texto com marcadores de chunk, na ordem do documento);
+        chunks sem nenhum termo da consulta nunca entram (seleção vazia)
+    """
+    chunks = chunk_playbook(content, max_chars=max_chunk_chars)
+    scores = BM25Index(chunks).scores(_terms(protocol_query_text(protocol_json)))
+    ranked = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    selected, used = [], 0
+    for i in ranked:
+        if len(selected) >= top_k or scores[i] <= 0:
+            break
+        size = len(chunks[i].text)
+        if used + size > budget_chars:
+            continue
+        selected.append(i)
+        used += size
+
+    blocks = []
+    for i in sorted(selected):
+        chunk = chunks[i]
+        label = f"[[{chunk.chunk_id} | {chunk.heading}]]" if chunk.heading else f"[[{chunk.chunk_id}]]"
+        blocks.append(f"{label}\n{chunk.text.strip()}")
+    return PlaybookContext(
+        text="\n\n".join(blocks),
+        chunk_ids=[chunks[i].chunk_id for i in sorted(selected)],
+        total_chunks=len(chunks),
+        full_chars=len(content)
+    )
+
+
+def scope_playbook_for_prompt(
+    content: str,
+    protocol_json: Dict,
+    enabled: Optional[bool] = None
+) -> Tuple[str, Optional[PlaybookContext]]:
+    """
+    Playbook a colocar no prompt: completo, ou o contexto recuperado quando
+    analysis.playbook_retrieval está ativo e o playbook excede o orçamento.
+
+    Args:
+        content: Playbook completo
+        protocol_json: Protocolo em análise
+        enabled: Força ligar/desligar (None = config.yaml)
+
+    Returns:
+        (texto para o prompt, PlaybookContext ou None se o playbook vai inteiro)
+    """
+    if enabled is None:
+        enabled = _analysis_setting("playbook_retrieval", False)
+    token_budget = _analysis_setting("playbook_retrieval_token_budget", 6000)
+    if not enabled or not content or len(content) <= token_budget * CHARS_PER_TOKEN:
+        return content, None
+
+    try:
+        context = select_playbook_context(
+            content,
+            protocol_json,
+            top_k=_analysis_setting("playbook_retrieval_top_k", 12),
+            token_budget=token_budget,
+            max_chunk_chars=_analysis_setting("playbook_chunk_max_chars", 4000)
+        )
+    except Exception as e:
+        logger.warning(f"Playbook retrieval failed ({e}), using full playbook")
+        return content, None
+
+    if not context.chunk_ids:
+        logger.warning("Playbook retrieval selected no chunks, using full playbook")
+        return content, None
+
+    logger.info(
+        f"Playbook retrieval: {len(context.chunk_ids)}/{context.total_chunks} chunks, "
+        f"{len(context.text)}/{context.full_chars} chars ({', '.join(context.chunk_ids)})"
+    )
+    return context.text, context
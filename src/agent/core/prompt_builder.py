@@ -5,13 +5,14 @@ Responsibility: Assemble the super prompt by substituting playbook and protocol
 content into the template. NO medical interpretation, NO clinical logic.
 """
 
-import json
-from typing import Dict
+from typing import Dict, Optional
 
 from config.prompts.super_prompt import OUTPUT_SCHEMA_JSON
 
 # Logger - usar logger do core
 from .logger import logger
+from .playbook_retrieval import SCOPED_PLAYBOOK_NOTE, scope_playbook_for_prompt
+from .protocol_projection import format_protocol_for_prompt
 
 
 class PromptBuilder:
@@ -26,9 +27,20 @@ class PromptBuilder:
         """Initialize prompt builder."""
         # Note: SUPER_PROMPT_TEMPLATE is no longer used directly
         # Prompt is now built manually to support caching
+        # Chunks do playbook usados no último prompt (None = playbook completo)
+        self.last_playbook_context = None
+        # Projeção compacta usada no último prompt (None = JSON completo)
+        self.last_protocol_projection = None
         logger.debug("PromptBuilder initialized")
     
-    def build_analysis_prompt(self, playbook_content: str, protocol_json: Dict, use_cache: bool = True) -> Dict:
+    def build_analysis_prompt(
+        self,
+        playbook_content: str,
+        protocol_json: Dict,
+        use_cache: bool = True,
+        retrieval: Optional[bool] = None,
+        compact: Optional[bool] = None
+    ) -> Dict:
         """
         Build comprehensive analysis prompt for LLM with optional prompt caching.
         
@@ -39,6 +51,11 @@ class PromptBuilder:
             playbook_content: Raw playbook text content
             protocol_json: Protocol dictionary (will be formatted as JSON)
             use_cache: If True, structure prompt for caching (playbook cacheable, protocol not)
+            retrieval: Include only the playbook chunks relevant to the protocol
+                (None = analysis.playbook_retrieval from config.yaml)
+            compact: Serialize the protocol as the compact projection with ID
+                aliases (None = analysis.compact_protocol_prompt from config.yaml);
+                translate the response back with last_protocol_projection.restore_ids
             
         Returns:
             Dictionary with prompt structure:
@@ -59,19 +76,18 @@ class PromptBuilder:
             >>> "system" in prompt_struct
             True
         """
-        # Format protocol as pretty JSON
+        # Format protocol: compact projection (ID aliases) or pretty JSON
         # NO validation, NO medical analysis - just formatting
-        try:
-            protocol_formatted = json.dumps(
-                protocol_json,
-                indent=2,
-                ensure_ascii=False,
-                sort_keys=False
-            )
-        except (TypeError, ValueError) as e:
-            logger.error(f"Failed to format protocol JSON: {e}")
-            # Fallback: convert to string representation
-            protocol_formatted = str(protocol_json)
+        protocol_formatted, self.last_protocol_projection = format_protocol_for_prompt(
+            protocol_json, enabled=compact
+        )
+        
+        # Optional retrieval stage: top-k playbook chunks under a token budget
+        playbook_content, self.last_playbook_context = scope_playbook_for_prompt(
+            playbook_content, protocol_json, enabled=retrieval
+        )
+        if self.last_playbook_context is not None:
+            playbook_content = SCOPED_PLAYBOOK_NOTE + playbook_content
         
         # Build base instructions (always cacheable if using cache)
         base_instructions = """You are a senior medical QA specialist conducting comprehensive clinical protocol analysis.
@@ -4,10 +4,13 @@ No parsing, no validation, just file loading
 """
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
 from .logger import logger
+from .playbook_cache import load_cached_playbook
 
 
 def load_protocol(protocol_path: str) -> Dict:
@@ -51,14 +54,126 @@ def load_protocol(protocol_path: str) -> Dict:
         raise
 
 
-def load_playbook(playbook_path: str) -> str:
+def _playbook_setting(name: str, default):
+    """Lê uma opção de config.yaml -> playbook (default se indisponível)."""
+    try:
+        from .config_loader import get_config
+        return getattr(get_config().playbook, name, default)
+    except Exception:
+        return default
+
+
+# PdfReader of a pool worker process, opened once by _init_pdf_worker
+_worker_pdf_reader = None
+
+
+def _init_pdf_worker(pdf_path: str) -> None:
+    """Pool initializer: parse the PDF once per worker process."""
+    global _worker_pdf_reader
+    import PyPDF2
+    _worker_pdf_reader = PyPDF2.PdfReader(pdf_path)
+
+
+def _extract_pdf_page_range(start: int, end: int, pdf_reader=None) -> List[str]:
+    """Extract text of pages [start, end) (pool workers use their cached reader)."""
+    pdf_reader = pdf_reader or _worker_pdf_reader
+    return [pdf_reader.pages[number].extract_text() for number in range(start, end)]
+
+
+def _iter_pdf_pages(path: Path) -> Iterator[str]:
+    """
+    Yield PDF page texts in page order.
+    
+    PDFs of at least playbook.pdf_parallel_min_bytes are split into page
+    ranges extracted by a process pool; ranges are yielded in order as soon
+    as each one (and every range before it) completes. Each worker parses
+    the PDF once (pool initializer) and reuses that reader for all its
+    ranges. A failed pool falls back to serial extraction of the remaining
+    pages.
+    """
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(str(path))
+    page_count = len(pdf_reader.pages)
+    workers = _playbook_setting("pdf_workers", 0) or os.cpu_count() or 1
+    per_task = max(1, _playbook_setting("pdf_pages_per_task", 8))
+    parallel = (
+        workers > 1
+        and page_count > per_task
+        and path.stat().st_size >= _playbook_setting("pdf_parallel_min_bytes", 5 * 1024 * 1024)
+    )
+    if not parallel:
+        for page in pdf_reader.pages:
+            yield page.extract_text()
+        return
+    
+    ranges = [(start, min(start + per_task, page_count)) for start in range(0, page_count, per_task)]
+    workers = min(workers, len(ranges))
+    logger.info(f"Extracting {page_count} PDF pages with {workers} workers")
+    done = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_pdf_worker, initargs=(str(path),)
+        ) as pool:
+            futures = [pool.submit(_extract_pdf_page_range, start, end) for start, end in ranges]
+            for future in futures:
+                yield from future.result()
+                done += 1
+    except Exception as e:
+        logger.warning(f"Parallel PDF extraction failed ({e}), extracting remaining pages serially")
+        for start, end in ranges[done:]:
+            yield from _extract_pdf_page_range(start, end, pdf_reader)
+
+
+def _extract_playbook_text(path: Path, on_chunk: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Extract playbook text (PDF pages via PyPDF2, text/markdown as-is).
+    
+    Args:
+        path: Playbook file
+        on_chunk: Called with each piece of text, in order, as it is extracted
+            (streams PDF pages to preprocessing)
+    """
+    # Handle PDF files
+    if path.suffix.lower() == '.pdf':
+        try:
+            text_parts = []
+            for page_text in _iter_pdf_pages(path):
+                if on_chunk:
+                    on_chunk(('\n\n' if text_parts else '') + page_text)
+                text_parts.append(page_text)
+            return '\n\n'.join(text_parts)
+        except ImportError:
+            logger.warning("PyPDF2 not available, cannot read PDF")
+            raise ImportError("PyPDF2 required for PDF playbooks. Install with: pip install PyPDF2")
+        except Exception as e:
+            logger.error(f"Error reading PDF {path}: {e}")
+            raise
+
+    # Handle text/markdown files
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        logger.error(f"Error loading playbook {path}: {e}")
+        raise
+    if on_chunk:
+        on_chunk(content)
+    return content
+
+
+def load_playbook(playbook_path: str, use_cache: bool = True) -> str:
     """
     Load playbook file (markdown, text, or PDF).
     
     Simple file loading - NO parsing, NO extraction.
     
+    Extracted text and its preprocessing (normalized text, sentences, tokens)
+    are cached on disk (paths.playbook_cache_dir), so warm runs skip PDF
+    extraction and normalization.
+    
     Args:
         playbook_path: Path to playbook file
+        use_cache: Use the on-disk playbook cache
         
     Returns:
         Playbook content as string
@@ -73,31 +188,9 @@ def load_playbook(playbook_path: str) -> str:
     
     logger.info(f"Loading playbook from: {playbook_path}")
     
-    # Handle PDF files
-    if path.suffix.lower() == '.pdf':
-        try:
-            import PyPDF2
-            with open(path, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                text_parts = []
-                for page in pdf_reader.pages:
-                    text_parts.append(page.extract_text())
-                content = '\n\n'.join(text_parts)
-        except ImportError:
-            logger.warning("PyPDF2 not available, cannot read PDF")
-            raise ImportError("PyPDF2 required for PDF playbooks. Install with: pip install PyPDF2")
-        except Exception as e:
-            logger.error(f"Error reading PDF {playbook_path}: {e}")
-            raise
-    else:
-        # Handle text/markdown files
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            logger.error(f"Error loading playbook {playbook_path}: {e}")
-            raise
+    content = load_cached_playbook(path, _extract_playbook_text) if use_cache else None
+    if content is None:
+        content = _extract_playbook_text(path)
     
     logger.info(f"Playbook loaded: {len(content)} characters")
     return content
-
@@ -0,0 +1,386 @@
+"""
+Protocol Projection - Projeção compacta do protocolo para prompts
+
+O JSON do protocolo serializado com indent=2 carrega campos que o LLM não usa
+(posição no editor, iid das opções, templateMarkdown) e UUIDs longos. A
+projeção:
+- Remove campos só de interface (UI_ONLY_KEYS) e valores vazios
+  ("", None, [], {})
+- Remove campos deriváveis: nodeId das perguntas (= id do nó) e id das
+  arestas (= "e-<source>-<target>")
+- Substitui IDs longos por aliases curtos: nós -> @N1, @N2...; perguntas com
+  UUID -> @Q1...; demais IDs com UUID (itens de conduta, expressões) -> @I1...
+  O "@" distingue o alias de texto clínico ("classe I1", "estadiamento N1").
+- Serializa sem indentação
+
+uid das perguntas e id das opções são nomes curtos referenciados pelas
+expressões (ex: "'sincope' in main") e ficam inalterados.
+
+A projeção é reversível: restore_ids traduz os aliases de volta nas respostas
+do LLM (node_id, caminhos de patch, valores e texto livre) e restore_dropped
+reinsere, a partir do original, os campos removidos de nós reemitidos pelo
+LLM. Elementos novos recebem os campos derivados que lhes faltam
+(complete_new_elements).
+
+A numeração dos aliases depende só do protocolo: a análise e a reconstrução
+do mesmo protocolo usam os mesmos aliases, e projeções de seções podem
+compartilhar o mapa da projeção do protocolo inteiro (shared).
+"""
+
+import copy
+import json
+import re
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from .logger import logger
+
+# Mesma estimativa do CostEstimator (~4 caracteres por token)
+CHARS_PER_TOKEN = 4
+
+# Campos só de interface (editor visual)
+UI_ONLY_KEYS = {"position", "iid", "templateMarkdown"}
+
+# Campos que o LLM pode omitir ao reemitir um nó e que voltam do original
+RESTORED_KEYS = UI_ONLY_KEYS | {"id", "nodeId"}
+
+# Aviso incluído no prompt antes do protocolo compacto
+COMPACT_PROTOCOL_NOTE = (
+    "NOTE: The protocol JSON below is compacted: editor-only fields (position, iid, "
+    "templateMarkdown) and empty fields are omitted, and long IDs are replaced by short "
+    "aliases (@N1.. for nodes, @Q1.. for questions, @I1.. for items). Refer to nodes and "
+    "items by these aliases, including the \"@\" (e.g. node_id \"@N3\"); list indexes are "
+    "unchanged.\n\n"
+)
+
+# Aviso dos prompts de reconstrução (nós reemitidos voltam pelo restore)
+COMPACT_NODES_NOTE = (
+    "NOTE: Nodes are shown in compact form: editor-only fields (position, iid, "
+    "templateMarkdown) and empty fields are omitted and long IDs are short aliases "
+    "(@N1.. nodes, @Q1.. questions, @I1.. items). Use the aliases exactly as given, "
+    "including the \"@\"; omitted fields are restored automatically, do not add them.\n"
+)
+
+_UUID = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+_ALIAS_TOKEN = re.compile(r'(?<![\w@])@[NQI]\d+\b')
+
+
+def _analysis_setting(name: str, default):
+    """Lê uma opção de config.yaml -> analysis (default se indisponível)."""
+    try:
+        from .config_loader import get_config
+        return getattr(get_config().analysis, name, default)
+    except Exception:
+        return default
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _taken_strings(value: Any, found: set) -> set:
+    """Strings do protocolo e tokens com cara de alias dentro delas (não podem virar alias)."""
+    if isinstance(value, str):
+        found.add(value)
+        found.update(_ALIAS_TOKEN.findall(value))
+    elif isinstance(value, dict):
+        for item in value.values():
+            _taken_strings(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _taken_strings(item, found)
+    return found
+
+
+def _has_key(value: Any, key: str) -> bool:
+    if isinstance(value, dict):
+        return key in value or any(_has_key(item, key) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_key(item, key) for item in value)
+    return False
+
+
+class ProtocolProjection:
+    """Projeção compacta de um protocolo (ou de uma lista de nós) com mapa de aliases."""
+
+    def __init__(self, protocol: Any, shared: Optional["ProtocolProjection"] = None):
+        """
+        Args:
+            protocol: Protocolo completo ({"metadata", "nodes", "edges"}) ou
+                lista de nós (seção da reconstrução)
+            shared: Projeção cujo mapa de aliases é reutilizado (ex: a do
+                protocolo inteiro, para uma seção); IDs fora dele ganham
+                aliases novos, registrados no mapa compartilhado
+        """
+        self.original = protocol
+        if shared is not None:
+            self.aliases = shared.aliases
+            self.alias_of = shared.alias_of
+            self._taken = _taken_strings(protocol, shared._taken)
+            self._counters = shared._counters
+        else:
+            self.aliases: Dict[str, str] = {}     # alias -> ID original
+            self.alias_of: Dict[str, str] = {}    # ID original -> alias
+            self._taken = _taken_strings(protocol, set())
+            self._counters = {"N": 0, "Q": 0, "I": 0}
+        # Elementos novos só ganham nodeId/iid se o protocolo usa esses campos
+        self._keeps_node_id = _has_key(protocol, "nodeId")
+        self._keeps_iid = _has_key(protocol, "iid")
+
+        nodes = protocol if isinstance(protocol, list) else (protocol or {}).get("nodes") or []
+        for node in nodes:
+            if isinstance(node, dict) and isinstance(node.get("id"), str):
+                self._assign("N", node["id"])
+        self.data = self._project(protocol, context="nodes" if isinstance(protocol, list) else None)
+
+    def _assign(self, prefix: str, original_id: str) -> str:
+        if original_id in self.alias_of:
+            return self.alias_of[original_id]
+        while True:
+            self._counters[prefix] += 1
+            alias = f"@{prefix}{self._counters[prefix]}"
+            if alias not in self._taken:
+                break
+        self.aliases[alias] = original_id
+        self.alias_of[original_id] = alias
+        return alias
+
+    def _alias_id(self, value: Any, prefix: str) -> Any:
+        if not isinstance(value, str):
+            return value
+        if value in self.alias_of:
+            return self.alias_of[value]
+        if _UUID.search(value):
+            return self._assign(prefix, value)
+        return value
+
+    def _project(self, value: Any, context: Optional[str], owner_id: Optional[str] = None) -> Any:
+        if isinstance(value, list):
+            return [self._project(item, context, owner_id) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        is_node = context == "nodes"
+        is_edge = context == "edges"
+        if is_node:
+            owner_id = value.get("id")
+        derived_edge_id = f"e-{value.get('source')}-{value.get('target')}" if is_edge else None
+
+        projected = {}
+        for key, item in value.items():
+            if key in UI_ONLY_KEYS or _is_empty(item):
+                continue
+            if key == "nodeId" and item == owner_id:
+                continue
+            if is_edge and key == "id" and item == derived_edge_id:
+                continue
+            if key in ("nodes", "edges") and context is None:
+                projected[key] = self._project(item, key)
+            elif key in ("id", "nodeId", "source", "target"):
+                prefix = "Q" if context == "questions" else "I"
+                projected[key] = self._alias_id(item, prefix)
+            elif key == "questions":
+                projected[key] = self._project(item, "questions", owner_id)
+            else:
+                projected[key] = self._project(item, "items", owner_id)
+        return projected
+
+    def to_json(self) -> str:
+        """Projeção serializada sem indentação (para o prompt)."""
+        return json.dumps(self.data, ensure_ascii=False, separators=(",", ":"))
+
+    def alias(self, original_id: Any) -> Any:
+        """Alias de um ID original (o próprio valor se não tiver alias)."""
+        return self.alias_of.get(original_id, original_id) if isinstance(original_id, str) else original_id
+
+    def restore_ids(self, value: Any) -> Any:
+        """
+        Traduz aliases de volta para os IDs originais numa resposta do LLM.
+
+        Em toda string (IDs, caminhos, títulos, justificativas, valores JSON
+        serializados) cada token de alias conhecido (@N3) é trocado. Texto
+        clínico sem "@" ("classe I1", "N1") nunca é alterado, e tokens "@N1"
+        que já existiam no protocolo não viram alias.
+        """
+        if isinstance(value, dict):
+            return {k: self.restore_ids(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.restore_ids(item) for item in value]
+        if isinstance(value, str) and self.aliases:
+            if value in self.aliases:
+                return self.aliases[value]
+            return _ALIAS_TOKEN.sub(lambda m: self.aliases.get(m.group(0), m.group(0)), value)
+        return value
+
+    def restore_dropped(
+        self,
+        value: Any,
+        original: Any,
+        key: Optional[str] = None,
+        owner_id: Optional[str] = None
+    ) -> Any:
+        """
+        Reinsere, a partir do original, os campos que a projeção removeu.
+
+        value já deve estar com os IDs originais (restore_ids). Dicts são
+        casados pelo id (ou source/target, para arestas); campos ausentes em
+        value voltam do original se forem de interface, deriváveis ou vazios.
+        Campos presentes em value (alterados pelo LLM) prevalecem. Elementos
+        sem par no original passam por complete_new_elements.
+
+        Args:
+            value: Valor devolvido pelo LLM
+            original: Valor correspondente no original (None = elemento novo)
+            key: Chave sob a qual value fica (ex: "questions", "options")
+            owner_id: Nó dono de value
+        """
+        if original is None:
+            return self.complete_new_elements(value, owner_id, key)
+
+        if isinstance(value, dict) and isinstance(original, dict):
+            if _is_node(value, key):
+                owner_id = value["id"]
+            merged = {}
+            for child_key, original_item in original.items():
+                if child_key in value:
+                    merged[child_key] = self.restore_dropped(value[child_key], original_item, child_key, owner_id)
+                elif child_key in RESTORED_KEYS or _is_empty(original_item):
+                    merged[child_key] = copy.deepcopy(original_item)
+            for child_key, item in value.items():
+                if child_key not in merged:
+                    merged[child_key] = self.restore_dropped(item, None, child_key, owner_id)
+            return merged
+
+        if isinstance(value, list) and isinstance(original, list):
+            by_key = {}
+            for item in original:
+                item_key = _element_key(item)
+                if item_key is not None:
+                    by_key.setdefault(item_key, item)
+            same_length = len(value) == len(original)
+            restored = []
+            for position, item in enumerate(value):
+                match = by_key.get(_element_key(item))
+                if match is None and same_length and _element_key(item) is None:
+                    match = original[position]
+                restored.append(self.restore_dropped(item, match, key, owner_id))
+            return restored
+
+        return value
+
+    def complete_new_elements(self, value: Any, owner_id: Optional[str] = None, key: Optional[str] = None) -> Any:
+        """
+        Preenche campos derivados ausentes em elementos novos (sem par no original).
+
+        Perguntas sem nodeId recebem o id do nó dono; opções e códigos sem iid
+        recebem um UUID novo. Só vale para campos que o protocolo usa.
+
+        Args:
+            value: Nós, protocolo ou valor de uma operação de patch (alterado in-place)
+            owner_id: Nó dono de value (valores de patch dentro de um nó)
+            key: Chave sob a qual value fica (ex: "questions", "options")
+        """
+        if isinstance(value, list):
+            for item in value:
+                self.complete_new_elements(item, owner_id, key)
+            return value
+        if not isinstance(value, dict):
+            return value
+
+        if key == "questions":
+            if self._keeps_node_id and owner_id and "nodeId" not in value:
+                value["nodeId"] = owner_id
+        elif key in ("options", "codigo"):
+            if self._keeps_iid and "iid" not in value:
+                value["iid"] = str(uuid.uuid4())
+        elif _is_node(value, key):
+            owner_id = value["id"]
+
+        for child_key, item in value.items():
+            if isinstance(item, (dict, list)):
+                self.complete_new_elements(item, owner_id, child_key)
+        return value
+
+    def restore(self, value: Any, original: Any = None) -> Any:
+        """restore_ids + restore_dropped (original padrão: o objeto projetado)."""
+        return self.restore_dropped(self.restore_ids(value), self.original if original is None else original)
+
+
+def _is_node(value: Dict, key: Optional[str]) -> bool:
+    return key in (None, "nodes") and isinstance(value.get("data"), dict) and isinstance(value.get("id"), str)
+
+
+def _element_key(item: Any) -> Optional[tuple]:
+    if not isinstance(item, dict):
+        return None
+    if "source" in item and "target" in item:
+        return ("edge", item.get("source"), item.get("target"))
+    if isinstance(item.get("id"), str):
+        return ("id", item["id"])
+    return None
+
+
+def projection_savings(protocol: Any) -> Dict[str, Any]:
+    """
+    Tamanho do protocolo no prompt: indent=2 (anterior) vs projeção compacta.
+
+    Returns:
+        {"full_bytes", "compact_bytes", "saved_bytes", "full_tokens",
+         "compact_tokens", "saved_tokens", "saved_pct", "aliases"}
+    """
+    full = json.dumps(protocol, ensure_ascii=False, indent=2)
+    projection = ProtocolProjection(protocol)
+    compact = projection.to_json()
+    full_bytes = len(full.encode("utf-8"))
+    compact_bytes = len(compact.encode("utf-8"))
+    full_tokens = len(full) // CHARS_PER_TOKEN
+    compact_tokens = len(compact) // CHARS_PER_TOKEN
+    return {
+        "full_bytes": full_bytes,
+        "compact_bytes": compact_bytes,
+        "saved_bytes": full_bytes - compact_bytes,
+        "full_tokens": full_tokens,
+        "compact_tokens": compact_tokens,
+        "saved_tokens": full_tokens - compact_tokens,
+        "saved_pct": round(100.0 * (full_bytes - compact_bytes) / full_bytes, 1) if full_bytes else 0.0,
+        "aliases": len(projection.aliases),
+    }
+
+
+def format_protocol_for_prompt(
+    protocol_json: Dict,
+    enabled: Optional[bool] = None
+) -> Tuple[str, Optional[ProtocolProjection]]:
+    """
+    Protocolo a colocar no prompt de análise: projeção compacta (com aviso)
+    quando analysis.compact_protocol_prompt está ativo, senão JSON com indent=2.
+
+    Args:
+        protocol_json: Protocolo em análise
+        enabled: Força ligar/desligar (None = config.yaml)
+
+    Returns:
+        (texto para o prompt, ProtocolProjection ou None se o protocolo vai inteiro)
+    """
+    if enabled is None:
+        enabled = _analysis_setting("compact_protocol_prompt", True)
+
+    if enabled:
+        try:
+            projection = ProtocolProjection(protocol_json)
+            compact = projection.to_json()
+            full_chars = len(json.dumps(protocol_json, ensure_ascii=False, indent=2))
+            logger.info(
+                f"Compact protocol projection: {len(compact)}/{full_chars} chars "
+                f"(~{(full_chars - len(compact)) // CHARS_PER_TOKEN} tokens saved, "
+                f"{len(projection.aliases)} aliases)"
+            )
+            return COMPACT_PROTOCOL_NOTE + compact, projection
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.warning(f"Compact protocol projection failed ({e}), using full JSON")
+
+    try:
+        return json.dumps(protocol_json, indent=2, ensure_ascii=False, sort_keys=False), None
+    except (TypeError, ValueError) as e:
+        logger.error(f"Failed to format protocol JSON: {e}")
+        return str(protocol_json), None
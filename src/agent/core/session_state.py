@@ -34,6 +34,7 @@ class SessionCheckpoint:
     analysis_complete: bool = False
     feedback_complete: bool = False
     reconstruction_complete: bool = False
+    reconstruction_cache_keys: Dict[str, str] = field(default_factory=dict)
     data: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -79,6 +80,8 @@ class SessionState:
         self.current_suggestion_index: int = 0
         self.analysis_result: Optional[Dict] = None
         self.reconstruction_result: Optional[Dict] = None
+        # section_id -> chave no cache de reconstrução (seções já concluídas)
+        self.reconstruction_cache_keys: Dict[str, str] = {}
         self.custom_data: Dict[str, Any] = {}
         
         # Garante que diretório existe
@@ -136,6 +139,20 @@ class SessionState:
         """Avança índice de sugestão atual."""
         self.current_suggestion_index += 1
     
+    def record_reconstruction_section(self, section_id: str, cache_key: str):
+        """
+        Registra seção reconstruída e salva checkpoint imediatamente.
+
+        Permite retomar uma sessão interrompida no meio da reconstrução:
+        as seções registradas são recuperadas do cache pela chave.
+
+        Args:
+            section_id: ID da seção concluída
+            cache_key: Chave da seção no cache de reconstrução
+        """
+        self.reconstruction_cache_keys[section_id] = cache_key
+        self.save_checkpoint(force=True)
+    
     def set_custom_data(self, key: str, value: Any):
         """Armazena dados customizados."""
         self.custom_data[key] = value
@@ -175,6 +192,7 @@ class SessionState:
             analysis_complete=self.stage in ["results", "feedback", "reconstruction", "complete"],
             feedback_complete=self.stage in ["reconstruction", "complete"],
             reconstruction_complete=self.stage == "complete",
+            reconstruction_cache_keys=dict(self.reconstruction_cache_keys),
             data={
                 "custom_data": self.custom_data,
                 "session_id": self.session_id
@@ -258,6 +276,7 @@ class SessionState:
             self.approved_suggestions = checkpoint.approved_suggestions.copy()
             self.rejected_suggestions = checkpoint.rejected_suggestions.copy()
             self.current_suggestion_index = checkpoint.current_suggestion_index
+            self.reconstruction_cache_keys = dict(checkpoint.reconstruction_cache_keys)
             
             if "custom_data" in checkpoint.data:
                 self.custom_data = checkpoint.data["custom_data"]
@@ -307,6 +326,8 @@ class SessionState:
         print(f"  Progresso: {checkpoint.current_suggestion_index} de {checkpoint.suggestions_count} sugestões")
         print(f"  Aprovadas: {len(checkpoint.approved_suggestions)}")
         print(f"  Rejeitadas: {len(checkpoint.rejected_suggestions)}")
+        if checkpoint.reconstruction_cache_keys:
+            print(f"  Seções reconstruídas (em cache): {len(checkpoint.reconstruction_cache_keys)}")
         print(f"  Timestamp: {checkpoint.timestamp}")
         print("="*60)
         
@@ -332,6 +353,7 @@ class SessionState:
             "suggestions_reviewed": self.current_suggestion_index,
             "suggestions_approved": len(self.approved_suggestions),
             "suggestions_rejected": len(self.rejected_suggestions),
+            "reconstruction_sections_done": len(self.reconstruction_cache_keys),
             "analysis_complete": self.analysis_result is not None,
             "reconstruction_complete": self.reconstruction_result is not None
         }
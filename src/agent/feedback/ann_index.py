@@ -0,0 +1,153 @@
+"""
+ANN Index - Busca aproximada de vizinhos para regras de memória (NumPy puro)
+
+Responsabilidades:
+- Indexar a matriz de embeddings das regras em listas invertidas (IVF):
+  k-means esférico define os centróides, cada regra vai para a lista do
+  centróide mais próximo
+- Buscar o vizinho mais similar (cosseno) visitando apenas as n_probe listas
+  mais próximas da consulta
+
+Usado pelo MemoryEngine quando o número de regras passa de
+feedback.ann_min_rules; abaixo disso a varredura exata (matmul) é mais rápida.
+"""
+
+from typing import Any, Optional, Tuple
+
+from ..core.logger import logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class IVFIndex:
+    """
+    Índice IVF (inverted file) sobre vetores normalizados.
+
+    Uso:
+        index = IVFIndex(n_probe=8).build(rule_matrix)
+        scores, ids = index.search(query_matrix, k=1)
+    """
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        seed: int = 0
+    ):
+        """
+        Args:
+            n_lists: Número de listas (default: ~sqrt(N))
+            n_probe: Listas visitadas por consulta (recall x latência)
+            n_iter: Iterações do k-means
+            seed: Semente (construção determinística)
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.seed = seed
+        self.centroids: Optional[Any] = None
+        self._vectors: Optional[Any] = None
+        # Vetores reordenados por lista: lista i ocupa _offsets[i]:_offsets[i+1]
+        self._order: Optional[Any] = None
+        self._offsets: Optional[Any] = None
+
+    def __len__(self) -> int:
+        return 0 if self._vectors is None else len(self._vectors)
+
+    @staticmethod
+    def _normalize(matrix: Any) -> Any:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def build(self, vectors: Any) -> "IVFIndex":
+        """
+        Constrói o índice (k-means esférico + atribuição às listas).
+
+        Args:
+            vectors: Matriz (N, dim) de embeddings
+
+        Returns:
+            self
+        """
+        vectors = self._normalize(vectors)
+        count = len(vectors)
+        n_lists = self.n_lists or max(1, int(np.sqrt(count)))
+        n_lists = min(n_lists, count)
+        rng = np.random.default_rng(self.seed)
+
+        # k-means sobre uma amostra (custo de construção limitado)
+        sample_size = min(count, max(n_lists * 64, 4096))
+        sample = vectors[rng.choice(count, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(self.n_iter):
+            assignment = (sample @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = np.bincount(assignment, minlength=n_lists) == 0
+            # Lista vazia: reinicia com um ponto aleatório da amostra
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = self._normalize(sums)
+
+        assignment = (vectors @ centroids.T).argmax(axis=1)
+        self._order = np.argsort(assignment, kind="stable")
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=n_lists))))
+        self._vectors = vectors[self._order]
+        self.centroids = centroids
+
+        logger.debug(f"IVFIndex built: {count} vectors, {n_lists} lists, n_probe={self.n_probe}")
+        return self
+
+    def search(self, queries: Any, k: int = 1) -> Tuple[Any, Any]:
+        """
+        Busca os k vetores mais similares (cosseno) de cada consulta.
+
+        Args:
+            queries: Matriz (Q, dim)
+            k: Vizinhos por consulta
+
+        Returns:
+            (scores (Q, k), índices (Q, k)) em ordem decrescente de score;
+            posições sem candidato ficam com score -inf e índice -1
+        """
+        queries = self._normalize(queries)
+        n_probe = min(self.n_probe, len(self.centroids))
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :n_probe]
+
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+
+        # Agrupa consultas por lista visitada: um matmul por lista (não por consulta)
+        query_rows = np.repeat(np.arange(len(queries)), n_probe)
+        list_ids = probes.ravel()
+        grouping = np.argsort(list_ids, kind="stable")
+        boundaries = np.flatnonzero(np.diff(list_ids[grouping])) + 1
+
+        for group in np.split(grouping, boundaries):
+            if not len(group):
+                continue
+            list_id = list_ids[group[0]]
+            start, end = self._offsets[list_id], self._offsets[list_id + 1]
+            if start == end:
+                continue
+            rows = query_rows[group]
+            block = queries[rows] @ self._vectors[start:end].T  # (consultas, vetores da lista)
+
+            # Funde com o top-k atual dessas consultas
+            merged_scores = np.concatenate([scores[rows], block], axis=1)
+            merged_ids = np.concatenate([
+                ids[rows],
+                np.broadcast_to(self._order[start:end], block.shape)
+            ], axis=1)
+            top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            scores[rows] = np.take_along_axis(merged_scores, top, axis=1)
+            ids[rows] = np.take_along_axis(merged_ids, top, axis=1)
+
+        order = np.argsort(-scores, axis=1, kind="stable")
+        return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
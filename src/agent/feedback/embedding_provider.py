@@ -0,0 +1,156 @@
+"""
+Embedding Provider - Modelo de embeddings compartilhado pelo processo
+
+Responsabilidades:
+- Carregar o modelo de embeddings uma única vez por processo, sob demanda
+- Permitir pré-carregamento em thread de fundo (iniciado na CLI)
+- Oferecer variantes otimizadas para CPU (ONNX e/ou int8)
+
+Todas as instâncias de MemoryEngine usam o mesmo provider, então construir
+vários MemoryEngine por análise não recarrega o modelo. sentence_transformers
+(e torch) só são importados quando o modelo é de fato carregado.
+"""
+
+import os
+import threading
+from typing import Any, Optional
+
+from ..core.logger import logger
+
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Backends suportados:
+# - torch: modelo padrão (PyTorch)
+# - torch_int8: quantização dinâmica int8 das camadas Linear (PyTorch, CPU)
+# - onnx: ONNX Runtime
+# - onnx_int8: ONNX Runtime com pesos quantizados int8
+# - tfidf: n-gramas de caracteres com hashing (NumPy, sem modelo compartilhado:
+#   cada MemoryEngine usa um HashedTfidfEmbedder com o IDF da sua memória)
+EMBEDDING_BACKENDS = ("torch", "torch_int8", "onnx", "onnx_int8", "tfidf")
+
+# Arquivo ONNX quantizado publicado junto aos modelos sentence-transformers
+ONNX_INT8_FILE = "onnx/model_qint8_avx512.onnx"
+
+
+class EmbeddingProvider:
+    """
+    Carregamento preguiçoso e thread-safe de um modelo sentence-transformers.
+
+    Uso:
+        provider = get_embedding_provider()
+        provider.start_background_load()   # opcional (ex: no início da CLI)
+        model = provider.get()             # bloqueia até carregar; None se indisponível
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        backend: str = "torch",
+        enabled: bool = True
+    ):
+        if backend not in EMBEDDING_BACKENDS:
+            logger.warning(f"Unknown embedding backend '{backend}', using 'torch'")
+            backend = "torch"
+        self.model_name = model_name
+        self.backend = backend
+        self.enabled = enabled
+        self._model: Optional[Any] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def model_id(self) -> str:
+        """Identificador do modelo + backend (embeddings int8 diferem dos float)."""
+        if self.backend == "torch":
+            return self.model_name
+        return f"{self.model_name}:{self.backend}"
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def _load(self) -> Optional[Any]:
+        """Importa sentence_transformers e carrega o modelo (cache local, offline)."""
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+        from sentence_transformers import SentenceTransformer
+
+        if self.backend in ("onnx", "onnx_int8"):
+            model_kwargs = {"file_name": ONNX_INT8_FILE} if self.backend == "onnx_int8" else None
+            return SentenceTransformer(self.model_name, backend="onnx", model_kwargs=model_kwargs)
+
+        model = SentenceTransformer(self.model_name, device="cpu" if self.backend == "torch_int8" else None)
+        if self.backend == "torch_int8":
+            import torch
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def get(self) -> Optional[Any]:
+        """
+        Retorna o modelo, carregando na primeira chamada.
+
+        Se o carregamento em fundo estiver em andamento, espera por ele.
+
+        Returns:
+            Modelo ou None (desabilitado, ausente ou sem cache local)
+        """
+        if self._loaded:
+            return self._model
+
+        with self._lock:
+            if self._loaded:
+                return self._model
+            if self.enabled and self.backend != "tfidf":
+                try:
+                    self._model = self._load()
+                    logger.info(f"Embeddings model loaded: {self.model_id}")
+                except Exception as e:
+                    # Se não conseguir carregar (offline ou não cached), usa fallback
+                    logger.warning(
+                        f"Embeddings model not available ({self.model_id}): {e}. "
+                        f"Using text matching fallback."
+                    )
+                    self._model = None
+            self._loaded = True
+            return self._model
+
+    def start_background_load(self) -> None:
+        """Inicia o carregamento do modelo em uma thread daemon (idempotente)."""
+        if not self.enabled or self.backend == "tfidf" or self._loaded or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.get, name="embedding-loader", daemon=True)
+        self._thread.start()
+        logger.debug(f"Background load started for embeddings model {self.model_id}")
+
+
+# Singleton global
+_provider: Optional[EmbeddingProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Retorna o provider global (configurado por config.yaml -> feedback)."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                enabled, model_name, backend = False, DEFAULT_EMBEDDING_MODEL, "torch"
+                try:
+                    from ..core.config_loader import get_config
+                    feedback = get_config().feedback
+                    enabled = feedback.embeddings_enabled
+                    model_name = feedback.embedding_model
+                    backend = feedback.embedding_backend
+                except Exception:
+                    pass
+                _provider = EmbeddingProvider(model_name=model_name, backend=backend, enabled=enabled)
+    return _provider
+
+
+def reset_embedding_provider() -> None:
+    """Descarta o provider global (testes / troca de configuração)."""
+    global _provider
+    _provider = None
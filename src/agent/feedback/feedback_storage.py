@@ -15,6 +15,10 @@ feedback_sessions/
   └─ 202601/
       └─ ...
 
+Com feedback.store_backend: "sqlite", cada sessão também é gravada no
+MemoryStore e as leituras/consultas usam o banco (índices por protocolo,
+modelo, veredito e data); os JSON continuam como backup.
+
 Fase de Implementação: FASE 2 (5-7 dias)
 Status: ✅ Implementado
 """
@@ -27,6 +31,7 @@ from datetime import datetime
 from dataclasses import asdict
 
 from ..core.logger import logger
+from .memory_store import get_memory_store
 
 
 class FeedbackStorage:
@@ -55,6 +60,9 @@ class FeedbackStorage:
         self.base_path = base_path or (project_root / "feedback_sessions")
         self.base_path.mkdir(exist_ok=True)
         
+        # Backend SQLite (None = apenas arquivos JSON)
+        self.store = get_memory_store()
+        
         logger.info(f"FeedbackStorage initialized: {self.base_path}")
 
     def save_feedback_session(
@@ -101,6 +109,13 @@ class FeedbackStorage:
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(session, f, ensure_ascii=False, indent=2)
         
+        # Backend SQLite: sessão + vereditos em uma transação
+        if self.store is not None:
+            try:
+                self.store.add_feedback_session(session)
+            except Exception as e:
+                logger.warning(f"Failed to store feedback session in MemoryStore: {e}")
+        
         logger.info(f"Feedback session saved: {file_path}")
         return file_path
 
@@ -121,6 +136,15 @@ class FeedbackStorage:
         Returns:
             Lista de sessões de feedback
         """
+        if self.store is not None:
+            sessions = self.store.query_sessions(
+                month=month,
+                protocol_name=protocol_name,
+                model_used=model_used
+            )
+            logger.info(f"Loaded {len(sessions)} feedback sessions")
+            return sessions
+        
         sessions = []
         
         # Determinar diretórios a buscar
@@ -173,6 +197,9 @@ class FeedbackStorage:
         Returns:
             Lista de feedbacks que atendem aos critérios
         """
+        if self.store is not None and not suggestion_category:
+            return self._query_feedback_store(verdict, min_quality_rating)
+        
         # Carregar todas as sessões
         all_sessions = self.load_feedback_sessions()
         
@@ -214,6 +241,28 @@ class FeedbackStorage:
         logger.info(f"Query returned {len(results)} sessions")
         return results
 
+    def _query_feedback_store(
+        self,
+        verdict: Optional[str],
+        min_quality_rating: Optional[int]
+    ) -> List[Dict]:
+        """query_feedback via consultas indexadas do MemoryStore."""
+        sessions = self.store.query_sessions(min_quality_rating=min_quality_rating)
+        if not verdict:
+            results = sessions
+        else:
+            matches: Dict[str, List[Dict]] = {}
+            for sug_fb in self.store.query_suggestion_feedback(verdict=verdict):
+                matches.setdefault(sug_fb.pop("session_id"), []).append(sug_fb)
+            results = [
+                {**session, "suggestions_feedback": matches[session["session_id"]]}
+                for session in sessions
+                if session.get("session_id") in matches
+            ]
+        
+        logger.info(f"Query returned {len(results)} sessions")
+        return results
+
     def get_feedback_statistics(
         self,
         period: Optional[str] = None
@@ -0,0 +1,340 @@
+"""
+Memory Artifacts - memory_qa.md compilado uma única vez
+
+Responsabilidades:
+- Ler e parsear memory_qa.md em um objeto estruturado: padrões de rejeição,
+  padrões usados pelos filtros ativos, blocklist de palavras-chave, regras
+  (RULES_ACCEPTED / RULES_REJECTED / VECTOR_INDEX) e estatísticas das sessões
+- Cachear o resultado em memória (por processo) e em disco
+  (memory_qa_artifacts.json), com validade ligada ao mtime e tamanho do arquivo
+
+MemoryQA (conteúdo do prompt, filtros ativos, métricas) e MemoryEngine
+(regras) consomem o mesmo objeto: uma análise lê o arquivo no máximo uma vez
+enquanto ele não muda. Qualquer escrita no arquivo altera mtime/tamanho e
+força a recompilação na próxima leitura.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..core.logger import logger
+
+
+# Arquivo de cache em disco (ao lado de memory_qa.md)
+MEMORY_ARTIFACTS_FILENAME = "memory_qa_artifacts.json"
+
+# Versão do formato compilado (mudar invalida caches em disco antigos)
+ARTIFACTS_VERSION = 1
+
+# Tamanho do conteúdo usado na extração dos filtros ativos
+FILTER_CONTENT_LENGTH = 10000
+
+# Palavras comuns indicando rejeição (blocklist dos filtros ativos)
+REJECTION_INDICATORS = [
+    "desnecessário", "alucinou", "inaplicável", "too much",
+    "redundante", "já existe", "não aplicável", "irrelevante",
+    "confuso", "vago", "falta contexto"
+]
+
+
+@dataclass
+class MemoryArtifacts:
+    """
+    Conteúdo compilado de memory_qa.md.
+
+    Regras e VECTOR_INDEX ficam como dicts (formato do arquivo); a conversão
+    para MemoryRule é feita pelo MemoryEngine.
+    """
+    mtime_ns: int
+    size: int
+    learnings: List[str] = field(default_factory=list)  # blocos "### Padrão:" únicos
+    filter_patterns: List[Dict] = field(default_factory=list)  # name/description/frequency/severity
+    keyword_blocklist: List[str] = field(default_factory=list)
+    rules_accepted: List[Dict] = field(default_factory=list)
+    rules_rejected: List[Dict] = field(default_factory=list)
+    vector_index: List[Dict] = field(default_factory=list)
+    # Estatísticas por sessão "## Feedback - ...": {"total": int|None, "irrelevant": int|None}
+    session_stats: List[Dict] = field(default_factory=list)
+    feedback_sessions: int = 0
+
+    def render_content(self, max_length: int = 5000) -> str:
+        """
+        Texto dos aprendizados para o prompt (últimos 10 padrões únicos).
+
+        Args:
+            max_length: Tamanho máximo (trunca com aviso)
+        """
+        output_parts = [
+            "# APRENDIZADOS DO FEEDBACK (LER ANTES DE GERAR SUGESTÕES)",
+            "",
+            "EVITE sugerir itens que se enquadrem nos padrões de rejeição abaixo.",
+            "",
+        ]
+
+        if self.learnings:
+            output_parts.append("## PADRÕES DE REJEIÇÃO IDENTIFICADOS")
+            output_parts.append("")
+            for learning in self.learnings[-10:]:
+                output_parts.append(learning)
+                output_parts.append("")
+
+        result = '\n'.join(output_parts)
+        if len(result) > max_length:
+            result = result[:max_length] + "\n\n*(Conteúdo truncado)*"
+        return result
+
+
+def extract_json_block(content: str, section_name: str) -> List[Dict]:
+    """
+    Extrai a lista JSON de uma seção "### NOME" seguida de bloco ```json.
+
+    Args:
+        content: Conteúdo completo do arquivo
+        section_name: Nome da seção (RULES_ACCEPTED, RULES_REJECTED, VECTOR_INDEX)
+
+    Returns:
+        Lista de dicionários parseados (ou lista vazia em caso de erro)
+    """
+    # Aceita linhas em branco entre o título e o bloco (formato gravado por save_memory)
+    block_pattern = re.compile(
+        rf"### {re.escape(section_name)}[ \t]*\n\s*```json\n(.*?)\n```",
+        re.DOTALL
+    )
+
+    try:
+        match = block_pattern.search(content)
+        if not match:
+            # Seção não encontrada - não é erro, pode não existir ainda
+            return []
+
+        # Validar e parsear JSON
+        parsed = json.loads(match.group(1))
+        if not isinstance(parsed, list):
+            logger.warning(f"{section_name} is not a list, converting...")
+            parsed = [parsed] if parsed else []
+
+        return parsed
+    except json.JSONDecodeError as e:
+        logger.warning(f"Failed to parse {section_name} JSON: {e}. Returning empty list.")
+        return []
+    except Exception as e:
+        logger.warning(f"Unexpected error parsing {section_name}: {e}. Returning empty list.")
+        return []
+
+
+def _extract_learnings(content: str) -> List[str]:
+    """Blocos "### Padrão:" (até o próximo --- ou ##), deduplicados por nome."""
+    learnings = []
+    current_learning = []
+    in_learning = False
+
+    for line in content.split('\n'):
+        if line.startswith("### Padrão:"):
+            if current_learning:
+                learnings.append('\n'.join(current_learning))
+            current_learning = [line]
+            in_learning = True
+        elif in_learning:
+            if line.startswith("---") or line.startswith("## "):
+                learnings.append('\n'.join(current_learning))
+                current_learning = []
+                in_learning = False
+            else:
+                current_learning.append(line)
+
+    if current_learning:
+        learnings.append('\n'.join(current_learning))
+
+    # Pegar aprendizados únicos (deduplica por nome)
+    seen_patterns = set()
+    unique_learnings = []
+    for learning in learnings:
+        pattern_name = learning.split('\n')[0].replace("### Padrão:", "").strip()
+        if pattern_name not in seen_patterns:
+            seen_patterns.add(pattern_name)
+            unique_learnings.append(learning)
+    return unique_learnings
+
+
+def _parse_filter_patterns(content: str) -> List[Dict]:
+    """Padrões (nome, descrição, frequência, severidade) do conteúdo dos aprendizados."""
+    current_pattern = None
+    patterns_found = []
+
+    for line in content.split('\n'):
+        # Detectar cabeçalhos de padrão
+        if line.startswith("### Padrão:"):
+            if current_pattern:
+                patterns_found.append(current_pattern)
+
+            current_pattern = {
+                "name": line.replace("### Padrão:", "").strip(),
+                "description": "",
+                "frequency": 0,
+                "severity": "media"
+            }
+
+        # Extrair detalhes do padrão
+        if current_pattern:
+            if "**Frequência:**" in line or "**Frequency:**" in line:
+                try:
+                    freq_str = line.split("**")[2].strip() if "**" in line else line.split(":")[-1].strip()
+                    current_pattern["frequency"] = int(''.join(filter(str.isdigit, freq_str)))
+                except ValueError:
+                    pass
+
+            if "**Severidade:**" in line or "**Severity:**" in line:
+                severity = line.split(":")[-1].strip().lower()
+                if "alta" in severity or "high" in severity:
+                    current_pattern["severity"] = "alta"
+                elif "media" in severity or "medium" in severity:
+                    current_pattern["severity"] = "media"
+                else:
+                    current_pattern["severity"] = "baixa"
+
+            if "**Descrição:**" in line or "**Description:**" in line:
+                current_pattern["description"] = line.split(":")[-1].strip()
+
+    # Adicionar último padrão
+    if current_pattern:
+        patterns_found.append(current_pattern)
+    return patterns_found
+
+
+def _extract_session_stats(content: str) -> List[Dict]:
+    """Total revisado / irrelevantes de cada sessão "## Feedback - ..."."""
+    stats = []
+    for section in re.findall(r'## Feedback - .*?\n.*?(?=\n## |---|\Z)', content, re.DOTALL):
+        total_match = re.search(r'Total revisado:\s*(\d+)', section)
+        irrelevant_match = re.search(r'Irrelevantes:\s*(\d+)', section)
+        stats.append({
+            "total": int(total_match.group(1)) if total_match else None,
+            "irrelevant": int(irrelevant_match.group(1)) if irrelevant_match else None,
+        })
+    return stats
+
+
+def compile_memory(content: str, mtime_ns: int = 0, size: int = 0) -> MemoryArtifacts:
+    """
+    Compila o conteúdo de memory_qa.md (sem cache).
+
+    Args:
+        content: Conteúdo do arquivo
+        mtime_ns: mtime do arquivo (chave do cache)
+        size: Tamanho do arquivo em bytes (chave do cache)
+
+    Returns:
+        MemoryArtifacts
+    """
+    artifacts = MemoryArtifacts(mtime_ns=mtime_ns, size=size)
+    artifacts.learnings = _extract_learnings(content)
+
+    # Filtros ativos olham apenas o conteúdo que vai para o prompt
+    filter_content = artifacts.render_content(max_length=FILTER_CONTENT_LENGTH)
+    artifacts.filter_patterns = _parse_filter_patterns(filter_content)
+    lowered = filter_content.lower()
+    artifacts.keyword_blocklist = [
+        indicator for indicator in REJECTION_INDICATORS
+        if lowered.count(indicator.lower()) >= 2  # Aparece pelo menos 2 vezes
+    ]
+
+    artifacts.rules_accepted = extract_json_block(content, "RULES_ACCEPTED")
+    artifacts.rules_rejected = extract_json_block(content, "RULES_REJECTED")
+    artifacts.vector_index = extract_json_block(content, "VECTOR_INDEX")
+
+    artifacts.feedback_sessions = content.count("## Feedback - ")
+    artifacts.session_stats = _extract_session_stats(content)
+    return artifacts
+
+
+# Cache por processo: caminho resolvido -> artefatos
+_artifacts_cache: Dict[str, MemoryArtifacts] = {}
+_artifacts_lock = threading.Lock()
+
+
+def _file_signature(memory_file: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = memory_file.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_disk_cache(cache_file: Path, signature: Tuple[int, int]) -> Optional[MemoryArtifacts]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.pop("version", None) != ARTIFACTS_VERSION:
+            return None
+        artifacts = MemoryArtifacts(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+    if (artifacts.mtime_ns, artifacts.size) != signature:
+        return None
+    return artifacts
+
+
+def _write_disk_cache(cache_file: Path, artifacts: MemoryArtifacts) -> None:
+    """Gravação atômica (arquivo temporário + os.replace)."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=".memory_artifacts_", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"version": ARTIFACTS_VERSION, **asdict(artifacts)}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logger.warning(f"Failed to write memory artifacts cache: {e}")
+
+
+def load_memory_artifacts(memory_file: Path, use_disk_cache: bool = True) -> Optional[MemoryArtifacts]:
+    """
+    Artefatos compilados de memory_qa.md (cache em memória, depois em disco).
+
+    Args:
+        memory_file: Caminho de memory_qa.md
+        use_disk_cache: Ler/gravar memory_qa_artifacts.json
+
+    Returns:
+        MemoryArtifacts ou None se o arquivo não existir
+    """
+    memory_file = Path(memory_file)
+    signature = _file_signature(memory_file)
+    if signature is None:
+        return None
+
+    key = str(memory_file.resolve())
+    cached = _artifacts_cache.get(key)
+    if cached and (cached.mtime_ns, cached.size) == signature:
+        return cached
+
+    with _artifacts_lock:
+        cached = _artifacts_cache.get(key)
+        if cached and (cached.mtime_ns, cached.size) == signature:
+            return cached
+
+        cache_file = memory_file.with_name(MEMORY_ARTIFACTS_FILENAME)
+        artifacts = _read_disk_cache(cache_file, signature) if use_disk_cache else None
+        if artifacts is None:
+            with open(memory_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            artifacts = compile_memory(content, *signature)
+            logger.debug(
+                f"Compiled {memory_file.name}: {len(artifacts.learnings)} patterns, "
+                f"{len(artifacts.rules_accepted)}/{len(artifacts.rules_rejected)} rules, "
+                f"{artifacts.feedback_sessions} sessions"
+            )
+            if use_disk_cache:
+                _write_disk_cache(cache_file, artifacts)
+
+        _artifacts_cache[key] = artifacts
+        return artifacts
+
+
+def clear_memory_artifacts_cache() -> None:
+    """Descarta o cache em memória (testes)."""
+    _artifacts_cache.clear()
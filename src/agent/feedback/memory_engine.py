@@ -12,12 +12,14 @@ Status: ✅ Implementado
 """
 
 import sys
+import os
 import json
+import asyncio
 import hashlib
 import re
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Union, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
 # Add project root to path
@@ -26,16 +28,52 @@ if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
 from ..core.logger import logger
-from ..core.llm_client import LLMClient
+from ..core.llm_client import LLMClient, run_sync
+from .rule_embedding_store import RuleEmbeddingStore
+from .rule_text_index import RuleTextIndex
+from .memory_artifacts import load_memory_artifacts
+from .memory_store import get_memory_store
+from .rules_journal import RULES_JOURNAL_FILENAME, RulesJournal, replay_rules
+from .rule_partitions import PARTITION_FALLBACKS, RulePartitionIndex, protocol_partition
+from .ann_index import IVFIndex
+from .embedding_provider import get_embedding_provider
+from .tfidf_embedder import HashedTfidfEmbedder
 
-# Embeddings for semantic similarity - DISABLED
+# Embeddings for semantic similarity - DISABLED by default (feedback.embeddings_enabled)
 # Using simple text-based Jaccard similarity instead (always works offline)
 # The sentence_transformers library causes network issues even with HF_HUB_OFFLINE=1
-# because it still tries to validate cached models against remote servers
+# because it still tries to validate cached models against remote servers.
+# When enabled, the model is shared process-wide and loaded lazily (EmbeddingProvider).
 
-_EMBEDDINGS_AVAILABLE = False
-SentenceTransformer = None
-np = None
+_UNSET = object()
+
+# NumPy: usado no caminho em lote (matriz de similaridade via matmul)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Cache persistente de scores de similaridade (ao lado de memory_qa.md)
+SIMILARITY_CACHE_FILENAME = "memory_similarity_cache.json"
+
+# Embeddings das regras em float16 (ao lado de memory_qa.md, índice em VECTOR_INDEX)
+RULE_EMBEDDINGS_FILENAME = "memory_rule_embeddings.f16"
+
+# IDF do backend TF-IDF (ao lado de memory_qa.md)
+TFIDF_IDF_FILENAME = "memory_tfidf_idf.npz"
+
+# Campos de MemoryRule aceitos na carga (demais chaves são ignoradas)
+RULE_FIELDS = ('rule_id', 'text', 'decision', 'protocol_id', 'model_id', 'timestamp', 'comment', 'suggestion_id', 'category', 'priority', 'keywords')
+
+
+def _feedback_setting(name: str, default):
+    """Lê uma opção de config.yaml -> feedback (default se indisponível)."""
+    try:
+        from ..core.config_loader import get_config
+        return getattr(get_config().feedback, name, default)
+    except Exception:
+        return default
 
 
 @dataclass
@@ -79,67 +117,77 @@ class MemoryEngine:
         # Estado interno
         self.rules_accepted: List[MemoryRule] = []
         self.rules_rejected: List[MemoryRule] = []
-        self.vector_index: List[Dict] = []  # Para futuras expansões com embeddings
+        self.vector_index: List[Dict] = []  # Índice do arquivo de embeddings das regras
         
         # Similarity threshold (ajustável)
         self.similarity_threshold = 0.85
         
-        # Embeddings model para similaridade semântica (preferencial)
-        self.embedder: Optional[Any] = None
-        if _EMBEDDINGS_AVAILABLE:
-            try:
-                # Tentar carregar modelo (usando cache local - offline mode setado no topo do módulo)
-                self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
-                logger.info("Embeddings model loaded from cache: all-MiniLM-L6-v2")
-            except Exception as e:
-                # Se não conseguir carregar (offline ou não cached), usa fallback
-                logger.warning(f"SentenceTransformer not available (offline/no cache): {e}. Using text matching fallback.")
-                self.embedder = None
+        # Embeddings model para similaridade semântica (preferencial):
+        # compartilhado pelo processo e carregado só no primeiro uso
+        self.embedding_provider = get_embedding_provider()
+        self.embedding_model_name = self.embedding_provider.model_id
+        self._embedder_override: Any = _UNSET
+        
+        # Backend TF-IDF: embedder local por memória (IDF persistido ao lado do arquivo).
+        # Não depende de sentence-transformers, então não exige embeddings_enabled
+        self.tfidf_embedder: Optional[HashedTfidfEmbedder] = None
+        if self.embedding_provider.backend == "tfidf" and np is not None:
+            self.tfidf_embedder = HashedTfidfEmbedder(self.memory_file.with_name(TFIDF_IDF_FILENAME))
+            self._embedder_override = self.tfidf_embedder
+            self.embedding_model_name = self.tfidf_embedder.model_id
         
         # LLM client para similaridade semântica (fallback se embeddings não disponível)
         self.llm_client: Optional[LLMClient] = None
         
         # Cache de embeddings para performance
         self._embedding_cache: Dict[str, Any] = {}
+        # Matrizes de embeddings das regras (pré-carregadas por lista de regras)
+        self._rule_matrix_cache: Dict[str, Tuple[Tuple[str, ...], Any]] = {}
+        # Índices ANN (IVF) por lista de regras, ligados à matriz de origem
+        self._rule_ann_cache: Dict[str, Tuple[Any, IVFIndex]] = {}
+        # Índice de match exato/substring das regras rejeitadas (lista de origem, tamanho, índice)
+        self._rejected_text_index: Optional[Tuple[List[MemoryRule], int, RuleTextIndex]] = None
+        # Partições por empresa/família de protocolo (lista de origem, tamanho, índice)
+        self._rule_partition_cache: Dict[str, Tuple[List[MemoryRule], int, RulePartitionIndex]] = {}
         
-        logger.info(f"MemoryEngine initialized: {self.memory_file} (embeddings: {self.embedder is not None})")
-    
-    def _extract_json_block(self, content: str, section_name: str) -> List[Dict]:
-        """
-        Parser robusto baseado em delimitadores fixos (TASK 2).
+        # Embeddings das regras persistidos (memory-map na carga, append no registro)
+        self.embedding_store = RuleEmbeddingStore(
+            self.memory_file.with_name(RULE_EMBEDDINGS_FILENAME),
+            model=self.embedding_model_name
+        )
+        self._vector_index_dirty = False
         
-        Args:
-            content: Conteúdo completo do arquivo
-            section_name: Nome da seção (RULES_ACCEPTED, RULES_REJECTED, VECTOR_INDEX)
-            
-        Returns:
-            Lista de dicionários parseados (ou lista vazia em caso de erro)
-        """
-        start_marker = f"### {section_name}\n```json\n"
-        end_marker = "\n```"
+        # Backend SQLite (None = memory_qa.md é a fonte de verdade)
+        self.store = get_memory_store(self.memory_file)
         
-        try:
-            start_idx = content.index(start_marker)
-            start_idx += len(start_marker)
-            end_idx = content.index(end_marker, start_idx)
-            json_str = content[start_idx:end_idx]
-            
-            # Validar e parsear JSON
-            parsed = json.loads(json_str)
-            if not isinstance(parsed, list):
-                logger.warning(f"{section_name} is not a list, converting...")
-                parsed = [parsed] if parsed else []
-            
-            return parsed
-        except ValueError:
-            # Seção não encontrada - não é erro, pode não existir ainda
-            return []
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse {section_name} JSON: {e}. Returning empty list.")
-            return []
-        except Exception as e:
-            logger.warning(f"Unexpected error parsing {section_name}: {e}. Returning empty list.")
-            return []
+        # Backend markdown: regras novas vão para o journal; memory_qa.md
+        # (snapshot) só é reescrito na compactação
+        self.rules_journal: Optional[RulesJournal] = None
+        if self.store is None and _feedback_setting("rules_journal", True):
+            self.rules_journal = RulesJournal(self.memory_file.with_name(RULES_JOURNAL_FILENAME))
+        # (decision, rule_id) já persistidos em snapshot + journal
+        self._persisted_keys: set = set()
+        
+        # Scores LLM por par de textos (carregado sob demanda do disco)
+        self.similarity_cache_file = self.memory_file.with_name(SIMILARITY_CACHE_FILENAME)
+        self._similarity_cache: Optional[Dict[str, float]] = None
+        
+        logger.info(
+            f"MemoryEngine initialized: {self.memory_file} "
+            f"(embeddings: {self.embedding_model_name if self.embedding_provider.enabled or self.tfidf_embedder else 'disabled'})"
+        )
+    
+    @property
+    def embedder(self) -> Optional[Any]:
+        """Modelo de embeddings (lazy, compartilhado) ou None se indisponível."""
+        if self._embedder_override is not _UNSET:
+            return self._embedder_override
+        return self.embedding_provider.get()
+    
+    @embedder.setter
+    def embedder(self, model: Optional[Any]) -> None:
+        """Substitui o modelo compartilhado nesta instância (None desabilita)."""
+        self._embedder_override = model
     
     def load_memory(self) -> None:
         """
@@ -151,28 +199,43 @@ class MemoryEngine:
         - ### VECTOR_INDEX (opcional)
         
         Se as seções não existirem, inicializa estrutura vazia.
-        Usa parser robusto baseado em delimitadores fixos (TASK 2).
+        Usa parser robusto baseado em delimitadores fixos (TASK 2), via
+        artefatos compilados (o arquivo só é relido quando muda).
+        
+        Com feedback.store_backend: "sqlite", as regras vêm do MemoryStore
+        (consulta indexada) e memory_qa.md não é lido. No backend markdown, o
+        journal de regras é reaplicado sobre o snapshot.
         """
-        if not self.memory_file.exists():
+        journal_pending = self.rules_journal is not None and self.rules_journal.size() > 0
+        if self.store is None and not self.memory_file.exists() and not journal_pending:
             logger.info("memory_qa.md does not exist, will initialize on first save")
             self.rules_accepted = []
             self.rules_rejected = []
             self.vector_index = []
+            self.embedding_store.load([])
             return
         
         try:
-            with open(self.memory_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if self.store is not None:
+                # Backend SQLite: banco é a fonte de verdade (memory_qa.md é export)
+                accepted_data = self.store.query_rules(decision="accepted")
+                rejected_data = self.store.query_rules(decision="rejected")
+                vector_index_data = self.store.vector_index()
+            else:
+                artifacts = load_memory_artifacts(self.memory_file)
+                accepted_data = artifacts.rules_accepted if artifacts else []
+                rejected_data = artifacts.rules_rejected if artifacts else []
+                vector_index_data = artifacts.vector_index if artifacts else []
+                if journal_pending:
+                    accepted_data, rejected_data, vector_index_data = self._replay_journal(
+                        accepted_data, rejected_data, vector_index_data
+                    )
             
             # Extrair seção RULES_ACCEPTED usando parser robusto
             try:
-                rules_data = self._extract_json_block(content, "RULES_ACCEPTED")
+                rules_data = accepted_data
                 # Converter regras, tratando campos opcionais
-                parsed_rules = []
-                for rule in rules_data:
-                    # Remover campos que não existem no dataclass
-                    rule_clean = {k: v for k, v in rule.items() if k in ['rule_id', 'text', 'decision', 'protocol_id', 'model_id', 'timestamp', 'comment', 'suggestion_id', 'category', 'priority', 'keywords']}
-                    parsed_rules.append(MemoryRule(**rule_clean))
+                parsed_rules = [self._rule_from_dict(rule) for rule in rules_data]
                 self.rules_accepted = parsed_rules
                 logger.info(f"Loaded {len(self.rules_accepted)} accepted rules")
             except (TypeError, ValueError) as e:
@@ -181,14 +244,11 @@ class MemoryEngine:
             
             # Extrair seção RULES_REJECTED usando parser robusto
             try:
-                rules_data = self._extract_json_block(content, "RULES_REJECTED")
+                rules_data = rejected_data
                 # Converter regras, tratando campos opcionais
-                parsed_rules = []
-                for rule in rules_data:
-                    # Remover campos que não existem no dataclass
-                    rule_clean = {k: v for k, v in rule.items() if k in ['rule_id', 'text', 'decision', 'protocol_id', 'model_id', 'timestamp', 'comment', 'suggestion_id', 'category', 'priority', 'keywords']}
-                    parsed_rules.append(MemoryRule(**rule_clean))
+                parsed_rules = [self._rule_from_dict(rule) for rule in rules_data]
                 self.rules_rejected = parsed_rules
+                self._rule_text_index(self.rules_rejected)
                 logger.info(f"Loaded {len(self.rules_rejected)} rejected rules")
             except (TypeError, ValueError) as e:
                 logger.warning(f"Failed to parse RULES_REJECTED: {e}")
@@ -196,12 +256,15 @@ class MemoryEngine:
             
             # Extrair seção VECTOR_INDEX (opcional)
             try:
-                self.vector_index = self._extract_json_block(content, "VECTOR_INDEX")
+                self.vector_index = list(vector_index_data)
+                self._fit_tfidf_embedder()
+                self.embedding_store.load(self.vector_index)
                 logger.info(f"Loaded {len(self.vector_index)} vector index entries")
             except Exception as e:
                 logger.warning(f"Failed to parse VECTOR_INDEX: {e}")
                 self.vector_index = []
             
+            self._persisted_keys = self._rule_keys()
             logger.info(
                 f"Memory loaded: {len(self.rules_accepted)} accepted, "
                 f"{len(self.rules_rejected)} rejected rules"
@@ -214,26 +277,141 @@ class MemoryEngine:
             self.rules_rejected = []
             self.vector_index = []
     
-    def save_memory(self) -> None:
+    @staticmethod
+    def _rule_from_dict(rule: Dict) -> MemoryRule:
+        """MemoryRule a partir do dict salvo (remove campos que não existem no dataclass)."""
+        return MemoryRule(**{k: v for k, v in rule.items() if k in RULE_FIELDS})
+    
+    def _rule_keys(self) -> set:
+        """(decision, rule_id) das regras em memória."""
+        return (
+            {("accepted", rule.rule_id) for rule in self.rules_accepted}
+            | {("rejected", rule.rule_id) for rule in self.rules_rejected}
+        )
+    
+    def _replay_journal(
+        self,
+        accepted: List[Dict],
+        rejected: List[Dict],
+        vector_index: List[Dict]
+    ) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        Aplica o journal sobre as regras do snapshot.
+        
+        Uma regra registrada substitui a de mesmo rule_id e vai para o fim da
+        lista (mesma semântica do register_feedback).
+        
+        Returns:
+            (aceitas, rejeitadas, vector_index) após o replay
+        """
+        records = self.rules_journal.read()
+        logger.info(f"Replayed {len(records)} rules journal records")
+        return replay_rules(records, accepted, rejected, vector_index)
+    
+    def _journal_needs_compaction(self) -> bool:
+        """Snapshot precisa ser reescrito (limiares de tamanho/idade ou mudanças fora do journal)."""
+        if not self.memory_file.exists():
+            return True
+        if self._rule_keys() != self._persisted_keys:
+            # Listas alteradas diretamente (sem register_feedback)
+            return True
+        size = self.rules_journal.size()
+        if not size:
+            return False
+        if size >= _feedback_setting("journal_compact_bytes", 262144):
+            return True
+        oldest = self.rules_journal.oldest_timestamp()
+        max_age = timedelta(hours=_feedback_setting("journal_compact_age_hours", 24.0))
+        return oldest is not None and datetime.now() - oldest >= max_age
+    
+    def _fold_journal(self) -> None:
+        """
+        Congela o journal e traz para a memória registros ainda não aplicados
+        (ex: gravados por outro processo depois da carga).
+        """
+        records = self.rules_journal.begin_compaction()
+        lists = {"accepted": self.rules_accepted, "rejected": self.rules_rejected}
+        known_vectors = {entry.get("rule_id") for entry in self.vector_index}
+        
+        for record in records:
+            if record.get("op") == "rule":
+                data = record.get("rule") or {}
+                target = lists.get(data.get("decision"))
+                if target is None:
+                    continue
+                rule = self._rule_from_dict(data)
+                if any(existing == rule for existing in target if existing.rule_id == rule.rule_id):
+                    continue
+                target[:] = [r for r in target if r.rule_id != rule.rule_id]
+                target.append(rule)
+            elif record.get("op") == "vectors":
+                new_entries = [e for e in record.get("entries", []) if e.get("rule_id") not in known_vectors]
+                self.vector_index.extend(new_entries)
+                known_vectors.update(e.get("rule_id") for e in new_entries)
+    
+    def _fit_tfidf_embedder(self, force: bool = False) -> None:
+        """
+        Ajusta o IDF do backend TF-IDF sobre os textos das regras.
+        
+        Só ajusta quando ainda não há IDF salvo (ou force=True): o IDF fica
+        estável entre execuções e os embeddings persistidos continuam válidos.
+        Um novo IDF muda o model_id e invalida o embedding store.
+        
+        Args:
+            force: Reajustar mesmo com IDF existente
+        """
+        if self.tfidf_embedder is None:
+            return
+        texts = [rule.text for rule in self.rules_accepted + self.rules_rejected]
+        if texts and (force or not self.tfidf_embedder.fitted):
+            self.tfidf_embedder.fit(texts)
+            self._rule_matrix_cache = {}
+            self._rule_ann_cache = {}
+        self.embedding_model_name = self.tfidf_embedder.model_id
+        self.embedding_store.model = self.embedding_model_name
+    
+    def save_memory(self, compact: bool = False) -> None:
         """
         Salva regras estruturadas de volta em memory_qa.md (TASK 4 - preservação garantida).
         
         Preserva o histórico textual existente usando marcador fixo.
         Usa operação atômica para evitar corrupção de arquivo.
+        
+        Com o journal de regras (backend markdown), as regras registradas já
+        estão persistidas: o snapshot só é reescrito (compactação) quando o
+        journal passa dos limiares de tamanho/idade, quando as listas foram
+        alteradas fora do register_feedback ou com compact=True.
+        
+        Com o backend SQLite, grava regras e VECTOR_INDEX no banco e regenera
+        memory_qa.md como export (histórico vindo de memory_entries).
+        
+        Args:
+            compact: Forçar a reescrita do snapshot (dobra o journal)
         """
         # Marcador fixo e padronizado para separar estrutura/histórico
         HISTORY_MARKER = "\n\n---\n## Feedback Histórico\n\n"
         
+        if self.rules_journal is not None and not compact and not self._journal_needs_compaction():
+            self._vector_index_dirty = False
+            return
+        
         try:
+            if self.rules_journal is not None:
+                self._fold_journal()
+            
             # Ler conteúdo existente
             existing_content = ""
-            if self.memory_file.exists():
+            if self.store is None and self.memory_file.exists():
                 with open(self.memory_file, 'r', encoding='utf-8') as f:
                     existing_content = f.read()
             
             # Extrair histórico existente (TASK 4 - preservação garantida)
             history_content = ""
-            if HISTORY_MARKER in existing_content:
+            if self.store is not None:
+                self.store.upsert_rules([asdict(rule) for rule in self.rules_accepted + self.rules_rejected])
+                self.store.set_vector_index(self.vector_index)
+                history_content = self.store.history_markdown()
+            elif HISTORY_MARKER in existing_content:
                 # Histórico após marcador
                 _, history_content = existing_content.split(HISTORY_MARKER, 1)
             elif "## Feedback Histórico" in existing_content:
@@ -359,6 +537,11 @@ As seções abaixo contêm regras estruturadas que são usadas para filtrar suge
             import shutil
             shutil.move(str(temp_file), str(self.memory_file))
             
+            if self.rules_journal is not None:
+                self.rules_journal.finish_compaction()
+                self._persisted_keys = self._rule_keys()
+            
+            self._vector_index_dirty = False
             logger.info(
                 f"Memory saved: {len(self.rules_accepted)} accepted, "
                 f"{len(self.rules_rejected)} rejected rules"
@@ -471,6 +654,56 @@ As seções abaixo contêm regras estruturadas que são usadas para filtrar suge
             self.rules_rejected = [r for r in self.rules_rejected if r.rule_id != rule_id]
             self.rules_rejected.append(rule)
             logger.info(f"Registered rejected rule: {rule_id} ({suggestion_id})")
+        
+        # Backend SQLite: append transacional da regra (sem reescrever a memória)
+        if self.store is not None:
+            try:
+                self.store.upsert_rules([asdict(rule)], move_to_end=True)
+            except Exception as e:
+                logger.warning(f"Failed to store rule {rule_id} in MemoryStore: {e}")
+        elif self.rules_journal is not None:
+            # Backend markdown: uma linha no journal (O(1)), snapshot intacto
+            try:
+                self.rules_journal.append("rule", rule=asdict(rule))
+                self._persisted_keys.add((decision_normalized, rule_id))
+            except OSError as e:
+                logger.warning(f"Failed to journal rule {rule_id}: {e}")
+        
+        # Embedding da nova regra vai direto para o arquivo (append incremental)
+        self._store_rule_embeddings([rule])
+    
+    def _store_rule_embeddings(self, rules: List[MemoryRule]) -> None:
+        """
+        Acrescenta ao embedding store as regras ainda sem embedding válido.
+        
+        O índice atualizado fica em vector_index (gravado em VECTOR_INDEX no
+        próximo save_memory).
+        
+        Args:
+            rules: Regras a armazenar
+        """
+        if not self.embedder or not self.embedding_store.available:
+            return
+        
+        missing = [r for r in rules if self.embedding_store.lookup(r.rule_id, r.text) is None]
+        if not missing:
+            return
+        
+        try:
+            vectors = self._encode_texts([rule.text for rule in missing])
+            self.embedding_store.append(
+                [(rule.rule_id, rule.text, vector) for rule, vector in zip(missing, vectors)]
+            )
+            self.vector_index = self.embedding_store.entries()
+            self._vector_index_dirty = True
+            if self.rules_journal is not None:
+                stored_ids = {rule.rule_id for rule in missing}
+                self.rules_journal.append(
+                    "vectors",
+                    entries=[entry for entry in self.vector_index if entry["rule_id"] in stored_ids]
+                )
+        except Exception as e:
+            logger.warning(f"Failed to store rule embeddings: {e}")
     
     def _exact_match_filter(
         self,
@@ -487,21 +720,30 @@ As seções abaixo contêm regras estruturadas que são usadas para filtrar suge
         Returns:
             Regra correspondente ou None
         """
-        normalized_suggestion = self._normalize_text(suggestion_text)
+        position = self._rule_text_index(rejected_rules).match(self._normalize_text(suggestion_text))
+        return rejected_rules[position] if position is not None else None
+    
+    def _rule_text_index(self, rules: List[MemoryRule]) -> RuleTextIndex:
+        """
+        Índice de textos normalizados das regras rejeitadas.
         
-        for rule in rejected_rules:
-            normalized_rule = self._normalize_text(rule.text)
-            
-            # Match exato
-            if normalized_suggestion == normalized_rule:
-                return rule
+        Construído na carga da memória e reconstruído só quando a lista muda
+        (register_feedback troca a lista; append muda o tamanho).
+        
+        Args:
+            rules: Lista de regras
             
-            # Match de substring (sugestão contém regra ou vice-versa)
-            if len(normalized_suggestion) > 20 and len(normalized_rule) > 20:
-                if normalized_suggestion in normalized_rule or normalized_rule in normalized_suggestion:
-                    return rule
+        Returns:
+            RuleTextIndex na ordem da lista
+        """
+        cached = self._rejected_text_index
+        if cached and cached[0] is rules and cached[1] == len(rules):
+            return cached[2]
         
-        return None
+        index = RuleTextIndex().build([self._normalize_text(rule.text) for rule in rules])
+        if rules is self.rules_rejected:
+            self._rejected_text_index = (rules, len(rules), index)
+        return index
     
     def _compute_similarity_embeddings(self, text1: str, text2: str) -> float:
         """
@@ -542,6 +784,17 @@ As seções abaixo contêm regras estruturadas que são usadas para filtrar suge
             logger.warning(f"Failed to compute embeddings similarity: {e}")
             return 0.0
     
+    def _get_similarity_llm_client(self) -> Optional[LLMClient]:
+        """Inicializa (uma vez) o cliente LLM usado para similaridade."""
+        if not self.llm_client:
+            try:
+                # Usar modelo estável (Gemini) em vez de Grok
+                self.llm_client = LLMClient(model="google/gemini-2.0-flash-exp:free")
+            except Exception as e:
+                logger.warning(f"Failed to initialize LLM client: {e}")
+                return None
+        return self.llm_client
+    
     def _compute_similarity_llm(self, text1: str, text2: str) -> float:
         """
         Computa similaridade semântica usando LLM (fallback se embeddings não disponível).
@@ -553,13 +806,8 @@ As seções abaixo contêm regras estruturadas que são usadas para filtrar suge
         Returns:
             Score de similaridade (0.0-1.0)
         """
-        if not self.llm_client:
-            try:
-                # Usar modelo estável (Gemini) em vez de Grok
-                self.llm_client = LLMClient(model="google/gemini-2.0-flash-exp:free")
-            except Exception as e:
-                logger.warning(f"Failed to initialize LLM client: {e}")
-                return 0.0
+        if not self._get_similarity_llm_client():
+            return 0.0
         
         prompt = f"""You are a similarity scorer. Compare these two texts and return ONLY a number between 0.0 and 1.0 representing their semantic similarity.
 
@@ -621,6 +869,171 @@ Return ONLY the number, no explanation."""
         
         return intersection / union if union > 0 else 0.0
     
+    def _pair_key(self, text1: str, text2: str) -> str:
+        """Chave simétrica de um par de textos (hash dos textos normalizados)."""
+        hashes = sorted(
+            hashlib.md5(self._normalize_text(text).encode('utf-8')).hexdigest()
+            for text in (text1, text2)
+        )
+        return ":".join(hashes)
+    
+    def _load_similarity_cache(self) -> Dict[str, float]:
+        """Carrega o cache de scores LLM (memory_similarity_cache.json)."""
+        if self._similarity_cache is None:
+            self._similarity_cache = {}
+            if self.similarity_cache_file.exists():
+                try:
+                    with open(self.similarity_cache_file, 'r', encoding='utf-8') as f:
+                        self._similarity_cache = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to load similarity cache: {e}. Starting empty.")
+        return self._similarity_cache
+    
+    def _save_similarity_cache(self) -> None:
+        """Grava o cache de scores LLM (operação atômica)."""
+        if self._similarity_cache is None:
+            return
+        try:
+            temp_file = self.similarity_cache_file.with_suffix('.json.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._similarity_cache, f)
+            os.replace(temp_file, self.similarity_cache_file)
+        except Exception as e:
+            logger.warning(f"Failed to save similarity cache: {e}")
+    
+    def _jaccard_matrix(self, texts: List[str], rules: List[MemoryRule]) -> Any:
+        """
+        Jaccard de palavras (mesma regra de _compute_similarity_text) em lote.
+        
+        Args:
+            texts: Textos das sugestões
+            rules: Regras a comparar
+            
+        Returns:
+            Matriz (len(texts), len(rules)) com scores em [0, 1]
+        """
+        def words(text: str) -> set:
+            return {w for w in self._normalize_text(text).split() if len(w) > 2}
+        
+        text_words = [words(text) for text in texts]
+        rule_words = [words(rule.text) for rule in rules]
+        vocabulary = {w: i for i, w in enumerate(set().union(*text_words, *rule_words))}
+        
+        def binary_matrix(word_sets: List[set]) -> Any:
+            matrix = np.zeros((len(word_sets), max(len(vocabulary), 1)), dtype=np.float32)
+            for row, word_set in enumerate(word_sets):
+                matrix[row, [vocabulary[w] for w in word_set]] = 1.0
+            return matrix
+        
+        a = binary_matrix(text_words)
+        b = binary_matrix(rule_words)
+        intersection = a @ b.T
+        union = a.sum(axis=1, keepdims=True) + b.sum(axis=1) - intersection
+        # Conjunto vazio de palavras -> score 0 (como em _compute_similarity_text)
+        return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+    
+    async def _score_pairs_llm_async(self, pairs: List[Tuple[str, str]]) -> List[Optional[float]]:
+        """
+        Pontua um bloco de pares em uma única requisição ao LLM.
+        
+        Args:
+            pairs: Lista de (texto_sugestão, texto_regra)
+            
+        Returns:
+            Scores na mesma ordem (None para todo o bloco se a resposta for inválida)
+        """
+        numbered = "\n\n".join(
+            f"PAIR {i}:\nTEXT1: {text1[:500]}\nTEXT2: {text2[:500]}"
+            for i, (text1, text2) in enumerate(pairs, 1)
+        )
+        prompt = f"""You are a similarity scorer. For each numbered pair below, score the semantic similarity of TEXT1 and TEXT2 between 0.0 and 1.0.
+
+0.0 = completely different topics
+1.0 = essentially the same meaning
+
+{numbered}
+
+Return ONLY a JSON array with {len(pairs)} numbers, in pair order. No explanation."""
+        
+        try:
+            response_text = await self.llm_client._run_with_auto_continue_async(
+                prompt,
+                max_tokens=20 + 8 * len(pairs)
+            )
+            match = re.search(r'\[[^\]]*\]', response_text)
+            scores = json.loads(match.group(0)) if match else None
+            if not isinstance(scores, list) or len(scores) != len(pairs):
+                logger.warning(f"Could not parse batch similarity scores from LLM response: {response_text[:100]}")
+                return [None] * len(pairs)
+            return [max(0.0, min(1.0, float(score))) for score in scores]
+        except Exception as e:
+            logger.warning(f"Failed to compute batch LLM similarity: {e}")
+            return [None] * len(pairs)
+    
+    async def _score_blocks_llm_async(self, blocks: List[List[Tuple[str, str]]]) -> List[List[Optional[float]]]:
+        """Pontua blocos de pares concorrentemente (limitado pelo transporte compartilhado)."""
+        return await asyncio.gather(*(self._score_pairs_llm_async(block) for block in blocks))
+    
+    def _batch_llm_similarity_matrix(
+        self,
+        suggestion_texts: List[str],
+        rules: List[MemoryRule]
+    ) -> Any:
+        """
+        Similaridade em lote sem embeddings: pré-filtro local + LLM em blocos.
+        
+        1. Jaccard de palavras para todos os pares (NumPy, sem rede)
+        2. Shortlist por sugestão: top-k regras com Jaccard >= mínimo
+        3. Pares da shortlist sem score em cache vão ao LLM em blocos
+           (uma requisição por bloco de pares)
+        4. Scores LLM > 0 substituem o Jaccard (mesma precedência de
+           _compute_similarity); todos os scores LLM ficam em cache no disco
+        
+        Args:
+            suggestion_texts: Textos das sugestões
+            rules: Regras a comparar
+            
+        Returns:
+            Matriz (len(suggestion_texts), len(rules)) com scores em [0, 1]
+        """
+        scores = self._jaccard_matrix(suggestion_texts, rules)
+        top_k = _feedback_setting("similarity_prefilter_top_k", 5)
+        min_score = _feedback_setting("similarity_prefilter_min_score", 0.1)
+        batch_size = _feedback_setting("llm_similarity_batch_size", 25)
+        
+        cache = self._load_similarity_cache()
+        pending = []  # (linha, coluna, chave)
+        for i, text in enumerate(suggestion_texts):
+            for j in np.argsort(-scores[i], kind="stable")[:top_k]:
+                if scores[i, j] < min_score:
+                    break
+                key = self._pair_key(text, rules[j].text)
+                if key in cache:
+                    if cache[key] > 0:
+                        scores[i, j] = cache[key]
+                else:
+                    pending.append((i, int(j), key))
+        
+        if pending and self._get_similarity_llm_client():
+            pairs = [(suggestion_texts[i], rules[j].text) for i, j, _ in pending]
+            blocks = [pairs[k:k + batch_size] for k in range(0, len(pairs), batch_size)]
+            logger.info(
+                f"LLM similarity: {len(pairs)} shortlisted pairs in {len(blocks)} request(s) "
+                f"(of {scores.size} total pairs)"
+            )
+            block_scores = run_sync(self._score_blocks_llm_async(blocks))
+            
+            llm_scores = [score for block in block_scores for score in block]
+            for (i, j, key), score in zip(pending, llm_scores):
+                if score is None:
+                    continue
+                cache[key] = score
+                if score > 0:
+                    scores[i, j] = score
+            self._save_similarity_cache()
+        
+        return scores
+    
     def _compute_similarity(self, text1: str, text2: str) -> float:
         """
         Computa similaridade semântica (TASK 1 - wrapper com fallback robusto).
@@ -652,6 +1065,194 @@ Return ONLY the number, no explanation."""
         # Fallback final: matching de texto simples (always works)
         return self._compute_similarity_text(text1, text2)
     
+    def _encode_texts(self, texts: List[str]) -> Any:
+        """
+        Codifica textos em uma única chamada ao embedder (com cache por MD5).
+
+        Args:
+            texts: Textos a codificar
+
+        Returns:
+            Matriz (len(texts), dim) com linhas normalizadas (norma L2 = 1)
+        """
+        keys = [hashlib.md5(text.encode('utf-8')).hexdigest() for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._embedding_cache and key not in missing:
+                missing[key] = text
+
+        if missing:
+            encoded = self.embedder.encode(list(missing.values()), convert_to_numpy=True)
+            for key, embedding in zip(missing.keys(), encoded):
+                self._embedding_cache[key] = embedding
+
+        matrix = np.vstack([np.asarray(self._embedding_cache[key], dtype=np.float32) for key in keys])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _rule_embedding_matrix(self, name: str, rules: List[MemoryRule]) -> Any:
+        """
+        Matriz de embeddings das regras, recalculada só quando as regras mudam.
+
+        Args:
+            name: Nome da lista ("rejected" / "accepted")
+            rules: Regras da lista
+
+        Returns:
+            Matriz (len(rules), dim) normalizada
+        """
+        signature = tuple(f"{rule.rule_id}:{rule.text}" for rule in rules)
+        cached = self._rule_matrix_cache.get(name)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        # Embeddings persistidos (memory-map); só regras ausentes passam pelo modelo
+        self._store_rule_embeddings(rules)
+        stored = [self.embedding_store.lookup(rule.rule_id, rule.text) for rule in rules]
+        if any(vector is None for vector in stored):
+            matrix = self._encode_texts([rule.text for rule in rules])
+        else:
+            matrix = np.vstack(stored)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        self._rule_matrix_cache[name] = (signature, matrix)
+        return matrix
+
+    def _rule_ann_index(self, name: str, rule_matrix: Any) -> IVFIndex:
+        """Índice IVF da matriz de regras (reconstruído só quando a matriz muda)."""
+        cached = self._rule_ann_cache.get(name)
+        if cached and cached[0] is rule_matrix:
+            return cached[1]
+
+        index = IVFIndex(n_probe=_feedback_setting("ann_n_probe", 8)).build(rule_matrix)
+        self._rule_ann_cache[name] = (rule_matrix, index)
+        logger.info(f"Built ANN index over {len(rule_matrix)} {name} rules")
+        return index
+
+    def _batch_best_matches(
+        self,
+        suggestion_texts: List[str],
+        rules: List[MemoryRule],
+        name: str
+    ) -> Optional[Tuple[Any, Any]]:
+        """
+        Regra mais similar (e score) para cada sugestão, em lote.
+
+        Com embedder: um encode em lote para as sugestões + matriz de regras
+        pré-carregada; varredura exata (um matmul) abaixo de
+        feedback.ann_min_rules regras, índice IVF aproximado acima disso.
+        Sem embedder: pré-filtro local + LLM em blocos
+        (_batch_llm_similarity_matrix). Retorna None quando o caminho em lote
+        não está disponível (sem NumPy), e o chamador usa o cálculo por par.
+
+        Args:
+            suggestion_texts: Textos das sugestões
+            rules: Regras a comparar
+            name: Nome da lista de regras (chave do cache de matriz)
+
+        Returns:
+            (índices da melhor regra, scores em [0, 1]) por sugestão, ou None
+        """
+        if np is None or not suggestion_texts or not rules:
+            return None
+
+        try:
+            if not self.embedder:
+                matrix = self._batch_llm_similarity_matrix(suggestion_texts, rules)
+                return matrix.argmax(axis=1), matrix.max(axis=1)
+
+            suggestion_matrix = self._encode_texts(suggestion_texts)
+            rule_matrix = self._rule_embedding_matrix(name, rules)
+
+            if len(rules) >= _feedback_setting("ann_min_rules", 5000):
+                scores, ids = self._rule_ann_index(name, rule_matrix).search(suggestion_matrix, k=1)
+                return ids[:, 0], np.clip(scores[:, 0], 0.0, 1.0)
+
+            matrix = np.clip(suggestion_matrix @ rule_matrix.T, 0.0, 1.0)
+            return matrix.argmax(axis=1), matrix.max(axis=1)
+        except Exception as e:
+            logger.warning(f"Batch similarity failed ({name} rules): {e}. Using per-pair similarity.")
+            return None
+
+    def _rule_partitions(self, name: str, rules: List[MemoryRule]) -> RulePartitionIndex:
+        """Índice de partições da lista (reconstruído só quando a lista muda)."""
+        cached = self._rule_partition_cache.get(name)
+        if cached and cached[0] is rules and cached[1] == len(rules):
+            return cached[2]
+
+        index = RulePartitionIndex().build([rule.protocol_id for rule in rules])
+        self._rule_partition_cache[name] = (rules, len(rules), index)
+        return index
+
+    def _scoped_best_matches(
+        self,
+        suggestion_texts: List[str],
+        rules: List[MemoryRule],
+        name: str,
+        protocol_id: Optional[str],
+        threshold: float
+    ) -> Tuple[List[MemoryRule], Optional[Tuple[Any, Any]]]:
+        """
+        _batch_best_matches restrito à partição do protocolo.
+
+        Compara as sugestões só com as regras da família do protocolo e as
+        globais; as sugestões sem match (score < threshold) são comparadas
+        depois com as regras de fallback (feedback.partition_fallback).
+        Sem protocolo ou com feedback.rule_partitioning desligado, usa todas
+        as regras.
+
+        Args:
+            suggestion_texts: Textos das sugestões
+            rules: Lista completa de regras
+            name: Nome da lista ("rejected" / "accepted")
+            protocol_id: Protocolo em análise
+            threshold: Score mínimo para um match na partição primária
+
+        Returns:
+            (regras candidatas, resultado em lote com índices nas candidatas ou None)
+        """
+        partition = protocol_partition(protocol_id)
+        if partition is None or not _feedback_setting("rule_partitioning", True):
+            return rules, self._batch_best_matches(suggestion_texts, rules, name)
+
+        fallback = _feedback_setting("partition_fallback", "company")
+        if fallback not in PARTITION_FALLBACKS:
+            logger.warning(f"Unknown partition_fallback '{fallback}', using 'company'")
+            fallback = "company"
+        primary_rows, fallback_rows = self._rule_partitions(name, rules).select(protocol_id, fallback)
+        primary = [rules[row] for row in primary_rows]
+        secondary = [rules[row] for row in fallback_rows]
+        candidates = primary + secondary
+        logger.debug(
+            f"Rule partition {partition[1]}: {len(primary)}/{len(rules)} {name} rules "
+            f"(+{len(secondary)} fallback)"
+        )
+        if np is None or not suggestion_texts or not candidates:
+            return candidates, None
+
+        best = np.zeros(len(suggestion_texts), dtype=np.int64)
+        scores = np.zeros(len(suggestion_texts), dtype=np.float32)
+        if primary:
+            result = self._batch_best_matches(suggestion_texts, primary, f"{name}:{partition[1]}")
+            if result is None:
+                return candidates, None
+            best, scores = np.asarray(result[0], dtype=np.int64), np.asarray(result[1], dtype=np.float32)
+
+        misses = np.flatnonzero(scores < threshold)
+        if secondary and len(misses):
+            result = self._batch_best_matches(
+                [suggestion_texts[i] for i in misses], secondary, f"{name}:{partition[1]}:{fallback}"
+            )
+            if result is None:
+                return candidates, None
+            improved = np.asarray(result[1]) > scores[misses]
+            rows = misses[improved]
+            best[rows] = np.asarray(result[0])[improved] + len(primary)
+            scores[rows] = np.asarray(result[1])[improved]
+        return candidates, (best, scores)
+
     def _semantic_similarity_filter(
         self,
         suggestion_text: str,
@@ -689,13 +1290,19 @@ Return ONLY the number, no explanation."""
     
     def filter_suggestions(
         self,
-        suggestions: List[Union[Dict, Any]]
+        suggestions: List[Union[Dict, Any]],
+        protocol_id: Optional[str] = None
     ) -> Tuple[List[Union[Dict, Any]], Dict[str, Any]]:
         """
         Filtra sugestões baseado em regras de memória (TASK 6 - com degradação graciosa).
         
+        Com protocol_id, a similaridade semântica consulta só as regras da
+        empresa/família do protocolo e as globais (ver _scoped_best_matches);
+        o match exato continua global (índice O(1)).
+        
         Args:
             suggestions: Lista de sugestões a filtrar
+            protocol_id: Protocolo em análise (nome do arquivo, como no registro)
         
         Returns:
             (sugestões_filtradas, debug_info)
@@ -714,19 +1321,48 @@ Return ONLY the number, no explanation."""
             "errors": []
         }
         
+        # Extrair textos de todas as sugestões (usados no caminho em lote)
+        suggestion_texts = []
         for suggestion in suggestions:
             try:
-                # Extrair texto da sugestão
                 if isinstance(suggestion, dict):
-                    suggestion_id = suggestion.get('id', 'unknown')
                     title = suggestion.get('title', '')
                     description = suggestion.get('description', '')
                 else:
-                    suggestion_id = getattr(suggestion, 'id', 'unknown')
                     title = getattr(suggestion, 'title', '')
                     description = getattr(suggestion, 'description', '')
+                suggestion_texts.append(f"{title}. {description}".strip())
+            except Exception:
+                suggestion_texts.append("")
+        
+        # Similaridade em lote: um encode + um matmul por lista de regras
+        batch_rows = [i for i, text in enumerate(suggestion_texts) if text]
+        batch_texts = [suggestion_texts[i] for i in batch_rows]
+        row_of = {i: row for row, i in enumerate(batch_rows)}
+        rejected_candidates, rejected_batch = self._scoped_best_matches(
+            batch_texts, self.rules_rejected, "rejected", protocol_id, self.similarity_threshold
+        )
+        accepted_candidates, accepted_batch = self._scoped_best_matches(
+            batch_texts, self.rules_accepted, "accepted", protocol_id, max(self.similarity_threshold, 0.8)
+        )
+        
+        # Thresholds aplicados de forma vetorizada
+        if rejected_batch is not None:
+            rejected_best, rejected_scores = rejected_batch
+            rejected_hits = rejected_scores >= self.similarity_threshold
+        if accepted_batch is not None:
+            accepted_best, accepted_scores = accepted_batch
+            accepted_hits = accepted_scores >= max(self.similarity_threshold, 0.8)
+        
+        for index, suggestion in enumerate(suggestions):
+            try:
+                # Extrair texto da sugestão
+                if isinstance(suggestion, dict):
+                    suggestion_id = suggestion.get('id', 'unknown')
+                else:
+                    suggestion_id = getattr(suggestion, 'id', 'unknown')
                 
-                suggestion_text = f"{title}. {description}".strip()
+                suggestion_text = suggestion_texts[index]
                 if not suggestion_text:
                     # Manter sugestões sem texto (não podemos filtrar)
                     filtered.append(suggestion)
@@ -746,10 +1382,17 @@ Return ONLY the number, no explanation."""
                 
                 # Filtro 2: Similaridade semântica (TASK 6 - com fallback)
                 try:
-                    semantic_match, similarity_score = self._semantic_similarity_filter(
-                        suggestion_text,
-                        self.rules_rejected
-                    )
+                    if rejected_batch is not None:
+                        row = row_of[index]
+                        similarity_score = float(rejected_scores[row])
+                        semantic_match = (
+                            rejected_candidates[int(rejected_best[row])] if rejected_hits[row] else None
+                        )
+                    else:
+                        semantic_match, similarity_score = self._semantic_similarity_filter(
+                            suggestion_text,
+                            rejected_candidates
+                        )
                     if semantic_match:
                         debug_info["semantic_matches"].append({
                             "suggestion_id": suggestion_id,
@@ -770,10 +1413,17 @@ Return ONLY the number, no explanation."""
                 
                 # Verificar se é similar a regra aceita (para reforço, não filtro)
                 try:
-                    accepted_match, accepted_score = self._semantic_similarity_filter(
-                        suggestion_text,
-                        self.rules_accepted
-                    )
+                    if accepted_batch is not None:
+                        row = row_of[index]
+                        accepted_score = float(accepted_scores[row])
+                        accepted_match = (
+                            accepted_candidates[int(accepted_best[row])] if accepted_hits[row] else None
+                        )
+                    else:
+                        accepted_match, accepted_score = self._semantic_similarity_filter(
+                            suggestion_text,
+                            accepted_candidates
+                        )
                     if accepted_match and accepted_score >= 0.8:
                         debug_info["reinforced_by_memory"].append({
                             "suggestion_id": suggestion_id,
@@ -792,6 +1442,10 @@ Return ONLY the number, no explanation."""
                 debug_info["errors"].append(f"Filter error: {e}")
                 filtered.append(suggestion)
         
+        # Sem save_memory aqui: o filtro é só leitura; embeddings gerados nele já
+        # foram acrescentados ao embedding store, e a persistência da memória
+        # fica com quem registra feedback (FeedbackCollector)
+        
         logger.info(
             f"Memory filtering: {len(suggestions)} → {len(filtered)} suggestions "
             f"({debug_info['filtered_count']} filtered: {len(debug_info['exact_matches'])} exact, "
@@ -26,6 +26,8 @@ if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
 from ..core.logger import logger
+from .memory_artifacts import MemoryArtifacts, load_memory_artifacts
+from .memory_store import get_memory_store
 
 
 @dataclass
@@ -94,6 +96,9 @@ class MemoryQA:
         project_root = Path(__file__).resolve().parent.parent.parent.parent
         self.memory_file = memory_file or (project_root / "memory_qa.md")
         
+        # Backend SQLite: seções do histórico também vão para o banco
+        self.store = get_memory_store(self.memory_file)
+        
         # Criar arquivo se não existir
         if not self.memory_file.exists():
             self._initialize_memory_file()
@@ -136,74 +141,47 @@ Antes de cada análise, o agente revisa este documento para entender:
             f.write(content)
         logger.info(f"Initialized memory_qa.md at {self.memory_file}")
     
+    def _append_section(self, section: str, kind: str) -> None:
+        """
+        Acrescenta uma seção ao histórico do memory_qa.md.
+
+        Com o backend SQLite a seção é gravada no banco (fonte de verdade) e
+        também no fim do arquivo, que continua igual ao export regenerado.
+
+        Args:
+            section: Markdown da seção
+            kind: Tipo da seção (feedback, learnings, metrics, insights, migration)
+        """
+        if self.store is not None:
+            self.store.append_entry(section, kind=kind)
+        with open(self.memory_file, 'a', encoding='utf-8') as f:
+            f.write(section)
+
     def get_memory_content(self, max_length: int = 5000) -> str:
         """
         Retorna o conteúdo do memory_qa.md para inclusão no prompt.
 
         CRITICAL: Prioriza aprendizados e padrões para orientar o LLM.
+        Usa os artefatos compilados (não relê o arquivo se ele não mudou).
         """
-        if not self.memory_file.exists():
-            return "Nenhum feedback histórico disponível."
-
         try:
-            with open(self.memory_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            lines = content.split('\n')
-
-            learnings = []
-            current_learning = []
-            in_learning = False
-
-            for line in lines:
-                if line.startswith("### Padrão:"):
-                    if current_learning:
-                        learnings.append('\n'.join(current_learning))
-                    current_learning = [line]
-                    in_learning = True
-                elif in_learning:
-                    if line.startswith("---") or line.startswith("## "):
-                        learnings.append('\n'.join(current_learning))
-                        current_learning = []
-                        in_learning = False
-                    else:
-                        current_learning.append(line)
-
-            if current_learning:
-                learnings.append('\n'.join(current_learning))
-
-            # Pegar aprendizados únicos (deduplica por nome)
-            seen_patterns = set()
-            unique_learnings = []
-            for learning in learnings:
-                first_line = learning.split('\n')[0]
-                pattern_name = first_line.replace("### Padrão:", "").strip()
-                if pattern_name not in seen_patterns:
-                    seen_patterns.add(pattern_name)
-                    unique_learnings.append(learning)
-
-            output_parts = []
-            output_parts.append("# APRENDIZADOS DO FEEDBACK (LER ANTES DE GERAR SUGESTÕES)")
-            output_parts.append("")
-            output_parts.append("EVITE sugerir itens que se enquadrem nos padrões de rejeição abaixo.")
-            output_parts.append("")
-
-            if unique_learnings:
-                output_parts.append("## PADRÕES DE REJEIÇÃO IDENTIFICADOS")
-                output_parts.append("")
-                for learning in unique_learnings[-10:]:
-                    output_parts.append(learning)
-                    output_parts.append("")
-
-            result = '\n'.join(output_parts)
-            if len(result) > max_length:
-                result = result[:max_length] + "\n\n*(Conteúdo truncado)*"
-
-            return result
+            artifacts = self.get_artifacts()
+            if artifacts is None:
+                return "Nenhum feedback histórico disponível."
+            return artifacts.render_content(max_length)
         except Exception as e:
             logger.error(f"Error reading memory_qa.md: {e}")
             return "Erro ao carregar feedback histórico."
 
+    def get_artifacts(self) -> Optional[MemoryArtifacts]:
+        """
+        Conteúdo compilado de memory_qa.md (parseado uma vez; cache por mtime/tamanho).
+
+        Returns:
+            MemoryArtifacts ou None se o arquivo não existir
+        """
+        return load_memory_artifacts(self.memory_file)
+
     def get_active_filters(self, min_frequency: int = 3) -> Dict[str, Any]:
         """
         Extrai regras de filtragem ativas baseadas nos padrões do memory_qa.md.
@@ -224,8 +202,6 @@ Antes de cada análise, o agente revisa este documento para entender:
             - metadata: Dict - informações sobre a extração
         """
         try:
-            content = self.get_memory_content(max_length=10000)
-
             filters = {
                 "priority_threshold": "baixa",  # Default: gerar todas as prioridades
                 "category_filters": {
@@ -245,53 +221,13 @@ Antes de cada análise, o agente revisa este documento para entender:
                 }
             }
 
-            if not self.memory_file.exists():
+            artifacts = self.get_artifacts()
+            if artifacts is None:
                 logger.info("No memory_qa.md file, returning default filters")
                 return filters
 
-            # Parsear padrões do memory_qa.md
-            lines = content.split('\n')
-            current_pattern = None
-            patterns_found = []
-
-            for i, line in enumerate(lines):
-                # Detectar cabeçalhos de padrão
-                if line.startswith("### Padrão:"):
-                    if current_pattern:
-                        patterns_found.append(current_pattern)
-
-                    current_pattern = {
-                        "name": line.replace("### Padrão:", "").strip(),
-                        "description": "",
-                        "frequency": 0,
-                        "severity": "media"
-                    }
-
-                # Extrair detalhes do padrão
-                if current_pattern:
-                    if "**Frequência:**" in line or "**Frequency:**" in line:
-                        try:
-                            freq_str = line.split("**")[2].strip() if "**" in line else line.split(":")[-1].strip()
-                            freq = int(''.join(filter(str.isdigit, freq_str)))
-                            current_pattern["frequency"] = freq
-                        except:
-                            pass
-
-                    if "**Severidade:**" in line or "**Severity:**" in line:
-                        severity = line.split(":")[-1].strip().lower()
-                        if "alta" in severity or "high" in severity:
-                            current_pattern["severity"] = "alta"
-                        elif "media" in severity or "medium" in severity:
-                            current_pattern["severity"] = "media"
-                        else:
-                            current_pattern["severity"] = "baixa"
-
-                    if "**Descrição:**" in line or "**Description:**" in line:
-                        current_pattern["description"] = line.split(":")[-1].strip()
-
-            # Adicionar último padrão
-            if current_pattern:
-                patterns_found.append(current_pattern)
+            # Padrões já parseados na compilação do memory_qa.md
+            patterns_found = artifacts.filter_patterns
 
             filters["metadata"]["total_patterns_found"] = len(patterns_found)
 
@@ -303,7 +239,7 @@ Antes de cada análise, o agente revisa este documento para entender:
                     self._apply_pattern_filter_rules(pattern, filters)
 
             # Extrair keywords da lista de bloqueio dos comentários de feedback
-            self._extract_keyword_blocklist(content, filters)
+            self._extract_keyword_blocklist(artifacts, filters)
 
             # Determinar rule_strength baseado na severidade dos padrões ativos
             high_severity_count = sum(
@@ -404,26 +340,17 @@ Antes de cada análise, o agente revisa este documento para entender:
             })
             logger.info(f"Activated context validation rule (pattern: {pattern['name']})")
 
-    def _extract_keyword_blocklist(self, content: str, filters: Dict) -> None:
+    def _extract_keyword_blocklist(self, artifacts: MemoryArtifacts, filters: Dict) -> None:
         """
-        Extrai palavras-chave dos comentários de rejeição para blocklist.
+        Adiciona aos filtros as palavras-chave de rejeição recorrentes.
 
         Args:
-            content: Conteúdo do memory_qa.md
+            artifacts: memory_qa.md compilado (blocklist calculada na compilação)
             filters: Dict de filtros a ser modificado
         """
-        # Palavras comuns indicando rejeição
-        rejection_indicators = [
-            "desnecessário", "alucinou", "inaplicável", "too much",
-            "redundante", "já existe", "não aplicável", "irrelevante",
-            "confuso", "vago", "falta contexto"
-        ]
-
-        for indicator in rejection_indicators:
-            count = content.lower().count(indicator.lower())
-            if count >= 2:  # Aparece pelo menos 2 vezes
-                if indicator not in filters["keyword_blocklist"]:
-                    filters["keyword_blocklist"].append(indicator)
+        for indicator in artifacts.keyword_blocklist:
+            if indicator not in filters["keyword_blocklist"]:
+                filters["keyword_blocklist"].append(indicator)
 
         if filters["keyword_blocklist"]:
             logger.info(f"Keyword blocklist extracted: {filters['keyword_blocklist']}")
@@ -520,9 +447,7 @@ Antes de cada análise, o agente revisa este documento para entender:
                     section += "- Qualidade sobre quantidade\n\n"
             
             # Adicionar ao arquivo
-            with open(self.memory_file, 'a', encoding='utf-8') as f:
-                f.write(section)
-                f.write("\n---\n")
+            self._append_section(section + "\n---\n", kind="feedback")
             
             logger.info(f"Feedback session added to memory_qa.md: {protocol_name}")
             
@@ -689,31 +614,20 @@ Antes de cada análise, o agente revisa este documento para entender:
             Percentual de mudança (negativo = melhoria) ou None se não houver histórico
         """
         try:
-            content = self.memory_file.read_text(encoding='utf-8')
-
-            # Find the last rejection rate in previous feedback section
-            import re
-            feedback_sections = re.findall(r'## Feedback - .*?\n.*?(?=\n## |---|\Z)', content, re.DOTALL)
-
-            if len(feedback_sections) < 1:
+            artifacts = self.get_artifacts()
+            if artifacts is None or not artifacts.session_stats:
                 return None  # Need at least 1 previous session to compare
 
             # Get last section (most recent previous session)
-            previous_section = feedback_sections[-1]
-
-            # Extract rejection rate from statistics
             # Format: "- Total revisado: X\n- Relevantes: Y\n- Irrelevantes: Z"
-            total_match = re.search(r'Total revisado:\s*(\d+)', previous_section)
-            irrelevant_match = re.search(r'Irrelevantes:\s*(\d+)', previous_section)
-
-            if total_match and irrelevant_match:
-                total = int(total_match.group(1))
-                irrelevant = int(irrelevant_match.group(1))
-                if total > 0:
-                    previous_rate = irrelevant / total
-                    # Calculate % change (negative = improvement)
-                    change = ((current_rejection_rate - previous_rate) / previous_rate) * 100
-                    return change
+            previous = artifacts.session_stats[-1]
+            total, irrelevant = previous["total"], previous["irrelevant"]
+
+            if total and irrelevant is not None:
+                previous_rate = irrelevant / total
+                # Calculate % change (negative = improvement)
+                change = ((current_rejection_rate - previous_rate) / previous_rate) * 100
+                return change
 
             return None
 
@@ -729,10 +643,8 @@ Antes de cada análise, o agente revisa este documento para entender:
             Número de sessões de feedback
         """
         try:
-            content = self.memory_file.read_text(encoding='utf-8')
-            import re
-            sessions = re.findall(r'## Feedback - ', content)
-            return len(sessions)
+            artifacts = self.get_artifacts()
+            return artifacts.feedback_sessions if artifacts else 0
         except Exception as e:
             logger.warning(f"Could not count feedback sessions: {e}")
             return 0
@@ -745,24 +657,15 @@ Antes de cada análise, o agente revisa este documento para entender:
             Taxa de rejeição acumulada (média)
         """
         try:
-            content = self.memory_file.read_text(encoding='utf-8')
-
-            import re
-            feedback_sections = re.findall(r'## Feedback - .*?\n.*?(?=\n## |---|\Z)', content, re.DOTALL)
-
-            if not feedback_sections:
+            artifacts = self.get_artifacts()
+            if artifacts is None:
                 return 0.0
 
-            rejection_rates = []
-            for section in feedback_sections:
-                total_match = re.search(r'Total revisado:\s*(\d+)', section)
-                irrelevant_match = re.search(r'Irrelevantes:\s*(\d+)', section)
-
-                if total_match and irrelevant_match:
-                    total = int(total_match.group(1))
-                    irrelevant = int(irrelevant_match.group(1))
-                    if total > 0:
-                        rejection_rates.append(irrelevant / total)
+            rejection_rates = [
+                stats["irrelevant"] / stats["total"]
+                for stats in artifacts.session_stats
+                if stats["total"] and stats["irrelevant"] is not None
+            ]
 
             if rejection_rates:
                 return sum(rejection_rates) / len(rejection_rates)
@@ -1282,8 +1185,7 @@ Responda em JSON com este formato:
             
             section += "---\n"
             
-            with open(self.memory_file, 'a', encoding='utf-8') as f:
-                f.write(section)
+            self._append_section(section, kind="insights")
             
             logger.info("LLM insights stored in memory_qa.md")
             
@@ -1645,8 +1547,7 @@ Responda em JSON com este formato:
             section += "---\n\n"
 
             # Append to memory file
-            with open(self.memory_file, 'a', encoding='utf-8') as f:
-                f.write(section)
+            self._append_section(section, kind="metrics")
 
             logger.info(f"Metrics added to memory_qa.md: rejection_rate={metrics.rejection_rate:.2%}, improvement={metrics.improvement_vs_previous}")
 
@@ -1687,8 +1588,7 @@ Responda em JSON com este formato:
                 
                 section += "---\n\n"
             
-            with open(self.memory_file, 'a', encoding='utf-8') as f:
-                f.write(section)
+            self._append_section(section, kind="learnings")
             
             logger.info(f"Added {len(patterns)} patterns to memory_qa.md")
             
@@ -1756,8 +1656,7 @@ Responda em JSON com este formato:
             section += "*Fim da migração*\n\n---\n"
             
             # Adicionar ao memory_qa.md
-            with open(self.memory_file, 'a', encoding='utf-8') as f:
-                f.write(section)
+            self._append_section(section, kind="migration")
             
             logger.info(f"Migrated {len(entries)} entries from Memory Manager to memory_qa.md")
 
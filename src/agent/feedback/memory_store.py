@@ -0,0 +1,549 @@
+"""
+Memory Store - Memória e feedback em SQLite (FTS5 para textos)
+
+Responsabilidades:
+- Guardar regras (RULES_ACCEPTED / RULES_REJECTED), VECTOR_INDEX, sessões de
+  feedback, vereditos por sugestão e as seções de histórico do memory_qa.md
+- Appends transacionais (uma regra / uma sessão por transação, sem reescrever
+  o arquivo inteiro)
+- Consultas indexadas por protocolo, modelo, veredito e data; busca textual
+  (FTS5) em textos de regras e comentários
+
+Habilitado com feedback.store_backend: "sqlite" em config.yaml. Nesse modo o
+banco é a fonte de verdade e memory_qa.md passa a ser um export gerado
+(MemoryEngine.save_memory regenera o arquivo a partir do banco). Dados
+existentes são importados uma vez com migrate_to_store.py.
+
+Ver docs/DATA_ARCHITECTURE_PROPOSAL.md (fase 1: setup + migração).
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.logger import logger
+
+
+SCHEMA_VERSION = 1
+
+# Colunas indexadas de uma regra (o dict completo fica em "data")
+RULE_COLUMNS = (
+    "rule_id", "decision", "text", "protocol_id", "model_id", "timestamp",
+    "comment", "suggestion_id", "category", "priority"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rules (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    rule_id TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    text TEXT NOT NULL,
+    protocol_id TEXT,
+    model_id TEXT,
+    timestamp TEXT,
+    comment TEXT,
+    suggestion_id TEXT,
+    category TEXT,
+    priority TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (rule_id, decision)
+);
+CREATE INDEX IF NOT EXISTS idx_rules_decision ON rules (decision, seq);
+CREATE INDEX IF NOT EXISTS idx_rules_protocol ON rules (protocol_id);
+CREATE INDEX IF NOT EXISTS idx_rules_model ON rules (model_id);
+CREATE INDEX IF NOT EXISTS idx_rules_timestamp ON rules (timestamp);
+
+CREATE TABLE IF NOT EXISTS vector_index (
+    rule_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS feedback_sessions (
+    session_id TEXT PRIMARY KEY,
+    timestamp TEXT,
+    protocol_name TEXT,
+    model_used TEXT,
+    quality_rating INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON feedback_sessions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_protocol ON feedback_sessions (protocol_name);
+CREATE INDEX IF NOT EXISTS idx_sessions_model ON feedback_sessions (model_used);
+
+CREATE TABLE IF NOT EXISTS suggestion_feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES feedback_sessions (session_id) ON DELETE CASCADE,
+    suggestion_id TEXT,
+    user_verdict TEXT,
+    comment TEXT,
+    timestamp TEXT,
+    protocol_name TEXT,
+    model_used TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_session ON suggestion_feedback (session_id);
+CREATE INDEX IF NOT EXISTS idx_feedback_verdict ON suggestion_feedback (user_verdict, timestamp);
+CREATE INDEX IF NOT EXISTS idx_feedback_protocol ON suggestion_feedback (protocol_name);
+CREATE INDEX IF NOT EXISTS idx_feedback_model ON suggestion_feedback (model_used);
+
+CREATE TABLE IF NOT EXISTS memory_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    markdown TEXT NOT NULL
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS rules_fts USING fts5 (
+    text, comment, content='rules', content_rowid='seq'
+);
+CREATE TRIGGER IF NOT EXISTS rules_fts_insert AFTER INSERT ON rules BEGIN
+    INSERT INTO rules_fts (rowid, text, comment) VALUES (new.seq, new.text, new.comment);
+END;
+CREATE TRIGGER IF NOT EXISTS rules_fts_delete AFTER DELETE ON rules BEGIN
+    INSERT INTO rules_fts (rules_fts, rowid, text, comment) VALUES ('delete', old.seq, old.text, old.comment);
+END;
+CREATE TRIGGER IF NOT EXISTS rules_fts_update AFTER UPDATE ON rules BEGIN
+    INSERT INTO rules_fts (rules_fts, rowid, text, comment) VALUES ('delete', old.seq, old.text, old.comment);
+    INSERT INTO rules_fts (rowid, text, comment) VALUES (new.seq, new.text, new.comment);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5 (
+    comment, content='suggestion_feedback', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS feedback_fts_insert AFTER INSERT ON suggestion_feedback BEGIN
+    INSERT INTO feedback_fts (rowid, comment) VALUES (new.id, new.comment);
+END;
+CREATE TRIGGER IF NOT EXISTS feedback_fts_delete AFTER DELETE ON suggestion_feedback BEGIN
+    INSERT INTO feedback_fts (feedback_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+END;
+"""
+
+
+def _fts_query(text: str) -> str:
+    """Consulta FTS5 a partir de texto livre (termos entre aspas, OR)."""
+    terms = [term.replace('"', '') for term in text.split()]
+    return " OR ".join(f'"{term}"' for term in terms if term)
+
+
+def _month_prefix(month: str) -> str:
+    """'202512' -> '2025-12' (prefixo de timestamps ISO)."""
+    return f"{month[:4]}-{month[4:6]}"
+
+
+class MemoryStore:
+    """
+    Banco SQLite da memória de feedback.
+
+    Uso:
+        store = MemoryStore(Path("memory_qa.sqlite3"))
+        store.upsert_rules([asdict(rule)])
+        rejected = store.query_rules(decision="rejected", protocol_id="proto")
+        hits = store.search_rules("função renal", limit=5)
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts_available = True
+        except sqlite3.OperationalError as e:
+            # SQLite sem FTS5: busca textual cai para LIKE
+            logger.warning(f"SQLite FTS5 not available ({e}); text search will use LIKE")
+            self.fts_available = False
+
+        logger.info(f"MemoryStore initialized: {self.db_path}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Transação BEGIN IMMEDIATE ... COMMIT (ROLLBACK em erro)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: List[Any]) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ------------------------------------------------------------------
+    # Regras
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _rule_row(rule: Dict) -> List[Any]:
+        return [rule.get(column) for column in RULE_COLUMNS] + [json.dumps(rule, ensure_ascii=False)]
+
+    def upsert_rules(self, rules: List[Dict], move_to_end: bool = False) -> int:
+        """
+        Grava regras em uma transação (chave: rule_id + decision).
+
+        Args:
+            rules: Regras como dicts (asdict(MemoryRule))
+            move_to_end: Regra existente vai para o fim da ordem (como o
+                register_feedback faz na lista em memória); senão é
+                atualizada no lugar, e só se mudou
+
+        Returns:
+            Número de regras inseridas ou alteradas
+        """
+        if not rules:
+            return 0
+        rows = [self._rule_row(rule) for rule in rules]
+        placeholders = ", ".join("?" for _ in range(len(RULE_COLUMNS) + 1))
+        columns = ", ".join(RULE_COLUMNS + ("data",))
+
+        with self._transaction() as conn:
+            if move_to_end:
+                conn.executemany(
+                    "DELETE FROM rules WHERE rule_id = ? AND decision = ?",
+                    [(rule.get("rule_id"), rule.get("decision")) for rule in rules]
+                )
+                return conn.executemany(f"INSERT INTO rules ({columns}) VALUES ({placeholders})", rows).rowcount
+            updates = ", ".join(f"{column} = excluded.{column}" for column in RULE_COLUMNS[2:] + ("data",))
+            return conn.executemany(
+                f"INSERT INTO rules ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT (rule_id, decision) DO UPDATE SET {updates} "
+                f"WHERE rules.data != excluded.data",
+                rows
+            ).rowcount
+
+    def query_rules(
+        self,
+        decision: Optional[str] = None,
+        protocol_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Regras filtradas (consultas indexadas), na ordem de gravação.
+
+        Args:
+            decision: "accepted" / "rejected"
+            protocol_id: ID do protocolo
+            model_id: Modelo que gerou a sugestão
+            since / until: Intervalo de timestamp ISO (inclusivo / exclusivo)
+            limit: Máximo de regras
+
+        Returns:
+            Regras como dicts
+        """
+        clauses, params = [], []
+        for column, value in (("decision", decision), ("protocol_id", protocol_id), ("model_id", model_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+
+        sql = "SELECT data FROM rules"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row["data"]) for row in self._query(sql, params)]
+
+    def search_rules(self, text: str, decision: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """
+        Busca textual em texto e comentário das regras (FTS5, ranking bm25).
+
+        Args:
+            text: Termos de busca (texto livre)
+            decision: Restringe a "accepted" / "rejected"
+            limit: Máximo de resultados
+        """
+        if self.fts_available:
+            query = _fts_query(text)
+            if not query:
+                return []
+            sql = (
+                "SELECT rules.data FROM rules_fts JOIN rules ON rules.seq = rules_fts.rowid "
+                "WHERE rules_fts MATCH ?"
+            )
+            params: List[Any] = [query]
+            if decision:
+                sql += " AND rules.decision = ?"
+                params.append(decision)
+            sql += " ORDER BY bm25(rules_fts) LIMIT ?"
+        else:
+            sql = "SELECT data FROM rules WHERE (text LIKE ? OR comment LIKE ?)"
+            params = [f"%{text}%", f"%{text}%"]
+            if decision:
+                sql += " AND decision = ?"
+                params.append(decision)
+            sql += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+        return [json.loads(row["data"]) for row in self._query(sql, params)]
+
+    def set_vector_index(self, entries: List[Dict]) -> None:
+        """Substitui o VECTOR_INDEX (índice do arquivo de embeddings)."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM vector_index")
+            conn.executemany(
+                "INSERT OR REPLACE INTO vector_index (rule_id, data) VALUES (?, ?)",
+                [(entry.get("rule_id"), json.dumps(entry, ensure_ascii=False)) for entry in entries]
+            )
+
+    def vector_index(self) -> List[Dict]:
+        return [json.loads(row["data"]) for row in self._query("SELECT data FROM vector_index", [])]
+
+    # ------------------------------------------------------------------
+    # Sessões de feedback
+    # ------------------------------------------------------------------
+
+    def add_feedback_session(self, session: Dict, replace: bool = True) -> bool:
+        """
+        Grava uma sessão de feedback e seus vereditos em uma transação.
+
+        Args:
+            session: Sessão (FeedbackSession como dict, com session_id)
+            replace: Sobrescrever sessão existente (False = ignorar duplicada)
+
+        Returns:
+            True se a sessão foi gravada
+        """
+        session_id = session.get("session_id")
+        if not session_id:
+            raise ValueError("Feedback session without session_id")
+
+        timestamp = session.get("timestamp")
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+        protocol_name = session.get("protocol_name")
+        model_used = session.get("model_used")
+
+        with self._transaction() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM feedback_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if exists and not replace:
+                return False
+            conn.execute("DELETE FROM suggestion_feedback WHERE session_id = ?", (session_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO feedback_sessions "
+                "(session_id, timestamp, protocol_name, model_used, quality_rating, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, timestamp, protocol_name, model_used, session.get("quality_rating"),
+                 json.dumps(session, ensure_ascii=False, default=str))
+            )
+            conn.executemany(
+                "INSERT INTO suggestion_feedback "
+                "(session_id, suggestion_id, user_verdict, comment, timestamp, protocol_name, model_used, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (session_id, feedback.get("suggestion_id"), feedback.get("user_verdict"),
+                     feedback.get("user_comment") or feedback.get("comment"),
+                     feedback.get("timestamp") or timestamp, protocol_name, model_used,
+                     json.dumps(feedback, ensure_ascii=False, default=str))
+                    for feedback in session.get("suggestions_feedback", [])
+                    if isinstance(feedback, dict)
+                ]
+            )
+        return True
+
+    def query_sessions(
+        self,
+        month: Optional[str] = None,
+        protocol_name: Optional[str] = None,
+        model_used: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_quality_rating: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Sessões filtradas, em ordem cronológica.
+
+        Args:
+            month: Mês no formato "YYYYMM" (como os diretórios do FeedbackStorage)
+            protocol_name / model_used: Filtros exatos
+            since / until: Intervalo de timestamp ISO
+            min_quality_rating: Rating mínimo
+        """
+        clauses, params = [], []
+        if month:
+            clauses.append("timestamp LIKE ?")
+            params.append(f"{_month_prefix(month)}%")
+        for column, value in (("protocol_name", protocol_name), ("model_used", model_used)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if min_quality_rating is not None:
+            clauses.append("quality_rating >= ?")
+            params.append(min_quality_rating)
+
+        sql = "SELECT data FROM feedback_sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp, session_id"
+        return [json.loads(row["data"]) for row in self._query(sql, params)]
+
+    def query_suggestion_feedback(
+        self,
+        verdict: Optional[str] = None,
+        protocol_name: Optional[str] = None,
+        model_used: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Vereditos por sugestão (com session_id), filtrados por índice e/ou texto.
+
+        Args:
+            verdict: "relevant" / "irrelevant"
+            protocol_name / model_used: Filtros exatos
+            since / until: Intervalo de timestamp ISO
+            text: Busca no comentário do usuário (FTS5)
+            limit: Máximo de resultados
+        """
+        clauses, params = [], []
+        for column, value in (
+            ("f.user_verdict", verdict), ("f.protocol_name", protocol_name), ("f.model_used", model_used)
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("f.timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("f.timestamp < ?")
+            params.append(until)
+
+        sql = "SELECT f.session_id, f.data FROM suggestion_feedback f"
+        if text:
+            if self.fts_available:
+                query = _fts_query(text)
+                if not query:
+                    return []
+                sql += " JOIN feedback_fts ON feedback_fts.rowid = f.id"
+                clauses.append("feedback_fts MATCH ?")
+                params.append(query)
+            else:
+                clauses.append("f.comment LIKE ?")
+                params.append(f"%{text}%")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY f.timestamp, f.id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {"session_id": row["session_id"], **json.loads(row["data"])}
+            for row in self._query(sql, params)
+        ]
+
+    # ------------------------------------------------------------------
+    # Histórico markdown (parte textual do export memory_qa.md)
+    # ------------------------------------------------------------------
+
+    def append_entry(self, markdown: str, kind: str = "section", timestamp: Optional[str] = None) -> None:
+        """Acrescenta uma seção ao histórico (feedback, padrões, métricas, insights)."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO memory_entries (kind, timestamp, markdown) VALUES (?, ?, ?)",
+                (kind, timestamp or datetime.now().isoformat(), markdown)
+            )
+
+    def history_markdown(self) -> str:
+        """Histórico completo, na ordem de gravação (cauda do memory_qa.md)."""
+        rows = self._query("SELECT markdown FROM memory_entries ORDER BY id", [])
+        return "".join(row["markdown"] for row in rows)
+
+    def counts(self) -> Dict[str, int]:
+        """Contagens por tabela (diagnóstico / relatório do migrador)."""
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("rules", "vector_index", "feedback_sessions", "suggestion_feedback", "memory_entries")
+            }
+
+
+# Stores abertos no processo (um por banco)
+_stores: Dict[str, MemoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def resolve_store_path(memory_file: Path, store_path: str) -> Path:
+    """Caminho do banco (relativo ao diretório do arquivo de memória)."""
+    path = Path(store_path)
+    return path if path.is_absolute() else Path(memory_file).parent / path
+
+
+def get_memory_store(memory_file: Optional[Path] = None) -> Optional[MemoryStore]:
+    """
+    Store do processo para um arquivo de memória, ou None no backend markdown.
+
+    Args:
+        memory_file: Caminho do memory_qa.md (padrão: project_root/memory_qa.md)
+
+    Returns:
+        MemoryStore (config feedback.store_backend == "sqlite") ou None
+    """
+    backend, store_path = "markdown", "memory_qa.sqlite3"
+    try:
+        from ..core.config_loader import get_config
+        feedback = get_config().feedback
+        backend = feedback.store_backend
+        store_path = feedback.store_path
+    except Exception:
+        pass
+    if backend != "sqlite":
+        return None
+
+    if memory_file is None:
+        project_root = Path(__file__).resolve().parent.parent.parent.parent
+        memory_file = project_root / "memory_qa.md"
+    db_path = resolve_store_path(memory_file, store_path)
+
+    key = str(db_path.resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = MemoryStore(db_path)
+        return _stores[key]
+
+
+def reset_memory_stores() -> None:
+    """Fecha e descarta os stores abertos (testes / troca de configuração)."""
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
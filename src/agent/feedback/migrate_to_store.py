@@ -0,0 +1,219 @@
+"""
+Migração única de memory_qa.md + feedback_sessions/ para o MemoryStore (SQLite)
+
+Importa:
+- Regras estruturadas (RULES_ACCEPTED / RULES_REJECTED / VECTOR_INDEX), com
+  o journal de regras ainda não compactado (memory_rules_journal.jsonl)
+  reaplicado sobre o snapshot
+- Sugestões rejeitadas das seções "## Feedback - ..." (mesmo parser de
+  migrate_historical_feedback.py / init_memory_engine.py), como regras e como
+  vereditos por sessão quando não há o JSON da sessão
+- Sessões JSON de feedback_sessions/ (FeedbackStorage)
+- Histórico textual do memory_qa.md (cauda do export)
+
+Idempotente: regras e sessões já presentes não são duplicadas e o histórico
+só é importado em um banco sem histórico.
+
+Uso:
+    python -m agent.feedback.migrate_to_store [--memory-file memory_qa.md]
+        [--db memory_qa.sqlite3] [--sessions-dir feedback_sessions] [--export]
+"""
+
+import argparse
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.logger import logger
+from .memory_artifacts import load_memory_artifacts
+from .memory_store import MemoryStore, resolve_store_path
+from .rules_journal import RULES_JOURNAL_FILENAME, RulesJournal, replay_rules
+from .migrate_historical_feedback import (
+    create_rules_from_rejected_suggestions,
+    extract_rejected_suggestions_from_memory_qa,
+)
+
+# Marcador gravado por MemoryEngine.save_memory entre estrutura e histórico
+HISTORY_MARKER = "\n\n---\n## Feedback Histórico\n\n"
+
+
+def _history_content(content: str) -> str:
+    """Parte textual do memory_qa.md (após as seções estruturadas)."""
+    if HISTORY_MARKER in content:
+        return content.split(HISTORY_MARKER, 1)[1]
+    if "## Feedback Histórico" in content:
+        return content[content.find("## Feedback Histórico"):]
+    return content
+
+
+def _markdown_timestamp(value: str) -> str:
+    """'2025-12-01 10:30' -> '2025-12-01T10:30:00' (ISO, como nas sessões JSON)."""
+    return value.replace(" ", "T") + ":00" if len(value) == 16 else value
+
+
+def _load_json_sessions(sessions_dir: Optional[Path]) -> List[Dict]:
+    """Sessões gravadas pelo FeedbackStorage (feedback_sessions/YYYYMM/session_*.json)."""
+    if not sessions_dir or not sessions_dir.exists():
+        return []
+    sessions = []
+    for json_file in sorted(sessions_dir.glob("*/session_*.json")):
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                sessions.append(json.load(f))
+        except Exception as e:
+            logger.warning(f"Skipping unreadable session {json_file}: {e}")
+    return sessions
+
+
+def _sessions_from_markdown(rejected_suggestions: List[Dict], covered: set) -> List[Dict]:
+    """
+    Sessões sintéticas (apenas vereditos "irrelevant") das seções de feedback
+    do markdown que não têm JSON correspondente.
+
+    Args:
+        rejected_suggestions: Saída de extract_rejected_suggestions_from_memory_qa
+        covered: (protocolo, "YYYY-MM-DDTHH:MM") das sessões JSON
+    """
+    grouped: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+    for sug in rejected_suggestions:
+        grouped.setdefault((sug["timestamp"], sug["protocol_id"], sug["model_id"]), []).append(sug)
+
+    sessions = []
+    for index, ((timestamp, protocol, model), items) in enumerate(grouped.items(), 1):
+        iso = _markdown_timestamp(timestamp)
+        if (protocol, iso[:16]) in covered:
+            continue
+        sessions.append({
+            "session_id": f"md-{iso[:16].replace('-', '').replace(':', '').replace('T', '-')}-{index:03d}",
+            "timestamp": iso,
+            "protocol_name": protocol,
+            "model_used": model,
+            "suggestions_feedback": [
+                {
+                    "suggestion_id": sug["suggestion_id"],
+                    "user_verdict": "irrelevant",
+                    "user_comment": sug["comment"],
+                }
+                for sug in items
+            ],
+            "source": "memory_qa.md",
+        })
+    return sessions
+
+
+def migrate_to_store(
+    memory_file: Path,
+    store: MemoryStore,
+    sessions_dir: Optional[Path] = None
+) -> Dict[str, int]:
+    """
+    Importa memory_qa.md e sessões JSON para o store.
+
+    Args:
+        memory_file: Caminho de memory_qa.md
+        store: MemoryStore de destino
+        sessions_dir: Diretório do FeedbackStorage (opcional)
+
+    Returns:
+        Contagens do que foi importado
+    """
+    report = {
+        "rules": 0, "journal_records": 0, "historical_rules": 0,
+        "sessions": 0, "markdown_sessions": 0, "history_entries": 0
+    }
+
+    accepted, rejected, vector_index = [], [], []
+    if memory_file.exists():
+        artifacts = load_memory_artifacts(memory_file, use_disk_cache=False)
+        accepted, rejected = artifacts.rules_accepted, artifacts.rules_rejected
+        vector_index = artifacts.vector_index
+
+    # Regras registradas depois do último snapshot estão só no journal
+    journal = RulesJournal(memory_file.with_name(RULES_JOURNAL_FILENAME))
+    if journal.size():
+        records = journal.read()
+        accepted, rejected, vector_index = replay_rules(records, accepted, rejected, vector_index)
+        report["journal_records"] = len(records)
+
+    # Regras estruturadas (ordem preservada: aceitas, depois rejeitadas)
+    report["rules"] = store.upsert_rules(accepted + rejected)
+    if vector_index and not store.vector_index():
+        store.set_vector_index(vector_index)
+
+    if memory_file.exists():
+        # Sugestões rejeitadas do histórico textual que ainda não viraram regra
+        rejected_suggestions = extract_rejected_suggestions_from_memory_qa(memory_file)
+        known = {rule["rule_id"] for rule in store.query_rules(decision="rejected")}
+        historical = []
+        for rule in create_rules_from_rejected_suggestions(rejected_suggestions):
+            if rule["rule_id"] not in known:
+                known.add(rule["rule_id"])
+                historical.append(rule)
+        report["historical_rules"] = store.upsert_rules(historical)
+    else:
+        rejected_suggestions = []
+
+    # Sessões JSON (fonte mais completa) e, para o resto, sessões do markdown
+    json_sessions = _load_json_sessions(sessions_dir)
+    covered = set()
+    for session in json_sessions:
+        if session.get("session_id") and store.add_feedback_session(session, replace=False):
+            report["sessions"] += 1
+        covered.add((session.get("protocol_name"), str(session.get("timestamp", ""))[:16]))
+    for session in _sessions_from_markdown(rejected_suggestions, covered):
+        if store.add_feedback_session(session, replace=False):
+            report["markdown_sessions"] += 1
+
+    # Histórico textual vira a primeira entrada (o export o reproduz igual)
+    if memory_file.exists() and not store.history_markdown():
+        history = _history_content(memory_file.read_text(encoding='utf-8'))
+        if history.strip():
+            store.append_entry(history, kind="imported")
+            report["history_entries"] = 1
+
+    logger.info(f"Migration to MemoryStore finished: {report}")
+    return report
+
+
+def export_memory_file(memory_file: Path, store: MemoryStore) -> None:
+    """Regenera memory_qa.md a partir do store (mesmo formato do save_memory)."""
+    from .memory_engine import MemoryEngine
+
+    engine = MemoryEngine(memory_file=memory_file)
+    engine.store = store
+    engine.rules_journal = None
+    engine.load_memory()
+    engine.save_memory()
+
+
+def main():
+    project_root = Path(__file__).resolve().parent.parent.parent.parent
+    store_path, sessions_dir = "memory_qa.sqlite3", "feedback_sessions"
+    try:
+        from ..core.config_loader import get_config
+        config = get_config()
+        store_path = config.feedback.store_path
+        sessions_dir = config.paths.feedback_sessions_dir
+    except Exception:
+        pass
+
+    parser = argparse.ArgumentParser(description="Migra memory_qa.md e feedback_sessions/ para SQLite")
+    parser.add_argument("--memory-file", type=Path, default=project_root / "memory_qa.md")
+    parser.add_argument("--db", type=Path, default=None, help="Banco SQLite (padrão: feedback.store_path)")
+    parser.add_argument("--sessions-dir", type=Path, default=project_root / sessions_dir)
+    parser.add_argument("--export", action="store_true", help="Regenerar memory_qa.md a partir do banco")
+    args = parser.parse_args()
+
+    store = MemoryStore(args.db or resolve_store_path(args.memory_file, store_path))
+    report = migrate_to_store(args.memory_file, store, args.sessions_dir)
+    print(f"Importado em {store.db_path}: {report}")
+    print(f"Totais no banco: {store.counts()}")
+
+    if args.export:
+        export_memory_file(args.memory_file, store)
+        print(f"Export gerado: {args.memory_file}")
+
+
+if __name__ == "__main__":
+    main()
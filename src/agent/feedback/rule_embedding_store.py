@@ -0,0 +1,159 @@
+"""
+Rule Embedding Store - Embeddings de regras persistidos em disco
+
+Responsabilidades:
+- Guardar os embeddings das regras de memória em um arquivo float16 compacto
+  (memory_rule_embeddings.f16, ao lado de memory_qa.md)
+- Abrir o arquivo via memory-map na carga (sem reprocessar o modelo)
+- Acrescentar novas regras de forma incremental (append)
+
+O índice (rule_id, hash do texto, linha, dimensão, modelo) é persistido na
+seção VECTOR_INDEX de memory_qa.md pelo MemoryEngine.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.logger import logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class RuleEmbeddingStore:
+    """
+    Matriz float16 de embeddings de regras, endereçada por rule_id + hash do texto.
+
+    Cada linha do arquivo é um embedding; linhas antigas (regra editada ou
+    removida) ficam órfãs e são simplesmente ignoradas pelo índice.
+    """
+
+    DTYPE = "float16"
+
+    def __init__(self, path: Path, model: str):
+        self.path = Path(path)
+        self.model = model
+        self.dim: Optional[int] = None
+        self._entries: Dict[str, Dict] = {}  # rule_id -> entrada do VECTOR_INDEX
+        self._mmap: Optional[Any] = None
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Hash do texto da regra (detecta regras editadas)."""
+        return hashlib.md5(text.encode("utf-8")).hexdigest()[:16]
+
+    def _file_rows(self) -> int:
+        if not self.dim or not self.path.exists():
+            return 0
+        return self.path.stat().st_size // (2 * self.dim)
+
+    def load(self, entries: List[Dict]) -> None:
+        """
+        Carrega o índice (seção VECTOR_INDEX) e valida contra o arquivo.
+
+        Entradas de outro modelo, de outra dimensão ou que apontam além do fim
+        do arquivo são descartadas.
+
+        Args:
+            entries: Entradas do VECTOR_INDEX
+        """
+        self._entries = {}
+        self._mmap = None
+        self.dim = None
+
+        usable = [
+            e for e in entries or []
+            if isinstance(e, dict) and e.get("model") == self.model
+            and {"rule_id", "text_hash", "row", "dim"} <= e.keys()
+        ]
+        if not usable or not self.available:
+            return
+
+        self.dim = int(usable[0]["dim"])
+        rows = self._file_rows()
+        for entry in usable:
+            if int(entry["dim"]) == self.dim and int(entry["row"]) < rows:
+                self._entries[entry["rule_id"]] = entry
+
+        dropped = len(usable) - len(self._entries)
+        if dropped:
+            logger.warning(f"Rule embedding store: dropped {dropped} stale index entries")
+
+    def entries(self) -> List[Dict]:
+        """Entradas atuais (para gravar em VECTOR_INDEX)."""
+        return sorted(self._entries.values(), key=lambda e: e["row"])
+
+    def _matrix(self) -> Optional[Any]:
+        """Memory-map do arquivo (aberto sob demanda, uma vez)."""
+        if self._mmap is None:
+            rows = self._file_rows()
+            if not rows:
+                return None
+            self._mmap = np.memmap(self.path, dtype=self.DTYPE, mode="r", shape=(rows, self.dim))
+        return self._mmap
+
+    def lookup(self, rule_id: str, text: str) -> Optional[Any]:
+        """
+        Embedding armazenado de uma regra (None se ausente ou desatualizado).
+
+        Args:
+            rule_id: ID da regra
+            text: Texto atual da regra
+        """
+        entry = self._entries.get(rule_id)
+        if not entry or entry["text_hash"] != self.text_hash(text):
+            return None
+        matrix = self._matrix()
+        if matrix is None:
+            return None
+        return np.asarray(matrix[entry["row"]], dtype=np.float32)
+
+    def append(self, items: List[Tuple[str, str, Any]]) -> int:
+        """
+        Acrescenta embeddings ao final do arquivo.
+
+        Args:
+            items: Lista de (rule_id, texto, vetor)
+
+        Returns:
+            Número de linhas gravadas
+        """
+        if not items or not self.available:
+            return 0
+
+        vectors = np.vstack([np.asarray(vector, dtype=np.float32) for _, _, vector in items])
+        if self.dim is not None and vectors.shape[1] != self.dim:
+            # Modelo trocou de dimensão: recomeça o arquivo
+            logger.warning(
+                f"Rule embedding store: dimension changed {self.dim} -> {vectors.shape[1]}, resetting"
+            )
+            self._entries = {}
+            self.path.unlink(missing_ok=True)
+        self.dim = vectors.shape[1]
+
+        first_row = self._file_rows()
+        self._mmap = None  # o arquivo vai crescer
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(vectors.astype(self.DTYPE).tobytes())
+        except OSError as e:
+            logger.warning(f"Failed to append rule embeddings: {e}")
+            return 0
+
+        for offset, (rule_id, text, _) in enumerate(items):
+            self._entries[rule_id] = {
+                "rule_id": rule_id,
+                "text_hash": self.text_hash(text),
+                "row": first_row + offset,
+                "dim": self.dim,
+                "model": self.model,
+            }
+        return len(items)
@@ -0,0 +1,119 @@
+"""
+Rule Partitions - Partição das regras de memória por empresa/família de protocolo
+
+Responsabilidades:
+- Derivar a partição de um protocol_id (nome do arquivo do protocolo, ex:
+  "amil_ficha_cardiologia_v2.0.0_12-12-2025-1024" -> empresa "amil",
+  família "amil/ficha_cardiologia"); versões do mesmo protocolo caem na
+  mesma família
+- Indexar as regras por família e por empresa, com uma partição global para
+  regras sem protocolo
+- Selecionar as regras consultadas pelo filtro: família + globais e, como
+  fallback entre partições, as demais regras da empresa (ou todas)
+
+Usado pelo MemoryEngine.filter_suggestions (feedback.rule_partitioning).
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# protocol_id sem protocolo definido (regras globais)
+GLOBAL_PROTOCOL_IDS = {"", "n/a", "na", "unknown", "global", "none"}
+
+# Fallback entre partições quando a família não tem match
+PARTITION_FALLBACKS = ("none", "company", "all")
+
+# Token de versão/data que encerra o nome do protocolo ("v2", "0", "12", ...)
+_VERSION_TOKEN = re.compile(r"^v?\d+$")
+
+
+def protocol_partition(protocol_id: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    (empresa, família) de um protocol_id.
+
+    Args:
+        protocol_id: ID do protocolo (nome do arquivo, com ou sem versão/data)
+
+    Returns:
+        (empresa, família) ou None para regras globais
+    """
+    normalized = unicodedata.normalize("NFKD", protocol_id or "")
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c)).lower().strip()
+    if normalized in GLOBAL_PROTOCOL_IDS:
+        return None
+
+    tokens = [token for token in re.split(r"[^0-9a-z]+", normalized) if token]
+    if not tokens:
+        return None
+
+    company = tokens[0]
+    name = []
+    for token in tokens[1:]:
+        if _VERSION_TOKEN.match(token):
+            break
+        name.append(token)
+    # "Athena_athena_tunel_do_carpo" -> família "athena/tunel_do_carpo"
+    if name and name[0] == company:
+        name = name[1:]
+    return company, f"{company}/{'_'.join(name)}"
+
+
+class RulePartitionIndex:
+    """
+    Posições das regras de uma lista agrupadas por família, empresa e global.
+
+    As seleções preservam a ordem da lista original (empates no score
+    continuam resolvidos pela regra mais antiga).
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.global_rows: List[int] = []
+        self.family_rows: Dict[str, List[int]] = {}
+        self.company_rows: Dict[str, List[int]] = {}
+
+    def build(self, protocol_ids: Sequence[Optional[str]]) -> "RulePartitionIndex":
+        """Indexa os protocol_id das regras (na ordem da lista)."""
+        self.size = len(protocol_ids)
+        self.global_rows, self.family_rows, self.company_rows = [], {}, {}
+        partitions: Dict[Optional[str], Optional[Tuple[str, str]]] = {}
+        for row, protocol_id in enumerate(protocol_ids):
+            if protocol_id not in partitions:
+                partitions[protocol_id] = protocol_partition(protocol_id)
+            partition = partitions[protocol_id]
+            if partition is None:
+                self.global_rows.append(row)
+                continue
+            company, family = partition
+            self.family_rows.setdefault(family, []).append(row)
+            self.company_rows.setdefault(company, []).append(row)
+        return self
+
+    def select(self, protocol_id: Optional[str], fallback: str = "company") -> Tuple[List[int], List[int]]:
+        """
+        Regras consultadas para um protocolo.
+
+        Args:
+            protocol_id: Protocolo em análise (None = todas as regras)
+            fallback: "none" | "company" | "all" (regras consultadas quando a
+                partição primária não tem match)
+
+        Returns:
+            (posições primárias: família + globais, posições de fallback)
+        """
+        partition = protocol_partition(protocol_id)
+        if partition is None:
+            return list(range(self.size)), []
+
+        company, family = partition
+        primary = sorted(self.family_rows.get(family, []) + self.global_rows)
+        if fallback == "company":
+            in_family = set(self.family_rows.get(family, []))
+            secondary = [row for row in self.company_rows.get(company, []) if row not in in_family]
+        elif fallback == "all":
+            selected = set(primary)
+            secondary = [row for row in range(self.size) if row not in selected]
+        else:
+            secondary = []
+        return primary, secondary
@@ -0,0 +1,128 @@
+"""
+Rule Text Index - Match exato/substring de regras sem varrer todas as regras
+
+Responsabilidades:
+- Match exato: hash map texto normalizado -> regra
+- Regra contida na sugestão: índice pelo prefixo de tamanho fixo das regras
+  (busca multi-padrão estilo Rabin-Karp, uma janela por posição da sugestão)
+- Sugestão contida na regra: índice de n-gramas amostrados das regras
+  (uma posição a cada STEP caracteres; qualquer ocorrência da sugestão
+  cobre uma posição amostrada)
+
+O custo da consulta é proporcional ao tamanho da sugestão (mais a
+verificação dos candidatos), não ao número de regras. Preserva a semântica
+do filtro original: vence a primeira regra (ordem da lista) que casar.
+"""
+
+from typing import Dict, List, Optional, Set
+
+
+class RuleTextIndex:
+    """
+    Índice sobre os textos normalizados de uma lista de regras.
+
+    Uso:
+        index = RuleTextIndex(min_substring_length=20).build(normalized_texts)
+        position = index.match(normalized_suggestion)   # índice da regra ou None
+    """
+
+    # Janela dos n-gramas amostrados e passo da amostragem
+    # (STEP + GRAM - 1 <= prefix_length: toda sugestão elegível cobre uma amostra)
+    GRAM = 8
+    STEP = 13
+
+    def __init__(self, min_substring_length: int = 20):
+        """
+        Args:
+            min_substring_length: Substring só conta com ambos os textos
+                maiores que este tamanho (como no filtro original)
+        """
+        self.min_substring_length = min_substring_length
+        # Prefixo fixo: toda regra elegível tem pelo menos este tamanho
+        self.prefix_length = min_substring_length + 1
+        self.texts: List[str] = []
+        self._exact: Dict[str, int] = {}
+        self._prefixes: Dict[str, List[int]] = {}
+        self._grams: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def build(self, normalized_texts: List[str]) -> "RuleTextIndex":
+        """
+        Indexa os textos (já normalizados) das regras.
+
+        Args:
+            normalized_texts: Textos na ordem da lista de regras
+
+        Returns:
+            self
+        """
+        self.texts = list(normalized_texts)
+        self._exact = {}
+        self._prefixes = {}
+        self._grams = {}
+
+        for position, text in enumerate(self.texts):
+            self._exact.setdefault(text, position)
+            if len(text) <= self.min_substring_length:
+                continue
+            self._prefixes.setdefault(text[:self.prefix_length], []).append(position)
+            for start in range(0, len(text) - self.GRAM + 1, self.STEP):
+                postings = self._grams.setdefault(text[start:start + self.GRAM], [])
+                if not postings or postings[-1] != position:
+                    postings.append(position)
+        return self
+
+    def match(self, suggestion: str) -> Optional[int]:
+        """
+        Primeira regra (menor posição) que casa com a sugestão.
+
+        Casa se o texto for igual, ou, com ambos maiores que
+        min_substring_length, se um contiver o outro.
+
+        Args:
+            suggestion: Texto normalizado da sugestão
+
+        Returns:
+            Posição da regra na lista indexada ou None
+        """
+        best = self._exact.get(suggestion)
+        if len(suggestion) <= self.min_substring_length:
+            return best
+
+        # Regras contidas na sugestão: prefixo da regra aparece em alguma posição
+        width = self.prefix_length
+        for start in range(len(suggestion) - width + 1):
+            for position in self._prefixes.get(suggestion[start:start + width], ()):
+                if best is not None and position >= best:
+                    break
+                if suggestion.startswith(self.texts[position], start):
+                    best = position
+                    break
+
+        # Sugestão contida na regra: para o deslocamento certo, todas as janelas
+        # offset, offset + STEP, ... da sugestão caem em posições amostradas da regra
+        candidates: Set[int] = set()
+        for offset in range(self.STEP):
+            postings = [
+                self._grams.get(suggestion[start:start + self.GRAM], ())
+                for start in range(offset, len(suggestion) - self.GRAM + 1, self.STEP)
+            ]
+            postings.sort(key=len)
+            if not postings or not postings[0]:
+                continue
+            common = set(postings[0])
+            for other in postings[1:]:
+                common.intersection_update(other)
+                if not common:
+                    break
+            candidates |= common
+        for position in sorted(candidates):
+            if best is not None and position >= best:
+                break
+            if suggestion in self.texts[position]:
+                best = position
+                break
+
+        return best
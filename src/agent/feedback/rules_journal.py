@@ -0,0 +1,144 @@
+"""
+Rules Journal - Log append-only das mudanças de regras de memória (JSONL)
+
+Responsabilidades:
+- Registrar cada regra nova (e as entradas novas do VECTOR_INDEX) com um
+  append de uma linha, em O(1), sem reescrever memory_qa.md
+- Fornecer os registros para replay sobre o snapshot (memory_qa.md) na carga
+- Compactação segura: o journal é renomeado antes de ser dobrado no
+  snapshot, então appends concorrentes vão para um journal novo e nada se
+  perde; se a compactação falhar, o arquivo renomeado continua sendo lido
+
+Usado pelo MemoryEngine no backend markdown (feedback.rules_journal).
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..core.logger import logger
+
+# Journal append-only de regras (ao lado de memory_qa.md, backend markdown)
+RULES_JOURNAL_FILENAME = "memory_rules_journal.jsonl"
+
+
+def replay_rules(
+    records: List[Dict],
+    accepted: List[Dict],
+    rejected: List[Dict],
+    vector_index: List[Dict]
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Aplica registros do journal sobre as regras de um snapshot.
+
+    Uma regra registrada substitui a de mesmo rule_id e vai para o fim da
+    lista (mesma semântica do register_feedback).
+
+    Returns:
+        (aceitas, rejeitadas, vector_index) após o replay
+    """
+    lists = {
+        "accepted": {rule.get("rule_id"): rule for rule in accepted},
+        "rejected": {rule.get("rule_id"): rule for rule in rejected},
+    }
+    vectors = {entry.get("rule_id"): entry for entry in vector_index}
+
+    for record in records:
+        if record.get("op") == "rule":
+            rule = record.get("rule") or {}
+            target = lists.get(rule.get("decision"))
+            if target is not None and rule.get("rule_id"):
+                target.pop(rule["rule_id"], None)
+                target[rule["rule_id"]] = rule
+        elif record.get("op") == "vectors":
+            for entry in record.get("entries", []):
+                vectors[entry.get("rule_id")] = entry
+
+    return (
+        list(lists["accepted"].values()),
+        list(lists["rejected"].values()),
+        sorted(vectors.values(), key=lambda entry: entry.get("row", 0))
+    )
+
+
+class RulesJournal:
+    """
+    Journal JSONL ao lado do snapshot.
+
+    Registros:
+        {"op": "rule", "ts": ..., "rule": {...}}          # regra registrada
+        {"op": "vectors", "ts": ..., "entries": [...]}    # entradas do VECTOR_INDEX
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.compacting_path = self.path.with_name(self.path.name + ".compacting")
+
+    def append(self, op: str, **payload) -> None:
+        """Acrescenta um registro (uma linha)."""
+        record = {"op": op, "ts": datetime.now().isoformat(), **payload}
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    @staticmethod
+    def _read_file(path: Path) -> List[Dict]:
+        if not path.exists():
+            return []
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Linha truncada (crash durante o append): ignorada
+                    logger.warning(f"Skipping corrupt journal line {number} in {path.name}")
+        return records
+
+    def read(self) -> List[Dict]:
+        """Registros pendentes (compactação interrompida primeiro, depois o journal)."""
+        return self._read_file(self.compacting_path) + self._read_file(self.path)
+
+    def size(self) -> int:
+        """Tamanho pendente em bytes."""
+        return sum(p.stat().st_size for p in (self.compacting_path, self.path) if p.exists())
+
+    def oldest_timestamp(self) -> Optional[datetime]:
+        """Timestamp do registro pendente mais antigo (None se vazio)."""
+        for path in (self.compacting_path, self.path):
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        return datetime.fromisoformat(json.loads(line)["ts"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        return None
+
+    def begin_compaction(self) -> List[Dict]:
+        """
+        Congela o journal atual para ser dobrado no snapshot.
+
+        Returns:
+            Registros congelados (inclui uma compactação anterior interrompida)
+        """
+        if self.path.exists():
+            if self.compacting_path.exists():
+                # Compactação anterior falhou: junta os dois, em ordem
+                with open(self.compacting_path, 'a', encoding='utf-8') as target, \
+                        open(self.path, 'r', encoding='utf-8') as source:
+                    target.write(source.read())
+                self.path.unlink()
+            else:
+                os.replace(self.path, self.compacting_path)
+        return self._read_file(self.compacting_path)
+
+    def finish_compaction(self) -> None:
+        """Descarta os registros já gravados no snapshot."""
+        self.compacting_path.unlink(missing_ok=True)
@@ -0,0 +1,176 @@
+"""
+TF-IDF Embedder - Embeddings offline por n-gramas de caracteres (NumPy puro)
+
+Responsabilidades:
+- Gerar vetores TF-IDF densos a partir de n-gramas de caracteres com hashing
+  (dimensão fixa, sem vocabulário, sem torch)
+- Ajustar o IDF sobre o corpus de regras e persisti-lo ao lado de memory_qa.md
+- Expor a mesma interface encode() do SentenceTransformer, para entrar no
+  caminho de similaridade em lote do MemoryEngine
+
+Selecionado com feedback.embedding_backend: "tfidf" em config.yaml.
+"""
+
+import hashlib
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from ..core.logger import logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Multiplicador do hash polinomial e sal por tamanho de n-grama
+_HASH_BASE = 1099511628211
+_HASH_SALTS = {n: (0x9E3779B97F4A7C15 * n) & 0xFFFFFFFFFFFFFFFF for n in range(1, 16)}
+
+
+class HashedTfidfEmbedder:
+    """
+    Embeddings TF-IDF de n-gramas de caracteres com feature hashing.
+
+    Uso:
+        embedder = HashedTfidfEmbedder(idf_path=Path("memory_tfidf_idf.npz"))
+        embedder.fit(rule_texts)           # ajusta e persiste o IDF
+        vectors = embedder.encode(texts)   # (len(texts), n_features), L2 = 1
+    """
+
+    def __init__(
+        self,
+        idf_path: Optional[Path] = None,
+        n_features: int = 4096,
+        ngram_range: Tuple[int, int] = (3, 5)
+    ):
+        self.idf_path = Path(idf_path) if idf_path else None
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.idf: Optional[Any] = None
+        self.n_documents = 0
+
+        if self.idf_path and self.idf_path.exists():
+            self.load()
+
+    @property
+    def fitted(self) -> bool:
+        return self.idf is not None
+
+    @property
+    def model_id(self) -> str:
+        """Identificador que muda quando o IDF muda (invalida embeddings salvos)."""
+        low, high = self.ngram_range
+        digest = hashlib.md5(self.idf.tobytes()).hexdigest()[:8] if self.fitted else "tf"
+        return f"hashed-tfidf-{self.n_features}-{low}{high}:{digest}"
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Lowercase, sem acentos, espaços colapsados e bordas marcadas."""
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+        text = re.sub(r"[^\w]+", " ", text).strip()
+        return f" {text} "
+
+    def _features(self, text: str) -> Any:
+        """Índices (com repetição) dos n-gramas de um texto."""
+        codes = np.frombuffer(self._normalize(text).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        features = []
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            if len(codes) < n:
+                break
+            count = len(codes) - n + 1
+            hashes = np.full(count, _HASH_SALTS[n], dtype=np.uint64)
+            for offset in range(n):
+                hashes = hashes * np.uint64(_HASH_BASE) + codes[offset:offset + count]
+            hashes ^= hashes >> np.uint64(29)
+            features.append(hashes % np.uint64(self.n_features))
+        if not features:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(features).astype(np.int64)
+
+    def _term_frequencies(self, texts: List[str]) -> Any:
+        """Matriz TF sublinear (1 + log(contagem)) de dimensão fixa."""
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if len(features):
+                matrix[row] = np.bincount(features, minlength=self.n_features)
+        np.log1p(matrix, out=matrix, where=matrix > 0)
+        return matrix
+
+    def fit(self, texts: List[str], save: bool = True) -> "HashedTfidfEmbedder":
+        """
+        Ajusta o IDF (suavizado) sobre um corpus e persiste em idf_path.
+
+        Args:
+            texts: Corpus (textos das regras)
+            save: Gravar o IDF em disco
+
+        Returns:
+            self
+        """
+        presence = self._term_frequencies(texts) > 0
+        document_frequency = presence.sum(axis=0)
+        self.n_documents = len(texts)
+        self.idf = (np.log((1 + self.n_documents) / (1 + document_frequency)) + 1).astype(np.float32)
+        logger.info(f"TF-IDF embedder fitted on {self.n_documents} texts ({self.model_id})")
+
+        if save and self.idf_path:
+            self.save()
+        return self
+
+    def save(self) -> None:
+        """Grava IDF e parâmetros (.npz)."""
+        try:
+            self.idf_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.idf_path, "wb") as f:
+                np.savez(
+                    f,
+                    idf=self.idf,
+                    n_documents=self.n_documents,
+                    n_features=self.n_features,
+                    ngram_range=np.array(self.ngram_range)
+                )
+        except OSError as e:
+            logger.warning(f"Failed to save TF-IDF IDF: {e}")
+
+    def load(self) -> None:
+        """Carrega IDF e parâmetros gravados por save()."""
+        try:
+            with np.load(self.idf_path) as data:
+                self.n_features = int(data["n_features"])
+                self.ngram_range = tuple(int(n) for n in data["ngram_range"])
+                self.n_documents = int(data["n_documents"])
+                self.idf = data["idf"].astype(np.float32)
+        except Exception as e:
+            logger.warning(f"Failed to load TF-IDF IDF from {self.idf_path}: {e}. Using TF only.")
+            self.idf = None
+
+    def encode(
+        self,
+        texts: Union[str, List[str]],
+        convert_to_numpy: bool = True,
+        convert_to_tensor: bool = False,
+        **kwargs
+    ) -> Any:
+        """
+        Codifica textos (mesma assinatura usada do SentenceTransformer).
+
+        Args:
+            texts: Texto ou lista de textos
+
+        Returns:
+            Vetor (1 texto) ou matriz (N, n_features), normalizados (L2 = 1)
+        """
+        single = isinstance(texts, str)
+        matrix = self._term_frequencies([texts] if single else list(texts))
+        if self.fitted:
+            matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix[0] if single else matrix
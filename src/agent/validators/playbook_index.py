@@ -0,0 +1,264 @@
+"""
+Playbook Index - Índice do playbook para verificação de referências.
+
+Construído uma vez por conteúdo (hash SHA-1) e compartilhado pelas duas
+verificações de referência da análise:
+- EnhancedAnalyzer._validate_playbook_references: trechos de 5/6 palavras
+  da referência presentes no playbook normalizado
+- ReferenceValidator._verify_in_playbook: maior sobreposição de palavras
+  entre a referência e uma sentença do playbook
+
+Estruturas:
+- Shingles de 3 palavras (hash -> posições) sobre as palavras do playbook
+  normalizado; a busca de um trecho verifica as palavras internas no índice e
+  as bordas por sufixo/prefixo, reproduzindo `trecho in playbook_normalizado`
+- Índice invertido palavra -> sentenças, com a tokenização do ReferenceValidator
+
+As consultas custam proporcional ao tamanho da referência (mais as posições
+candidatas do shingle), em vez de varrer o playbook inteiro por janela.
+
+O pré-processamento (texto normalizado, offsets e tokens das sentenças) é
+serializável: o cache de playbooks (core/playbook_cache.py) o persiste e o
+registra aqui, e o índice de um playbook em cache não renormaliza o texto.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..core.logger import logger
+
+# Palavras ignoradas na sobreposição de sentenças (ReferenceValidator)
+REFERENCE_STOPWORDS = {
+    'o', 'a', 'os', 'as', 'de', 'da', 'do', 'das', 'dos',
+    'e', 'em', 'no', 'na', 'nos', 'nas', 'para', 'por',
+    'com', 'que', 'um', 'uma', 'uns', 'umas', 'se', 'é',
+    'ao', 'aos', 'às', 'à', 'ou', 'como', 'mais', 'muito',
+    'the', 'a', 'an', 'is', 'are', 'of', 'in', 'to', 'and',
+    'for', 'with', 'on', 'at', 'by', 'from', 'or', 'as'
+}
+
+# Palavras por shingle (trechos buscados têm 5-6 palavras: 3-4 internas)
+SHINGLE_SIZE = 3
+
+# Índices mantidos em memória (um por playbook recente)
+MAX_CACHED_INDEXES = 4
+
+_index_cache: "OrderedDict[str, PlaybookIndex]" = OrderedDict()
+
+# Pré-processamentos vindos do cache em disco (hash do conteúdo -> dados)
+_preprocessed: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Fim de sentença (mesmo separador de re.split no ReferenceValidator)
+_SENTENCE_END = re.compile(r'[.!?]+\s*')
+
+
+class PlaybookPreprocessor:
+    """
+    Pré-processamento incremental: o texto chega em partes (ex: páginas de
+    um PDF extraídas em paralelo) e as sentenças completas são separadas e
+    tokenizadas à medida que chegam.
+
+    Uma sentença só é fechada quando o separador ([.!?]+\\s*) não toca o fim
+    do que já chegou, então o resultado é idêntico ao de processar o texto
+    inteiro de uma vez.
+    """
+
+    def __init__(self, with_tokens: bool = True):
+        self.with_tokens = with_tokens
+        self._parts: List[str] = []
+        self._pending = ""      # texto desde o início da sentença aberta
+        self._offset = 0        # posição de _pending no texto completo
+        self.spans: List[Tuple[int, int]] = []
+        self.tokens: List[List[str]] = []
+
+    def _close(self, begin: int, end: int) -> None:
+        piece = self._pending[begin:end]
+        stripped_end = len(piece.rstrip())
+        stripped_begin = len(piece) - len(piece.lstrip())
+        if stripped_end - stripped_begin > 20:
+            self.spans.append((self._offset + begin + stripped_begin, self._offset + begin + stripped_end))
+            if self.with_tokens:
+                self.tokens.append(sorted(tokenize(piece)))
+
+    def _scan(self, final: bool) -> None:
+        start = 0
+        for match in _SENTENCE_END.finditer(self._pending):
+            if not final and match.end() == len(self._pending):
+                break
+            self._close(start, match.start())
+            start = match.end()
+        if final:
+            self._close(start, len(self._pending))
+            start = len(self._pending)
+        self._pending = self._pending[start:]
+        self._offset += start
+
+    def feed(self, chunk: str) -> "PlaybookPreprocessor":
+        """Acrescenta uma parte do texto (na ordem)."""
+        if chunk:
+            self._parts.append(chunk)
+            self._pending += chunk
+            self._scan(final=False)
+        return self
+
+    def finish(self) -> Dict[str, Any]:
+        """Fecha a última sentença e retorna o pré-processamento (ver preprocess_playbook)."""
+        self._scan(final=True)
+        return {
+            "normalized": " ".join("".join(self._parts).lower().split()),
+            "sentence_spans": [list(span) for span in self.spans],
+            "sentence_tokens": self.tokens,
+        }
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """Offsets (início, fim) das sentenças com mais de 20 caracteres (sem espaços nas bordas)."""
+    preprocessor = PlaybookPreprocessor(with_tokens=False).feed(text)
+    preprocessor.finish()
+    return preprocessor.spans
+
+
+def split_sentences(text: str) -> List[str]:
+    """Divide o texto em sentenças (descarta as com até 20 caracteres)."""
+    return [text[begin:end] for begin, end in sentence_spans(text)]
+
+
+def tokenize(text: str) -> Set[str]:
+    """Conjunto de palavras significativas (minúsculas, sem pontuação/stopwords)."""
+    text_clean = re.sub(r'[^\w\s]', ' ', text.lower())
+    return {w for w in text_clean.split() if w not in REFERENCE_STOPWORDS and len(w) > 2}
+
+
+def content_hash(content: str) -> str:
+    """Hash do conteúdo do playbook (chave do índice)."""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def preprocess_playbook(content: str) -> Dict[str, Any]:
+    """
+    Pré-processamento serializável (JSON) do playbook.
+
+    Returns:
+        {"normalized": texto normalizado, "sentence_spans": [[início, fim]],
+         "sentence_tokens": [[palavras]]}
+    """
+    return PlaybookPreprocessor().feed(content).finish()
+
+
+def register_preprocessed(content_sha1: str, data: Dict[str, Any]) -> None:
+    """Disponibiliza um pré-processamento (do cache em disco) para get_playbook_index."""
+    _preprocessed[content_sha1] = data
+    _preprocessed.move_to_end(content_sha1)
+    while len(_preprocessed) > MAX_CACHED_INDEXES:
+        _preprocessed.popitem(last=False)
+
+
+class PlaybookIndex:
+    """Shingles de palavras + índice invertido de sentenças de um playbook."""
+
+    def __init__(self, content: str, preprocessed: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            content: Conteúdo completo do playbook
+            preprocessed: Saída de preprocess_playbook(content) (ex: do cache em disco)
+        """
+        self.content_hash = content_hash(content)
+        self.playbook_lower = content.lower()
+        data = preprocessed or preprocess_playbook(content)
+
+        # Palavras do playbook normalizado (" ".join(content.lower().split()))
+        self.words: List[str] = data["normalized"].split(" ") if data["normalized"] else []
+        self.shingles: Dict[int, List[int]] = {}
+        for position in range(len(self.words) - SHINGLE_SIZE + 1):
+            key = hash(tuple(self.words[position:position + SHINGLE_SIZE]))
+            self.shingles.setdefault(key, []).append(position)
+
+        # Sentenças tokenizadas e palavra -> sentenças
+        self.sentences: List[str] = [content[begin:end] for begin, end in data["sentence_spans"]]
+        self.sentence_postings: Dict[str, List[int]] = {}
+        for sentence_id, tokens in enumerate(data["sentence_tokens"]):
+            for word in tokens:
+                self.sentence_postings.setdefault(word, []).append(sentence_id)
+
+        logger.debug(
+            f"PlaybookIndex built: {len(self.words)} words, {len(self.shingles)} shingles, "
+            f"{len(self.sentences)} sentences"
+        )
+
+    def contains_phrase(self, phrase_words: Sequence[str]) -> bool:
+        """
+        `" ".join(phrase_words) in playbook_normalizado`, via índice.
+
+        Como o trecho não tem espaços internos às palavras, ele ocorre no
+        texto normalizado se e só se as palavras internas coincidem com
+        palavras consecutivas do playbook, a primeira palavra é sufixo da
+        palavra anterior e a última é prefixo da seguinte.
+
+        Args:
+            phrase_words: Palavras do trecho (já normalizadas, minúsculas)
+
+        Returns:
+            True se o trecho aparece no playbook normalizado
+        """
+        count = len(phrase_words)
+        if count < SHINGLE_SIZE + 2:
+            # Trecho curto demais para o índice: busca direta
+            return " ".join(phrase_words) in " ".join(self.words)
+
+        inner = list(phrase_words[1:-1])
+        first, last = phrase_words[0], phrase_words[-1]
+        for position in self.shingles.get(hash(tuple(inner[:SHINGLE_SIZE])), ()):
+            end = position + len(inner)
+            if position == 0 or end >= len(self.words):
+                continue
+            if (
+                self.words[position:end] == inner
+                and self.words[position - 1].endswith(first)
+                and self.words[end].startswith(last)
+            ):
+                return True
+        return False
+
+    def best_sentence_overlap(self, words: Set[str]) -> Tuple[int, int]:
+        """
+        Sentença com mais palavras em comum com a referência.
+
+        Args:
+            words: Palavras tokenizadas da referência (tokenize)
+
+        Returns:
+            (sobreposição, índice da sentença) ou (0, -1)
+        """
+        counts: Counter = Counter()
+        for word in words:
+            counts.update(self.sentence_postings.get(word, ()))
+        if not counts:
+            return 0, -1
+        # Empate: primeira sentença do playbook (mesma ordem da varredura linear)
+        sentence_id, overlap = min(counts.items(), key=lambda item: (-item[1], item[0]))
+        return overlap, sentence_id
+
+
+def get_playbook_index(content: str) -> PlaybookIndex:
+    """
+    Índice do playbook, construído uma vez por conteúdo.
+
+    Args:
+        content: Conteúdo completo do playbook
+
+    Returns:
+        PlaybookIndex compartilhado
+    """
+    key = content_hash(content)
+    index = _index_cache.get(key)
+    if index is not None:
+        _index_cache.move_to_end(key)
+        return index
+
+    index = PlaybookIndex(content, preprocessed=_preprocessed.get(key))
+    _index_cache[key] = index
+    while len(_index_cache) > MAX_CACHED_INDEXES:
+        _index_cache.popitem(last=False)
+    return index
@@ -11,9 +11,9 @@ Zero tolerance policy for:
 Every suggestion's playbook_reference must be VERIFIABLE.
 """
 
-import re
 from typing import Tuple, List, Dict, Set
 from ..core.logger import logger
+from .playbook_index import REFERENCE_STOPWORDS, get_playbook_index, split_sentences, tokenize
 
 
 class ReferenceValidator:
@@ -57,15 +57,8 @@ class ReferenceValidator:
     MIN_REFERENCE_LENGTH = 30
     MIN_MATCH_WORDS = 3  # At least 3 words must match
     
-    # Stopwords to ignore in matching
-    STOPWORDS = {
-        'o', 'a', 'os', 'as', 'de', 'da', 'do', 'das', 'dos',
-        'e', 'em', 'no', 'na', 'nos', 'nas', 'para', 'por',
-        'com', 'que', 'um', 'uma', 'uns', 'umas', 'se', 'é',
-        'ao', 'aos', 'às', 'à', 'ou', 'como', 'mais', 'muito',
-        'the', 'a', 'an', 'is', 'are', 'of', 'in', 'to', 'and',
-        'for', 'with', 'on', 'at', 'by', 'from', 'or', 'as'
-    }
+    # Stopwords to ignore in matching (shared with PlaybookIndex)
+    STOPWORDS = REFERENCE_STOPWORDS
     
     def __init__(self, playbook_content: str):
         """
@@ -75,11 +68,11 @@ class ReferenceValidator:
             playbook_content: Full text of the playbook
         """
         self.playbook_content = playbook_content
-        self.playbook_lower = playbook_content.lower()
         
-        # Pre-process playbook into sentences and word sets
-        self.playbook_sentences = self._split_into_sentences(playbook_content)
-        self.playbook_words = self._tokenize(playbook_content)
+        # Shared index (built once per playbook content hash)
+        self.index = get_playbook_index(playbook_content)
+        self.playbook_lower = self.index.playbook_lower
+        self.playbook_sentences = self.index.sentences
         
         logger.debug(f"ReferenceValidator initialized with {len(self.playbook_sentences)} sentences")
     
@@ -140,20 +133,8 @@ class ReferenceValidator:
         if len(ref_words) < 3:
             return False, "reference_too_short_for_matching"
         
-        best_overlap = 0
-        best_sentence = ""
-        
-        for sentence in self.playbook_sentences:
-            sent_words = self._tokenize(sentence)
-            if not sent_words:
-                continue
-            
-            # Count overlapping words
-            overlap = len(ref_words & sent_words)
-            
-            if overlap > best_overlap:
-                best_overlap = overlap
-                best_sentence = sentence[:100]
+        # Inverted index: only sentences sharing a word with the reference
+        best_overlap, _ = self.index.best_sentence_overlap(ref_words)
         
         # Need at least MIN_MATCH_WORDS or 40% of reference words
         min_required = max(self.MIN_MATCH_WORDS, len(ref_words) * 0.4)
@@ -173,18 +154,11 @@ class ReferenceValidator:
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
-        # Split on sentence-ending punctuation
-        sentences = re.split(r'[.!?]+\s*', text)
-        # Filter short/empty
-        return [s.strip() for s in sentences if len(s.strip()) > 20]
+        return split_sentences(text)
     
     def _tokenize(self, text: str) -> Set[str]:
         """Tokenize text into set of meaningful words."""
-        # Remove punctuation and lowercase
-        text_clean = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = text_clean.split()
-        # Filter stopwords and short words
-        return {w for w in words if w not in self.STOPWORDS and len(w) > 2}
+        return tokenize(text)
 
 
 def validate_suggestions_references(
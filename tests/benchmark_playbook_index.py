@@ -0,0 +1,98 @@
+"""
+Benchmark do PlaybookIndex na verificação de referências.
+
+Compara as duas verificações da análise (trechos de 5/6 palavras do
+EnhancedAnalyzer e sobreposição de sentenças do ReferenceValidator) com as
+varreduras lineares que o índice substituiu, no maior playbook de
+models_json/. As referências são trechos reais do playbook (válidas) e
+trechos embaralhados (inválidas); os resultados são conferidos.
+
+Uso:
+    python tests/benchmark_playbook_index.py [--playbook arquivo.md] [--references 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from agent.validators.playbook_index import PlaybookIndex, split_sentences, tokenize
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models_json"
+
+
+def phrase_windows(reference: str):
+    words = " ".join(reference.lower().split()).split()
+    for size, min_chars in ((6, 30), (5, 25)):
+        for i in range(len(words) - size + 1):
+            if len(" ".join(words[i:i + size])) >= min_chars:
+                yield words[i:i + size]
+
+
+def linear_phrase_check(reference: str, playbook_normalized: str) -> bool:
+    return any(" ".join(window) in playbook_normalized for window in phrase_windows(reference))
+
+
+def index_phrase_check(reference: str, index: PlaybookIndex) -> bool:
+    return any(index.contains_phrase(window) for window in phrase_windows(reference))
+
+
+def linear_overlap(reference: str, sentences) -> int:
+    ref_words = tokenize(reference)
+    return max((len(ref_words & tokenize(sentence)) for sentence in sentences), default=0)
+
+
+def make_references(content: str, count: int, rng: random.Random):
+    words = content.split()
+    references = []
+    for _ in range(count):
+        start = rng.randrange(max(1, len(words) - 25))
+        window = words[start:start + rng.randint(8, 25)]
+        if rng.random() < 0.5:
+            rng.shuffle(window)
+        references.append(" ".join(window))
+    return references
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    largest = max(MODELS_DIR.glob("*.md"), key=lambda path: path.stat().st_size, default=None)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--playbook", type=Path, default=largest)
+    parser.add_argument("--references", type=int, default=200)
+    args = parser.parse_args()
+
+    content = args.playbook.read_text(encoding="utf-8")
+    references = make_references(content, args.references, random.Random(42))
+    print(f"Playbook: {args.playbook.name} ({len(content)} chars), {len(references)} references")
+
+    index, build_ms = timed(lambda: PlaybookIndex(content))
+    print(f"Index build: {build_ms:.1f} ms")
+
+    normalized = " ".join(content.lower().split())
+    linear, linear_ms = timed(lambda: [linear_phrase_check(ref, normalized) for ref in references])
+    indexed, index_ms = timed(lambda: [index_phrase_check(ref, index) for ref in references])
+    assert linear == indexed, "phrase check mismatch"
+    print(f"Phrase windows:   linear {linear_ms:8.1f} ms | index {index_ms:8.1f} ms "
+          f"| {linear_ms / max(index_ms, 1e-6):6.1f}x ({sum(indexed)} found)")
+
+    sentences = split_sentences(content)
+    linear, linear_ms = timed(lambda: [linear_overlap(ref, sentences) for ref in references])
+    indexed, index_ms = timed(lambda: [index.best_sentence_overlap(tokenize(ref))[0] for ref in references])
+    assert linear == indexed, "sentence overlap mismatch"
+    print(f"Sentence overlap: linear {linear_ms:8.1f} ms | index {index_ms:8.1f} ms "
+          f"| {linear_ms / max(index_ms, 1e-6):6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Relatório da projeção compacta do protocolo nos prompts.
+
+Para cada protocolo de models_json/, compara o JSON com indent=2 (formato
+anterior dos prompts) com a projeção compacta (ProtocolProjection) em bytes
+e tokens estimados (~4 caracteres por token), e confere que a projeção
+volta ao original (restore).
+
+Uso:
+    python tests/benchmark_protocol_projection.py [--models-dir models_json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from agent.core.protocol_loader import load_protocol
+from agent.core.protocol_projection import ProtocolProjection, projection_savings
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models_json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models-dir", type=Path, default=MODELS_DIR)
+    args = parser.parse_args()
+
+    paths = sorted(args.models_dir.glob("*.json"))
+    if not paths:
+        print(f"Nenhum protocolo em {args.models_dir}")
+        return 1
+
+    header = f"{'protocolo':<58} {'bytes':>9} {'compacto':>9} {'tokens':>8} {'compacto':>9} {'economia':>9}  reversível"
+    print(header)
+    print("-" * len(header))
+    totals = {"full_bytes": 0, "compact_bytes": 0, "full_tokens": 0, "compact_tokens": 0}
+    all_reversible = True
+    for path in paths:
+        protocol = load_protocol(str(path))
+        savings = projection_savings(protocol)
+        projection = ProtocolProjection(protocol)
+        reversible = projection.restore(json.loads(projection.to_json())) == protocol
+        all_reversible &= reversible
+        for key in totals:
+            totals[key] += savings[key]
+        print(
+            f"{path.stem[:58]:<58} {savings['full_bytes']:>9} {savings['compact_bytes']:>9} "
+            f"{savings['full_tokens']:>8} {savings['compact_tokens']:>9} {savings['saved_pct']:>8}%  "
+            f"{'sim' if reversible else 'NÃO'}"
+        )
+
+    print("-" * len(header))
+    saved_pct = 100.0 * (totals["full_bytes"] - totals["compact_bytes"]) / totals["full_bytes"]
+    print(
+        f"{'total':<58} {totals['full_bytes']:>9} {totals['compact_bytes']:>9} "
+        f"{totals['full_tokens']:>8} {totals['compact_tokens']:>9} {saved_pct:>8.1f}%"
+    )
+    print(f"\nTokens economizados: {totals['full_tokens'] - totals['compact_tokens']} "
+          f"de {totals['full_tokens']} em {len(paths)} protocolos")
+    return 0 if all_reversible else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Deterministic Applicator Tests - Aplicação local de implementation_path
+"""
+import os
+import sys
+import unittest
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "sk-or-v1-test")
+
+from agent.applicator.deterministic_applicator import DeterministicApplicator, parse_json_path
+from test_protocol_reconstructor import get_minimal_protocol
+
+
+class TestDeterministicApplicator(unittest.TestCase):
+    """Edições com json_path + modification_type + proposed_value."""
+
+    def setUp(self):
+        self.protocol = get_minimal_protocol(node_count=3)
+        self.applicator = DeterministicApplicator()
+
+    def test_parse_json_path(self):
+        """json_path das sugestões vira tokens (chaves e índices)."""
+        self.assertEqual(
+            parse_json_path("nodes[14].data.condutaDataNode.exame[2].condicao"),
+            ["nodes", 14, "data", "condutaDataNode", "exame", 2, "condicao"],
+        )
+
+    def test_add_message_applied_with_changelog(self):
+        """add_message é anexado ao nó e documentado na descricao."""
+        suggestion = {
+            "id": "sug_001",
+            "title": "Alerta de função renal",
+            "specific_location": {"node_id": "conduta-1"},
+            "implementation_path": {
+                # Índice errado: corrigido pelo node_id
+                "json_path": "nodes[0].data.condutaDataNode.mensagem",
+                "modification_type": "add_message",
+                "proposed_value": {
+                    "id": "msg-renal",
+                    "nome": "Função renal",
+                    "condicao": "'opcao_0' in pergunta_0",
+                    "conteudo": "<p>Avaliar TFG</p>",
+                },
+            },
+        }
+
+        result = self.applicator.apply(self.protocol, [suggestion], new_version="1.0.1")
+
+        self.assertEqual(len(result.applied), 1)
+        self.assertEqual(result.pending, [])
+        conduta = result.protocol["nodes"][-1]["data"]
+        self.assertEqual(conduta["condutaDataNode"]["mensagem"][-1]["id"], "msg-renal")
+        self.assertIn("[CHANGELOG v1.0.1]", conduta["descricao"])
+        # Original intacto
+        self.assertEqual(len(self.protocol["nodes"][-1]["data"]["condutaDataNode"]["mensagem"]), 1)
+
+    def test_unsafe_or_unresolvable_edits_go_to_llm(self):
+        """Condicional perigosa, path inexistente ou tipo desconhecido ficam pendentes."""
+        suggestions = [
+            {"id": "s1", "implementation_path": {
+                "json_path": "nodes[2].data.condutaDataNode.mensagem[0]",
+                "modification_type": "modify_condition",
+                "proposed_value": "exec('x')"}},
+            {"id": "s2", "implementation_path": {
+                "json_path": "nodes[9].data.questions",
+                "modification_type": "add_question",
+                "proposed_value": {"id": "q-new"}}},
+            {"id": "s3", "implementation_path": {
+                "json_path": "nodes[0].data.label",
+                "modification_type": "reorganize_flow",
+                "proposed_value": "x"}},
+        ]
+
+        result = self.applicator.apply(self.protocol, suggestions, new_version="1.0.1")
+
+        self.assertEqual(result.applied, [])
+        self.assertEqual([s["id"] for s in result.pending], ["s1", "s2", "s3"])
+        self.assertEqual(result.protocol, self.protocol)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,574 @@
+"""
+Memory Engine Tests - Filtro de sugestões por memória
+Testes do MemoryEngine sem modelo de embeddings real nem chamadas ao LLM
+"""
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "sk-or-v1-test")
+
+from agent.feedback import embedding_provider
+from agent.feedback.ann_index import IVFIndex
+from agent.feedback.embedding_provider import EmbeddingProvider
+from agent.feedback.tfidf_embedder import HashedTfidfEmbedder
+from agent.feedback.rule_text_index import RuleTextIndex
+from agent.feedback.rule_partitions import protocol_partition
+from agent.feedback import memory_artifacts
+from agent.feedback.memory_store import MemoryStore
+from agent.feedback.migrate_to_store import migrate_to_store
+from agent.feedback.feedback_storage import FeedbackStorage
+from agent.feedback.memory_engine import MemoryEngine
+
+REPO_MEMORY_FILE = Path(__file__).resolve().parent.parent / "memory_qa.md"
+
+
+class FakeEmbedder:
+    """Embedder determinístico (bag-of-words com hashing) que conta chamadas."""
+
+    DIM = 64
+
+    def __init__(self):
+        self.calls = []
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.DIM] += 1.0
+        return vector
+
+    def encode(self, texts, convert_to_numpy=True, convert_to_tensor=False):
+        self.calls.append(texts)
+        if isinstance(texts, str):
+            return self._embed(texts)
+        return np.vstack([self._embed(text) for text in texts])
+
+
+class TestBatchSimilarity(unittest.TestCase):
+    """Caminho em lote de filter_suggestions."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.engine = MemoryEngine(memory_file=Path(self.tmp.name) / "memory_qa.md")
+        self.engine.embedder = FakeEmbedder()
+        self.engine.similarity_threshold = 0.8
+
+        self.engine.register_feedback(
+            {"id": "r1", "title": "Adicionar alerta de hipoglicemia", "description": "em idosos com sulfonilureia"},
+            "N", "", "proto", "model",
+        )
+        self.engine.register_feedback(
+            {"id": "a1", "title": "Solicitar ecocardiograma", "description": "na suspeita de valvopatia"},
+            "S", "", "proto", "model",
+        )
+        self.suggestions = [
+            {"id": "s1", "title": "Incluir alerta de hipoglicemia", "description": "em idosos com sulfonilureia"},
+            {"id": "s2", "title": "Solicitar ecocardiograma", "description": "na suspeita de valvopatia aórtica"},
+            {"id": "s3", "title": "Revisar dose de metformina", "description": "conforme função renal"},
+        ]
+
+    def test_one_encode_call_per_batch(self):
+        """Sugestões são codificadas em uma chamada; regras vêm do embedding store."""
+        # register_feedback já gravou o embedding de cada regra
+        calls_after_register = len(self.engine.embedder.calls)
+        self.assertEqual(calls_after_register, 2)
+
+        self.engine.filter_suggestions(self.suggestions)
+        self.engine.filter_suggestions([dict(s, id=s["id"] + "b", title=s["title"] + " x") for s in self.suggestions])
+
+        # Cada filtro: um único encode (das sugestões)
+        self.assertEqual(len(self.engine.embedder.calls), calls_after_register + 2)
+        self.assertTrue(all(isinstance(call, list) for call in self.engine.embedder.calls))
+
+    def test_rule_embeddings_persist_across_processes(self):
+        """Novo MemoryEngine carrega embeddings das regras do arquivo float16 (sem encode)."""
+        self.engine.save_memory()
+        self.assertTrue((Path(self.tmp.name) / "memory_rule_embeddings.f16").exists())
+
+        fresh = MemoryEngine(memory_file=Path(self.tmp.name) / "memory_qa.md")
+        fresh.embedder = FakeEmbedder()
+        fresh.similarity_threshold = 0.8
+        fresh.load_memory()
+        self.assertEqual(len(fresh.vector_index), 2)
+
+        filtered, _ = fresh.filter_suggestions(self.suggestions)
+
+        self.assertEqual(len(fresh.embedder.calls), 1)
+        self.assertEqual([s["id"] for s in filtered], ["s2", "s3"])
+
+    def test_filter_does_not_rewrite_memory_file(self):
+        """filter_suggestions é só leitura: memory_qa.md não é regravado."""
+        self.engine.save_memory(compact=True)
+        memory_file = Path(self.tmp.name) / "memory_qa.md"
+        before = (memory_file.read_text(encoding="utf-8"), memory_file.stat().st_mtime_ns)
+        # Sem journal, save_memory sempre reescreve o snapshot
+        self.engine.rules_journal = None
+        self.engine._vector_index_dirty = True
+
+        self.engine.filter_suggestions(self.suggestions)
+
+        self.assertEqual((memory_file.read_text(encoding="utf-8"), memory_file.stat().st_mtime_ns), before)
+
+    def test_batch_matches_per_pair_results(self):
+        """Caminho em lote produz o mesmo resultado e debug_info do cálculo por par."""
+        filtered, debug_info = self.engine.filter_suggestions(self.suggestions)
+
+        self.assertEqual([s["id"] for s in filtered], ["s2", "s3"])
+        self.assertEqual([m["suggestion_id"] for m in debug_info["semantic_matches"]], ["s1"])
+        self.assertEqual([m["suggestion_id"] for m in debug_info["reinforced_by_memory"]], ["s2"])
+
+        for match in debug_info["semantic_matches"]:
+            text = next(f"{s['title']}. {s['description']}" for s in self.suggestions
+                        if s["id"] == match["suggestion_id"])
+            _, pair_score = self.engine._semantic_similarity_filter(text, self.engine.rules_rejected)
+            self.assertAlmostEqual(match["similarity_score"], pair_score, places=5)
+
+
+
+class FakeSimilarityLLM:
+    """Substitui o LLMClient: devolve um score fixo para cada par do bloco."""
+
+    def __init__(self, score: float = 0.95):
+        self.score = score
+        self.prompts = []
+
+    async def _run_with_auto_continue_async(self, prompt, max_tokens=20000):
+        self.prompts.append(prompt)
+        return json.dumps([self.score] * prompt.count("PAIR "))
+
+
+class TestBatchedLLMSimilarity(unittest.TestCase):
+    """Fallback sem embeddings: pré-filtro local + LLM em blocos + cache em disco."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.memory_file = Path(self.tmp.name) / "memory_qa.md"
+        self.engine = self._engine(FakeSimilarityLLM())
+
+        self.suggestions = [
+            {"id": "s1", "title": "Incluir alerta hipoglicemia", "description": "pacientes idosos usando sulfonilureia"},
+            {"id": "s2", "title": "Revisar dose de metformina", "description": "conforme função renal"},
+        ]
+
+    def _engine(self, llm) -> MemoryEngine:
+        engine = MemoryEngine(memory_file=self.memory_file)
+        engine.embedder = None
+        engine.llm_client = llm
+        for i in range(30):
+            engine.register_feedback(
+                {"id": f"r{i}", "title": f"Tema clínico {i}", "description": f"assunto distinto número {i}"},
+                "N", "", "proto", "model",
+            )
+        engine.register_feedback(
+            {"id": "r-hipo", "title": "Adicionar alerta hipoglicemia", "description": "idosos usando sulfonilureia"},
+            "N", "", "proto", "model",
+        )
+        return engine
+
+    def test_only_shortlisted_pairs_reach_llm_in_one_request(self):
+        """Pares sem sobreposição de palavras não vão ao LLM; o resto vai em um bloco."""
+        filtered, debug_info = self.engine.filter_suggestions(self.suggestions)
+
+        self.assertEqual(len(self.engine.llm_client.prompts), 1)
+        self.assertEqual(self.engine.llm_client.prompts[0].count("PAIR "), 1)
+        self.assertEqual([s["id"] for s in filtered], ["s2"])
+        self.assertEqual(debug_info["semantic_matches"][0]["rule_id"], self.engine.rules_rejected[-1].rule_id)
+
+    def test_scores_are_cached_on_disk(self):
+        """Segunda execução (novo processo) reaproveita os scores sem chamar o LLM."""
+        self.engine.filter_suggestions(self.suggestions)
+        self.assertTrue((Path(self.tmp.name) / "memory_similarity_cache.json").exists())
+
+        fresh_llm = FakeSimilarityLLM()
+        fresh = self._engine(fresh_llm)
+        filtered, _ = fresh.filter_suggestions(self.suggestions)
+
+        self.assertEqual(fresh_llm.prompts, [])
+        self.assertEqual([s["id"] for s in filtered], ["s2"])
+
+
+
+class TestIVFIndex(unittest.TestCase):
+    """Índice aproximado sobre embeddings de regras."""
+
+    def test_search_finds_exact_neighbours(self):
+        """Consultas próximas de regras existentes recuperam o vizinho exato."""
+        rng = np.random.default_rng(0)
+        rules = rng.standard_normal((2000, 32)).astype(np.float32)
+        rules /= np.linalg.norm(rules, axis=1, keepdims=True)
+        queries = rules[:50] + rng.standard_normal((50, 32)).astype(np.float32) * 0.01
+
+        scores, ids = IVFIndex(n_probe=4).build(rules).search(queries, k=3)
+
+        self.assertEqual(ids.shape, (50, 3))
+        self.assertEqual(ids[:, 0].tolist(), list(range(50)))
+        self.assertTrue(np.all(np.diff(scores, axis=1) <= 0))
+
+
+
+class CountingProvider(EmbeddingProvider):
+    """Provider cujo carregamento devolve um FakeEmbedder e conta as cargas."""
+
+    loads = 0
+
+    def _load(self):
+        CountingProvider.loads += 1
+        return FakeEmbedder()
+
+
+class TestEmbeddingProvider(unittest.TestCase):
+    """Modelo de embeddings compartilhado e carregado sob demanda."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        CountingProvider.loads = 0
+        embedding_provider._provider = CountingProvider(enabled=True)
+        self.addCleanup(embedding_provider.reset_embedding_provider)
+
+    def test_engines_share_one_lazily_loaded_model(self):
+        """Construir MemoryEngine não carrega o modelo; o primeiro uso carrega uma vez."""
+        first = MemoryEngine(memory_file=Path(self.tmp.name) / "memory_qa.md")
+        second = MemoryEngine(memory_file=Path(self.tmp.name) / "memory_qa.md")
+        self.assertEqual(CountingProvider.loads, 0)
+
+        self.assertIs(first.embedder, second.embedder)
+        self.assertEqual(CountingProvider.loads, 1)
+
+    def test_background_load(self):
+        """Carregamento em fundo termina antes do primeiro uso."""
+        provider = embedding_provider.get_embedding_provider()
+        provider.start_background_load()
+        provider._thread.join(timeout=5)
+
+        self.assertTrue(provider.loaded)
+        self.assertIsNotNone(MemoryEngine(memory_file=Path(self.tmp.name) / "memory_qa.md").embedder)
+        self.assertEqual(CountingProvider.loads, 1)
+
+
+
+class TestTfidfBackend(unittest.TestCase):
+    """Backend offline de embeddings TF-IDF por n-gramas de caracteres."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.memory_file = Path(self.tmp.name) / "memory_qa.md"
+        embedding_provider._provider = EmbeddingProvider(backend="tfidf", enabled=True)
+        self.addCleanup(embedding_provider.reset_embedding_provider)
+
+    def test_encode_is_normalized_and_accent_insensitive(self):
+        """Vetores unitários; variações de grafia ficam próximas."""
+        embedder = HashedTfidfEmbedder(n_features=1024)
+        vectors = embedder.encode([
+            "Avaliar função renal antes da metformina",
+            "avaliar funcao renal antes da metformina",
+            "Solicitar ecocardiograma transtorácico",
+        ])
+
+        self.assertEqual(vectors.shape, (3, 1024))
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+        self.assertGreater(float(vectors[0] @ vectors[1]), 0.99)
+        self.assertLess(float(vectors[0] @ vectors[2]), 0.3)
+
+    def test_engine_uses_persisted_idf(self):
+        """IDF é ajustado nas regras, salvo ao lado da memória e reutilizado."""
+        engine = MemoryEngine(memory_file=self.memory_file)
+        for i, title in enumerate(["Adicionar alerta de hipoglicemia em idosos",
+                                   "Solicitar ecocardiograma na suspeita de valvopatia",
+                                   "Incluir orientação sobre hidratação"]):
+            engine.register_feedback({"id": f"r{i}", "title": title}, "N", "", "proto", "model")
+        engine.save_memory()
+
+        fresh = MemoryEngine(memory_file=self.memory_file)
+        fresh.load_memory()
+        model_id = fresh.embedding_model_name
+        self.assertTrue((Path(self.tmp.name) / "memory_tfidf_idf.npz").exists())
+        self.assertNotIn(":tf", model_id)
+
+        filtered, debug_info = fresh.filter_suggestions([
+            {"id": "s1", "title": "Adicionar alertas de hipoglicemia em idosos"},
+            {"id": "s2", "title": "Revisar dose de anticoagulante"},
+        ])
+
+        self.assertEqual([s["id"] for s in filtered], ["s2"])
+        self.assertEqual(debug_info["semantic_matches"][0]["suggestion_id"], "s1")
+        self.assertEqual(MemoryEngine(memory_file=self.memory_file).embedding_model_name, model_id)
+
+    def test_tfidf_backend_does_not_require_embeddings_enabled(self):
+        """embedding_backend: tfidf sozinho ativa o backend (sem sentence-transformers)."""
+        embedding_provider._provider = EmbeddingProvider(backend="tfidf", enabled=False)
+        engine = MemoryEngine(memory_file=self.memory_file)
+        engine.register_feedback({"id": "r1", "title": "Adicionar alerta de hipoglicemia em idosos"},
+                                 "N", "", "proto", "model")
+
+        filtered, debug_info = engine.filter_suggestions([
+            {"id": "s1", "title": "Adicionar alertas de hipoglicemia em idosos"},
+            {"id": "s2", "title": "Revisar dose de anticoagulante"},
+        ])
+
+        self.assertIs(engine.embedder, engine.tfidf_embedder)
+        self.assertEqual([s["id"] for s in filtered], ["s2"])
+        self.assertEqual(debug_info["semantic_matches"][0]["suggestion_id"], "s1")
+
+
+
+class TestRuleTextIndex(unittest.TestCase):
+    """Índice de match exato/substring equivale à varredura original."""
+
+    @staticmethod
+    def brute_force(suggestion, texts):
+        for position, text in enumerate(texts):
+            if suggestion == text:
+                return position
+            if len(suggestion) > 20 and len(text) > 20 and (suggestion in text or text in suggestion):
+                return position
+        return None
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        words = ["avaliar", "funcao", "renal", "dose", "alerta", "idosos", "em", "de", "ecg", "risco"]
+        texts = [" ".join(rng.choices(words, k=rng.randint(2, 9))) for _ in range(300)]
+        index = RuleTextIndex().build(texts)
+
+        queries = [" ".join(rng.choices(words, k=rng.randint(1, 12))) for _ in range(300)]
+        queries += [text[rng.randint(0, 5):] for text in rng.sample(texts, 50)]
+        queries += [f"{rng.choice(words)} {text} {rng.choice(words)}" for text in rng.sample(texts, 50)]
+        for query in queries:
+            self.assertEqual(index.match(query), self.brute_force(query, texts), query)
+
+
+
+class TestRulePartitions(unittest.TestCase):
+    """Filtro consulta só a partição do protocolo (+ globais e fallback)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.engine = MemoryEngine(memory_file=Path(self.tmp.name) / "memory_qa.md")
+        self.engine.embedder = FakeEmbedder()
+        self.engine.similarity_threshold = 0.8
+        for rule_id, title, protocol in [
+            ("r1", "Adicionar alerta de hipoglicemia em idosos", "amil_ficha_cardiologia_v2.0.0_12-12-2025-1024"),
+            ("r2", "Solicitar ecocardiograma na suspeita de valvopatia", "amil_ficha_orl_v1.0.5_07-12-2025-2154"),
+            ("r3", "Revisar dose de metformina conforme função renal", "Athena_Infertilidade_v0.5_21-11-2025-1127"),
+        ]:
+            self.engine.register_feedback({"id": rule_id, "title": title}, "N", "", protocol, "model")
+        self.suggestions = [
+            {"id": "s1", "title": "Adicionar alerta de hipoglicemia em idosos"},
+            {"id": "s2", "title": "Solicitar ecocardiograma na suspeita de valvopatia"},
+            {"id": "s3", "title": "Revisar dose de metformina conforme função renal"},
+        ]
+
+    def test_protocol_partition(self):
+        self.assertEqual(protocol_partition("amil_ficha_cardiologia_v2.0.0_12-12-2025-1024"),
+                         ("amil", "amil/ficha_cardiologia"))
+        self.assertEqual(protocol_partition("Athena_athena_tunel_do_carpo_v0.1.1_31-08-2025-1649"),
+                         ("athena", "athena/tunel_do_carpo"))
+        self.assertIsNone(protocol_partition("N/A"))
+
+    def _filtered_ids(self, fallback):
+        settings = {"partition_fallback": fallback}
+        with patch("agent.feedback.memory_engine._feedback_setting",
+                   side_effect=lambda name, default: settings.get(name, default)), \
+                patch.object(self.engine, "_exact_match_filter", return_value=None):
+            filtered, _ = self.engine.filter_suggestions(
+                self.suggestions, protocol_id="amil_ficha_cardiologia_v2.1.0_01-02-2026-0900"
+            )
+        return [s["id"] for s in filtered]
+
+    def test_fallback_scopes(self):
+        self.assertEqual(self._filtered_ids("none"), ["s2", "s3"])
+        self.assertEqual(self._filtered_ids("company"), ["s3"])
+        self.assertEqual(self._filtered_ids("all"), [])
+        # Sem protocolo: todas as regras, como antes
+        with patch.object(self.engine, "_exact_match_filter", return_value=None):
+            filtered, _ = self.engine.filter_suggestions(self.suggestions)
+        self.assertEqual(filtered, [])
+
+
+class TestMemoryArtifacts(unittest.TestCase):
+    """memory_qa.md compilado uma vez e reaproveitado enquanto não muda."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.memory_file = Path(self.tmp.name) / "memory_qa.md"
+        memory_artifacts.clear_memory_artifacts_cache()
+        self.addCleanup(memory_artifacts.clear_memory_artifacts_cache)
+
+    def test_cached_until_file_changes(self):
+        engine = MemoryEngine(memory_file=self.memory_file)
+        engine.register_feedback({"id": "r1", "title": "Adicionar alerta de hipoglicemia"}, "N", "", "proto", "model")
+        engine.save_memory()
+        with open(self.memory_file, 'a', encoding='utf-8') as f:
+            f.write("\n## Feedback - 2025-01-01 10:00\n\n- Total revisado: 10\n- Irrelevantes: 4\n")
+
+        first = memory_artifacts.load_memory_artifacts(self.memory_file)
+        self.assertIs(memory_artifacts.load_memory_artifacts(self.memory_file), first)
+        self.assertEqual(len(first.rules_rejected), 1)
+        self.assertEqual(first.session_stats, [{"total": 10, "irrelevant": 4}])
+
+        # Novo processo: cache em disco, sem reparsear
+        memory_artifacts.clear_memory_artifacts_cache()
+        with patch.object(memory_artifacts, "compile_memory", side_effect=AssertionError("recompiled")):
+            from_disk = memory_artifacts.load_memory_artifacts(self.memory_file)
+        self.assertEqual(from_disk, first)
+
+        # Escrita no arquivo invalida o cache
+        engine.register_feedback({"id": "r2", "title": "Solicitar ecocardiograma"}, "N", "", "proto", "model")
+        engine.save_memory(compact=True)
+        fresh = MemoryEngine(memory_file=self.memory_file)
+        fresh.load_memory()
+        self.assertEqual(len(fresh.rules_rejected), 2)
+
+    @unittest.skipUnless(REPO_MEMORY_FILE.exists(), "memory_qa.md do repositório ausente")
+    def test_reads_rule_blocks_in_repository_layout(self):
+        """Blocos "### NOME", linha em branco, ```json (formato do memory_qa.md e de save_memory) são lidos."""
+        content = REPO_MEMORY_FILE.read_text(encoding='utf-8')
+        # O formato real tem linha em branco entre título e bloco (o parser original não lia nada)
+        self.assertIn("### RULES_ACCEPTED\n\n```json\n", content)
+        self.memory_file.write_text(content, encoding='utf-8')
+
+        expected = {}
+        for name in ("RULES_ACCEPTED", "RULES_REJECTED"):
+            block = content.split(f"### {name}", 1)[1].split("```json\n", 1)[1].split("\n```", 1)[0]
+            expected[name] = json.loads(block)
+        self.assertTrue(expected["RULES_ACCEPTED"])
+
+        artifacts = memory_artifacts.load_memory_artifacts(self.memory_file)
+        self.assertEqual(artifacts.rules_accepted, expected["RULES_ACCEPTED"])
+        self.assertEqual(artifacts.rules_rejected, expected["RULES_REJECTED"])
+
+        engine = MemoryEngine(memory_file=self.memory_file)
+        engine.load_memory()
+        self.assertEqual(len(engine.rules_accepted), len(expected["RULES_ACCEPTED"]))
+        self.assertEqual(len(engine.rules_rejected), len(expected["RULES_REJECTED"]))
+
+
+
+class TestRulesJournal(unittest.TestCase):
+    """Backend markdown: regras no journal, snapshot reescrito só na compactação."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.memory_file = Path(self.tmp.name) / "memory_qa.md"
+        memory_artifacts.clear_memory_artifacts_cache()
+        self.addCleanup(memory_artifacts.clear_memory_artifacts_cache)
+
+    def test_append_replay_and_compaction(self):
+        engine = MemoryEngine(memory_file=self.memory_file)
+        engine.register_feedback({"id": "r1", "title": "Avaliar função renal antes da metformina"}, "N", "", "dm2", "m")
+        engine.save_memory()
+        snapshot = self.memory_file.read_text(encoding='utf-8')
+        journal = engine.rules_journal
+
+        # Regra nova: uma linha no journal, snapshot intacto
+        engine.register_feedback({"id": "r2", "title": "Solicitar ecocardiograma"}, "S", "", "icc", "m")
+        engine.save_memory()
+        self.assertEqual(self.memory_file.read_text(encoding='utf-8'), snapshot)
+        self.assertEqual([record["op"] for record in journal.read()], ["rule"])
+
+        # Novo processo: snapshot + replay do journal
+        fresh = MemoryEngine(memory_file=self.memory_file)
+        fresh.load_memory()
+        self.assertEqual([r.suggestion_id for r in fresh.rules_rejected], ["r1"])
+        self.assertEqual([r.suggestion_id for r in fresh.rules_accepted], ["r2"])
+
+        # Limiar de tamanho atingido: journal dobrado no snapshot
+        with patch("agent.feedback.memory_engine._feedback_setting",
+                   side_effect=lambda name, default: 1 if name == "journal_compact_bytes" else default):
+            fresh.save_memory()
+        self.assertEqual(journal.size(), 0)
+        self.assertIn("Solicitar ecocardiograma", self.memory_file.read_text(encoding='utf-8'))
+        reloaded = MemoryEngine(memory_file=self.memory_file)
+        reloaded.load_memory()
+        self.assertEqual([r.suggestion_id for r in reloaded.rules_accepted], ["r2"])
+
+
+class TestMemoryStore(unittest.TestCase):
+    """Backend SQLite: banco como fonte de verdade, memory_qa.md como export."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.memory_file = Path(self.tmp.name) / "memory_qa.md"
+        self.store = MemoryStore(Path(self.tmp.name) / "memory_qa.sqlite3")
+        self.addCleanup(self.store.close)
+
+    def test_engine_round_trip_through_store(self):
+        engine = MemoryEngine(memory_file=self.memory_file)
+        engine.store = self.store
+        engine.register_feedback({"id": "r1", "title": "Avaliar função renal antes da metformina"}, "N", "", "dm2", "m")
+        engine.register_feedback({"id": "r2", "title": "Solicitar ecocardiograma"}, "S", "", "icc", "m")
+
+        self.assertEqual([r["suggestion_id"] for r in self.store.query_rules(protocol_id="dm2")], ["r1"])
+        self.assertEqual([r["suggestion_id"] for r in self.store.search_rules("renal")], ["r1"])
+
+        engine.save_memory()
+        self.assertIn("Avaliar função renal", self.memory_file.read_text(encoding='utf-8'))
+
+        # Leitura vem do banco, não do export
+        self.memory_file.unlink()
+        fresh = MemoryEngine(memory_file=self.memory_file)
+        fresh.store = self.store
+        fresh.load_memory()
+        self.assertEqual([r.suggestion_id for r in fresh.rules_rejected], ["r1"])
+        self.assertEqual([r.suggestion_id for r in fresh.rules_accepted], ["r2"])
+
+    def test_migration_includes_pending_journal(self):
+        """Regras ainda só no journal (sem compactação) também são migradas."""
+        engine = MemoryEngine(memory_file=self.memory_file)
+        engine.store = None
+        engine.register_feedback({"id": "r1", "title": "Avaliar função renal"}, "N", "", "dm2", "m")
+        engine.save_memory(compact=True)
+        engine.register_feedback({"id": "r2", "title": "Revisar dose de insulina"}, "N", "", "dm2", "m")
+        engine.save_memory()
+        self.assertGreater(engine.rules_journal.size(), 0)
+
+        report = migrate_to_store(self.memory_file, self.store)
+
+        self.assertEqual(report["rules"], 2)
+        self.assertEqual(
+            sorted(r["suggestion_id"] for r in self.store.query_rules(decision="rejected")), ["r1", "r2"]
+        )
+
+    def test_feedback_storage_indexed_queries(self):
+        storage = FeedbackStorage(base_path=Path(self.tmp.name) / "sessions")
+        storage.store = self.store
+        storage.save_feedback_session({
+            "session_id": "fb-20251201-001",
+            "timestamp": "2025-12-01T10:00:00",
+            "protocol_name": "dm2",
+            "model_used": "m",
+            "suggestions_feedback": [
+                {"suggestion_id": "s1", "user_verdict": "relevant"},
+                {"suggestion_id": "s2", "user_verdict": "irrelevant", "user_comment": "fora do playbook"},
+            ],
+        })
+
+        self.assertEqual(len(storage.load_feedback_sessions(month="202512", protocol_name="dm2")), 1)
+        self.assertEqual(storage.load_feedback_sessions(month="202601"), [])
+        sessions = storage.query_feedback(verdict="irrelevant")
+        self.assertEqual([fb["suggestion_id"] for fb in sessions[0]["suggestions_feedback"]], ["s2"])
+        hits = self.store.query_suggestion_feedback(text="playbook")
+        self.assertEqual([(h["session_id"], h["suggestion_id"]) for h in hits], [("fb-20251201-001", "s2")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+Playbook Index Tests - Verificação de referências via índice do playbook
+Compara o índice com as buscas lineares que ele substitui
+"""
+import random
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from agent.core import playbook_cache, protocol_loader
+from agent.core import playbook_retrieval
+from agent.core.playbook_retrieval import chunk_playbook, scope_playbook_for_prompt, select_playbook_context
+from agent.validators import playbook_index
+from agent.validators.playbook_index import PlaybookIndex, get_playbook_index, tokenize
+from agent.validators.reference_validator import ReferenceValidator
+
+PLAYBOOK = (
+    "Pacientes com hipertensão estágio 2 devem iniciar terapia combinada. "
+    "Solicitar perfil lipídico anual em pacientes com dislipidemia. "
+    "Reavaliar a pressão arterial em quatro semanas após o ajuste da dose! "
+    "Em idosos frágeis, evitar metas pressóricas muito agressivas?"
+)
+
+
+def build_pdf(pages):
+    """PDF mínimo (uma linha de texto por página) para testar a extração."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    out, offsets = "%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+class TestPlaybookIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PlaybookIndex(PLAYBOOK)
+        self.normalized = " ".join(PLAYBOOK.lower().split())
+
+    def test_contains_phrase_matches_substring_search(self):
+        words = self.normalized.split()
+        rng = random.Random(7)
+        for _ in range(500):
+            size = rng.choice([5, 6])
+            start = rng.randrange(len(words) - size + 1)
+            phrase = list(words[start:start + size])
+            # Bordas cortadas no meio da palavra e palavras trocadas
+            if rng.random() < 0.5:
+                phrase[0] = phrase[0][rng.randrange(len(phrase[0])):]
+            if rng.random() < 0.5:
+                phrase[-1] = phrase[-1][:rng.randrange(1, len(phrase[-1]) + 1)]
+            if rng.random() < 0.3:
+                phrase[rng.randrange(size)] = rng.choice(words)
+            phrase = [word for word in phrase if word] or ["x"]
+            self.assertEqual(
+                self.index.contains_phrase(phrase), " ".join(phrase) in self.normalized, phrase
+            )
+
+    def test_best_overlap_matches_sentence_scan(self):
+        validator = ReferenceValidator(PLAYBOOK)
+        reference = tokenize("Reavaliar pressão arterial dos idosos após ajuste de dose")
+        expected = max(len(reference & tokenize(s)) for s in validator.playbook_sentences)
+        self.assertEqual(self.index.best_sentence_overlap(reference)[0], expected)
+        self.assertIs(validator.index, get_playbook_index(PLAYBOOK))
+
+
+class TestPlaybookCache(unittest.TestCase):
+    """Execução "quente" não reextrai nem renormaliza o playbook."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.playbook = Path(self.tmp.name) / "playbook.md"
+        self.playbook.write_text(PLAYBOOK, encoding="utf-8")
+        patcher = patch.object(playbook_cache, "resolve_cache_dir", return_value=Path(self.tmp.name) / "cache")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_warm_load_skips_extraction_and_preprocessing(self):
+        self.assertEqual(protocol_loader.load_playbook(str(self.playbook)), PLAYBOOK)
+
+        playbook_index._index_cache.clear()
+        playbook_index._preprocessed.clear()
+        failing = AssertionError("not cached")
+        with patch.object(protocol_loader, "_extract_playbook_text", side_effect=failing), \
+                patch.object(playbook_index, "preprocess_playbook", side_effect=failing):
+            content = protocol_loader.load_playbook(str(self.playbook))
+            index = get_playbook_index(content)
+        self.assertEqual(content, PLAYBOOK)
+        self.assertEqual(index.words, " ".join(PLAYBOOK.lower().split()).split())
+        self.assertEqual(index.sentences, playbook_index.split_sentences(PLAYBOOK))
+
+        # Conteúdo alterado: cache invalidado por mtime/tamanho
+        self.playbook.write_text(PLAYBOOK + " Nova recomendação sobre estatinas.", encoding="utf-8")
+        self.assertTrue(protocol_loader.load_playbook(str(self.playbook)).endswith("estatinas."))
+
+
+    def test_parallel_pdf_extraction_streams_pages_in_order(self):
+        pdf = Path(self.tmp.name) / "playbook.pdf"
+        pdf.write_bytes(build_pdf([
+            f"Pagina {number}. Solicitar perfil lipidico anual em pacientes com dislipidemia"
+            for number in range(12)
+        ]))
+        serial = protocol_loader._extract_playbook_text(pdf)
+
+        settings = {"pdf_workers": 2, "pdf_pages_per_task": 3, "pdf_parallel_min_bytes": 0}
+        with patch.object(protocol_loader, "_playbook_setting",
+                          side_effect=lambda name, default: settings.get(name, default)):
+            content = protocol_loader.load_playbook(str(pdf))
+        self.assertEqual(content, serial)
+        self.assertEqual(content.count("Pagina"), 12)
+        entry = playbook_cache.PlaybookCache(Path(self.tmp.name) / "cache").load(pdf, None)
+        self.assertEqual(entry["preprocessed"], playbook_index.preprocess_playbook(serial))
+
+    def test_pool_workers_parse_pdf_once(self):
+        """Cada worker abre o PdfReader uma vez, não uma vez por faixa de páginas."""
+        import PyPDF2
+        pdf = Path(self.tmp.name) / "playbook.pdf"
+        pdf.write_bytes(build_pdf([f"Pagina {number}" for number in range(12)]))
+        readers = []
+
+        def counting_reader(*args, **kwargs):
+            readers.append(args)
+            return real_reader(*args, **kwargs)
+
+        real_reader = PyPDF2.PdfReader
+        settings = {"pdf_workers": 2, "pdf_pages_per_task": 2, "pdf_parallel_min_bytes": 0}
+        # Threads no lugar de processos para contar as aberturas no mesmo processo
+        with patch.object(protocol_loader, "_playbook_setting",
+                          side_effect=lambda name, default: settings.get(name, default)), \
+                patch.object(protocol_loader, "ProcessPoolExecutor", ThreadPoolExecutor), \
+                patch.object(PyPDF2, "PdfReader", side_effect=counting_reader):
+            pages = list(protocol_loader._iter_pdf_pages(pdf))
+
+        self.assertEqual(pages, [f"Pagina {number}" for number in range(12)])
+        # 1 leitura no processo principal + 1 por worker (6 faixas de páginas)
+        self.assertEqual(len(readers), 3)
+
+
+
+class TestPlaybookRetrieval(unittest.TestCase):
+    """Contexto do prompt restrito aos chunks relevantes ao protocolo."""
+
+    SECTIONS = {
+        "Hipertensão": "Pacientes com hipertensão estágio 2 devem iniciar terapia combinada.",
+        "Dislipidemia": "Solicitar perfil lipídico anual em pacientes com dislipidemia.",
+        "Ombro": "Na dor no ombro, solicitar ultrassonografia apenas após falha do tratamento.",
+    }
+
+    def setUp(self):
+        self.playbook = "# Playbook\n\nIntrodução.\n\n" + "".join(
+            f"## {title}\n\n{text}\n\n" + "Texto complementar da seção. " * 20 + "\n\n"
+            for title, text in self.SECTIONS.items()
+        )
+        self.protocol = {"nodes": [{"data": {
+            "label": "Conduta",
+            "condutaDataNode": {"exame": [{"nome": "Perfil lipídico"}], "mensagem": [
+                {"nome": "Meta", "conteudo": "<p>Reavaliar dislipidemia</p>"}]},
+        }}]}
+
+    def test_chunks_are_literal_and_cover_playbook(self):
+        chunks = chunk_playbook(self.playbook, max_chars=300)
+        self.assertEqual("".join(chunk.text for chunk in chunks), self.playbook)
+        self.assertTrue(all(self.playbook[c.start:c.end] == c.text for c in chunks))
+
+    def test_top_chunks_for_protocol_within_budget(self):
+        context = select_playbook_context(self.playbook, self.protocol, top_k=1, token_budget=500)
+        self.assertEqual(len(context.chunk_ids), 1)
+        self.assertIn(self.SECTIONS["Dislipidemia"], context.text)
+        self.assertNotIn("ombro", context.text)
+        self.assertLessEqual(len(context.text), 500 * 4 + 50)
+
+        # Citação do contexto recortado é verificável no playbook completo
+        quote = self.SECTIONS["Dislipidemia"].lower().split()
+        self.assertTrue(PlaybookIndex(self.playbook).contains_phrase(quote[:6]))
+
+    def test_no_matching_chunk_falls_back_to_full_playbook(self):
+        """Sem chunk com score > 0 a seleção fica vazia e o prompt leva o playbook inteiro."""
+        empty_protocol = {"nodes": []}
+        self.assertEqual(select_playbook_context(self.playbook, empty_protocol).chunk_ids, [])
+
+        small_budget = lambda name, default: 100 if name == "playbook_retrieval_token_budget" else default
+        with patch.object(playbook_retrieval, "_analysis_setting", side_effect=small_budget):
+            text, context = scope_playbook_for_prompt(self.playbook, empty_protocol, enabled=True)
+        self.assertIsNone(context)
+        self.assertEqual(text, self.playbook)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,625 @@
+"""
+Protocol Reconstructor Tests - Reconstrução chunked
+Testes para o pipeline de seções do ProtocolReconstructor (sem chamadas reais ao LLM)
+"""
+import asyncio
+import copy
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# src/ no path (mesmo layout usado por run_agent.py)
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "sk-or-v1-test")
+
+from agent.applicator.json_patch import JsonPatchError, apply_patch
+from agent.applicator.protocol_reconstructor import ProtocolReconstructor
+from agent.applicator.reconstruction_cache import ReconstructionCache
+from agent.applicator.suggestion_router import SuggestionRouter
+from agent.core.protocol_projection import ProtocolProjection
+
+
+def get_minimal_protocol(node_count: int = 4) -> dict:
+    """Protocolo sintético: nós custom encadeados + um nó de conduta."""
+    nodes = []
+    for i in range(node_count - 1):
+        nodes.append({
+            "id": f"node-{i}",
+            "type": "custom",
+            "position": {"x": i * 100, "y": 0},
+            "data": {
+                "label": f"Coleta {i}",
+                "questions": [{
+                    "id": f"P{i}",
+                    "uid": f"pergunta_{i}",
+                    "nome": f"Pergunta {i}?",
+                    "select": "choice",
+                    "options": [{"id": f"opcao_{i}", "label": "Sim"}],
+                }],
+            },
+        })
+    nodes.append({
+        "id": "conduta-1",
+        "type": "conduct",
+        "position": {"x": node_count * 100, "y": 0},
+        "data": {
+            "label": "Conduta",
+            "condutaDataNode": {
+                "mensagem": [{"id": "msg-1", "nome": "Orientação", "conteudo": "Texto"}],
+                "exame": [],
+            },
+        },
+    })
+    edges = [
+        {"id": f"e{i}", "source": nodes[i]["id"], "target": nodes[i + 1]["id"]}
+        for i in range(len(nodes) - 1)
+    ]
+    return {
+        "metadata": {"company": "teste", "name": "protocolo_teste", "version": "1.0.0"},
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+class FakeSectionLLM:
+    """Substitui _reconstruct_section_llm_async devolvendo a seção inalterada."""
+
+    def __init__(self, delay: float = 0.0, fail_on: str = None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, section, new_version):
+        self.calls.append(section["section_id"])
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if section["section_id"] == self.fail_on:
+                raise RuntimeError("falha simulada")
+            if section["type"] == "metadata":
+                return dict(section["metadata"], version=new_version)
+            return copy.deepcopy(section["nodes"])
+        finally:
+            self.running -= 1
+
+
+class TestParallelReconstruction(unittest.TestCase):
+    """Reconstrução concorrente de seções."""
+
+    def setUp(self):
+        self.reconstructor = ProtocolReconstructor()
+
+    def test_parallel_sections_respect_worker_limit(self):
+        """Seções rodam em paralelo sem exceder max_workers."""
+        protocol = get_minimal_protocol(node_count=8)
+        sections = self.reconstructor._enumerate_sections(protocol, [])
+        statuses = self.reconstructor._track_section_progress(sections)
+        fake = FakeSectionLLM(delay=0.05)
+        self.reconstructor._reconstruct_section_llm_async = fake
+
+        asyncio.run(self.reconstructor._reconstruct_sections_parallel(
+            sections, statuses, "1.0.1", max_retries=1, max_workers=2
+        ))
+
+        self.assertEqual(len(fake.calls), len(sections))
+        self.assertLessEqual(fake.max_running, 2)
+        self.assertTrue(all(st.status == "completed" for st in statuses.values()))
+
+    def test_parallel_failure_cancels_outstanding_sections(self):
+        """Uma seção que esgota os retries cancela as pendentes (fail-fast)."""
+        protocol = get_minimal_protocol(node_count=8)
+        sections = self.reconstructor._enumerate_sections(protocol, [])
+        statuses = self.reconstructor._track_section_progress(sections)
+        failing_id = sections[0]["section_id"]
+        self.reconstructor._reconstruct_section_llm_async = FakeSectionLLM(delay=0.01, fail_on=failing_id)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(self.reconstructor._reconstruct_sections_parallel(
+                sections, statuses, "1.0.1", max_retries=1, max_workers=1
+            ))
+
+        self.assertEqual(statuses[failing_id].status, "failed")
+        self.assertTrue(any(st.status == "cancelled" for st in statuses.values()))
+
+
+class TestLocalSections(unittest.TestCase):
+    """Seções resolvidas sem LLM."""
+
+    def setUp(self):
+        self.reconstructor = ProtocolReconstructor()
+        self.reconstructor.section_cache = None
+
+    def test_metadata_and_untouched_sections_skip_llm(self):
+        """Metadata e seções sem sugestões não chamam o LLM."""
+        protocol = get_minimal_protocol(node_count=4)
+        suggestion = {
+            "id": "sug_001",
+            "title": "Adicionar opção",
+            "specific_location": {"node_id": "node-0"},
+        }
+        fake = FakeSectionLLM()
+        self.reconstructor._reconstruct_section_llm_async = fake
+
+        assembled = self.reconstructor._reconstruct_protocol_llm(protocol, [suggestion])
+
+        self.assertEqual(assembled["metadata"]["version"], "1.0.1")
+        self.assertEqual(len(fake.calls), 1)
+        stats = self.reconstructor.last_section_stats
+        self.assertEqual(stats["llm_sections"], 1)
+        self.assertEqual(stats["llm_calls_saved"], stats["sections_total"] - 1)
+
+
+class TestSuggestionRouter(unittest.TestCase):
+    """Roteamento sugestão -> nós."""
+
+    def setUp(self):
+        self.protocol = get_minimal_protocol(node_count=4)
+        self.router = SuggestionRouter(self.protocol)
+
+    def test_routes_by_identifiers_and_json_path(self):
+        """uid, opção, item de conduta e nodes[i] resolvem o nó dono."""
+        cases = [
+            ({"specific_location": {"question_id": "pergunta_1"}}, ["node-1"]),
+            ({"specific_location": {"node_id": "msg-1"}}, ["conduta-1"]),
+            ({"implementation_path": {"json_path": "nodes[2].data.questions[0]"}}, ["node-2"]),
+            ({"title": "Adicionar opção", "description": "Incluir alternativa após opcao_0"}, ["node-0"]),
+            ({"implementation_path": {"modification_type": "add_exam", "proposed_value": {"id": "ex-9"}}},
+             ["conduta-1"]),
+        ]
+        for suggestion, expected in cases:
+            self.assertEqual(self.router.route(suggestion), expected, suggestion)
+
+    def test_json_path_index_counts_nodes_without_id(self):
+        """nodes[i] segue as posições de protocol["nodes"], mesmo com nós sem id."""
+        self.protocol["nodes"].insert(1, {"type": "custom", "data": {}})
+        router = SuggestionRouter(self.protocol)
+
+        suggestion = {"implementation_path": {"json_path": "nodes[3].data.questions[0]"}}
+        self.assertEqual(router.route(suggestion), ["node-2"])
+        self.assertEqual(router.route({"implementation_path": {"json_path": "nodes[1].data"}}), [])
+
+    def test_unroutable_suggestions_fall_back_to_first_section(self):
+        """Sem nó identificável, a sugestão vai só para a primeira seção de nós."""
+        reconstructor = ProtocolReconstructor()
+        suggestions = [
+            {"id": "sug_001", "title": "Melhorar clareza geral"},
+            {"id": "sug_002", "title": "Ajustar", "specific_location": {"question_id": "pergunta_2"}},
+        ]
+
+        sections = reconstructor._enumerate_sections(self.protocol, suggestions)
+
+        routed = {
+            section["section_id"]: [s["id"] for s in section["relevant_suggestions"]]
+            for section in sections if section["type"] != "metadata"
+        }
+        self.assertEqual(sorted(sum(routed.values(), [])), ["sug_001", "sug_002"])
+        self.assertIn("sug_001", routed["section_1"])
+        self.assertEqual([s["id"] for s in reconstructor.last_unrouted_suggestions], ["sug_001"])
+
+
+class TestReconstructionCache(unittest.TestCase):
+    """Cache endereçado por conteúdo das seções concluídas."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.recorded = {}
+        self.protocol = get_minimal_protocol(node_count=4)
+        self.suggestions = [
+            {"id": "sug_001", "title": "Ajustar pergunta", "specific_location": {"node_id": "node-0"}},
+            {"id": "sug_002", "title": "Ajustar conduta", "specific_location": {"node_id": "conduta-1"}},
+        ]
+
+    def _reconstructor(self, fake: FakeSectionLLM) -> ProtocolReconstructor:
+        reconstructor = ProtocolReconstructor(
+            section_callback=lambda section_id, key: self.recorded.__setitem__(section_id, key)
+        )
+        reconstructor.section_cache = ReconstructionCache(self.tmp.name)
+        reconstructor._reconstruct_section_llm_async = fake
+        return reconstructor
+
+    def _split_sections(self, reconstructor: ProtocolReconstructor) -> None:
+        """Força um nó por seção para exercitar sucesso parcial."""
+        reconstructor._partition_nodes = lambda nodes, edges, budget: [[n] for n in nodes]
+
+    def test_rerun_after_failure_reuses_completed_sections(self):
+        """Seções concluídas antes da falha não voltam ao LLM."""
+        first = self._reconstructor(FakeSectionLLM(fail_on="section_4"))
+        self._split_sections(first)
+        with self.assertRaises(ValueError):
+            first._reconstruct_protocol_llm(self.protocol, self.suggestions)
+        self.assertEqual(len(self.recorded), 1)
+
+        fake = FakeSectionLLM()
+        second = self._reconstructor(fake)
+        self._split_sections(second)
+        assembled = second._reconstruct_protocol_llm(self.protocol, self.suggestions)
+
+        self.assertEqual(fake.calls, ["section_4"])
+        self.assertEqual(second.last_section_stats["cache_hits"], 1)
+        self.assertEqual(set(second.last_section_stats["cache_keys"]), {"section_1", "section_4"})
+        self.assertEqual(len(self.recorded), 2)
+        self.assertEqual(assembled["metadata"]["version"], "1.0.1")
+
+    def test_key_changes_with_model_and_suggestions(self):
+        """Outro modelo ou outras sugestões geram nova chave (sem hit)."""
+        fake = FakeSectionLLM()
+        self._reconstructor(fake)._reconstruct_protocol_llm(self.protocol, self.suggestions[:1])
+
+        other = self._reconstructor(fake)
+        other.model = "outro/modelo"
+        other._reconstruct_protocol_llm(self.protocol, self.suggestions[:1])
+
+        changed = self._reconstructor(fake)
+        changed._reconstruct_protocol_llm(
+            self.protocol, [dict(self.suggestions[0], title="Outra redação")]
+        )
+
+        self.assertEqual(len(fake.calls), 3)
+        self.assertEqual(changed.last_section_stats["cache_hits"], 0)
+
+
+class TestSectionPartitioner(unittest.TestCase):
+    """Empacotamento de nós por orçamento de tokens."""
+
+    def setUp(self):
+        self.reconstructor = ProtocolReconstructor()
+
+    def _node(self, node_id: str, chars: int) -> dict:
+        return {"id": node_id, "type": "custom", "position": {"x": 0, "y": 0},
+                "data": {"descricao": "x" * chars}}
+
+    def test_groups_respect_budget_and_prefer_adjacent_nodes(self):
+        """Nós conectados são agrupados; o orçamento não é excedido."""
+        nodes = [self._node("a", 400), self._node("b", 400), self._node("c", 400), self._node("d", 400)]
+        edges = [{"source": "a", "target": "c"}, {"source": "b", "target": "d"}]
+        budget = self.reconstructor._estimate_node_tokens(nodes[0]) * 2
+
+        groups = self.reconstructor._partition_nodes(nodes, edges, budget)
+
+        self.assertEqual([[n["id"] for n in g] for g in groups], [["a", "c"], ["b", "d"]])
+
+    def test_oversized_node_gets_its_own_section(self):
+        """Nó maior que o orçamento fica sozinho; nós pequenos são agrupados."""
+        nodes = [self._node("big", 4000), self._node("s1", 40), self._node("s2", 40)]
+        groups = self.reconstructor._partition_nodes(nodes, [], token_budget=200)
+
+        self.assertEqual([[n["id"] for n in g] for g in groups], [["big"], ["s1", "s2"]])
+
+
+class TestNodeChunking(unittest.TestCase):
+    """Divisão de nós de conduta grandes em chunks de itens."""
+
+    def setUp(self):
+        self.reconstructor = ProtocolReconstructor()
+        self.node = {
+            "id": "conduta-1",
+            "type": "conduct",
+            "position": {"x": 0, "y": 0},
+            "data": {
+                "label": "Conduta",
+                "descricao": "",
+                "condutaDataNode": {
+                    "exame": [{"id": f"ex-{i}", "nome": f"Exame {i}", "alerta": "x" * 200} for i in range(6)],
+                    "mensagem": [{"id": f"msg-{i}", "nome": f"Mensagem {i}", "conteudo": "y" * 200} for i in range(6)],
+                },
+            },
+        }
+        self.section = {
+            "section_id": "section_1",
+            "type": "nodes",
+            "node_ids": {"conduta-1"},
+            "nodes": [self.node],
+            "edges": [],
+            "relevant_suggestions": [{"id": "sug_001", "description": "Revisar alerta do Exame 4"}],
+            "metadata_context": {},
+        }
+
+    def test_oversized_node_is_split_and_merged_in_order(self):
+        """Só o chunk citado recebe a sugestão; a remontagem preserva a ordem dos itens."""
+        chunks = self.reconstructor._split_oversized_section(self.section, token_budget=200)
+
+        self.assertGreater(len(chunks), 2)
+        touched = [c for c in chunks if c["relevant_suggestions"]]
+        self.assertEqual(len(touched), 1)
+        self.assertIn("ex-4", touched[0]["item_ids"])
+
+        statuses = self.reconstructor._track_section_progress(chunks)
+        for chunk in chunks:
+            statuses[chunk["section_id"]].status = "completed"
+            statuses[chunk["section_id"]].reconstructed_data = copy.deepcopy(chunk["nodes"])
+            valid, error = self.reconstructor._validate_section(chunk, chunk["nodes"])
+            self.assertTrue(valid, error)
+
+        merged = self.reconstructor._merge_node_chunks(chunks, statuses)
+
+        self.assertEqual(list(merged.keys()), ["section_1"])
+        self.assertEqual(merged["section_1"].reconstructed_data, [self.node])
+
+    def test_suggestion_routing_matches_whole_identifiers(self):
+        """"msg-5"/"Exame 4" não casam com "msg-50"/"Exame 40": a sugestão fica no chunk 0."""
+        self.section["relevant_suggestions"] = [
+            {"id": "sug_002", "description": "Revisar msg-50 e o alerta do Exame 40"}
+        ]
+        chunks = self.reconstructor._split_oversized_section(self.section, token_budget=200)
+
+        touched = [c["chunk_index"] for c in chunks if c["relevant_suggestions"]]
+        self.assertEqual(touched, [0])
+
+    def test_chunk_validation_detects_missing_items(self):
+        """Chunk reconstruído sem um item original é inválido."""
+        chunk = self.reconstructor._split_oversized_section(self.section, token_budget=200)[1]
+        partial = copy.deepcopy(chunk["nodes"][0])
+        for items in partial["data"]["condutaDataNode"].values():
+            items.pop()
+
+        valid, error = self.reconstructor._validate_section(chunk, [partial])
+        self.assertFalse(valid)
+        self.assertIn("Item ID mismatch", error)
+
+
+class TestSectionPatch(unittest.TestCase):
+    """Reconstrução em modo JSON Patch."""
+
+    def setUp(self):
+        self.reconstructor = ProtocolReconstructor()
+        protocol = get_minimal_protocol(node_count=4)
+        self.section = {
+            "section_id": "section_1",
+            "type": "nodes",
+            "node_ids": {"node-2", "conduta-1"},
+            "nodes": protocol["nodes"][2:],
+            "edges": [],
+            "relevant_suggestions": [],
+            "metadata_context": protocol["metadata"],
+        }
+
+    def test_apply_patch_is_atomic(self):
+        """Patch com operação inválida não altera o documento."""
+        document = {"a": [1, 2]}
+        with self.assertRaises(JsonPatchError):
+            apply_patch(document, [
+                {"op": "add", "path": "/a/-", "value": 3},
+                {"op": "remove", "path": "/missing"},
+            ])
+        self.assertEqual(document, {"a": [1, 2]})
+
+    def test_section_patch_appends_message(self):
+        """Operação add em condutaDataNode é aplicada localmente."""
+        nodes = self.reconstructor._apply_section_patch(self.section, [{
+            "op": "add",
+            "path": "/conduta-1/data/condutaDataNode/mensagem/-",
+            "value": {"id": "msg-2", "nome": "Alerta", "conteudo": "<p>Novo</p>"},
+        }])
+
+        self.assertEqual([n["id"] for n in nodes], ["node-2", "conduta-1"])
+        mensagens = nodes[1]["data"]["condutaDataNode"]["mensagem"]
+        self.assertEqual([m["id"] for m in mensagens], ["msg-1", "msg-2"])
+        # Nós originais não são alterados
+        self.assertEqual(len(self.section["nodes"][1]["data"]["condutaDataNode"]["mensagem"]), 1)
+
+    def test_section_patch_rejects_out_of_scope_paths(self):
+        """Paths fora dos nós da seção ou que alteram o id são rejeitados."""
+        for operation in (
+            {"op": "replace", "path": "/node-0/data/label", "value": "x"},
+            {"op": "replace", "path": "/node-2/id", "value": "node-99"},
+            {"op": "remove", "path": "/conduta-1"},
+        ):
+            with self.assertRaises(JsonPatchError):
+                self.reconstructor._apply_section_patch(self.section, [operation])
+
+    def test_patch_prompt_includes_retry_error(self):
+        """Nova tentativa em modo patch recebe o erro de validação anterior."""
+        first = self.reconstructor._build_section_patch_prompt(self.section, "1.0.1")
+        self.section["_retry_context"] = {
+            "attempt": 2, "last_error": "Missing node IDs: conduta-1", "instruction": "Fix it."
+        }
+        retry = self.reconstructor._build_section_patch_prompt(self.section, "1.0.1")
+
+        self.assertNotIn("RETRY ATTEMPT", first)
+        self.assertIn("RETRY ATTEMPT #2", retry)
+        self.assertIn("Missing node IDs: conduta-1", retry)
+
+
+NODE_UUID = "node-219cf8a0-e2da-4754-8195-91f05e215523"
+QUESTION_UUID = "Pd87f935c-6aa2-44a4-8af4-e03c26a6e3bb"
+
+
+def get_uuid_protocol() -> dict:
+    """Protocolo sintético com IDs UUID, iid nas opções e templateMarkdown."""
+    protocol = get_minimal_protocol(node_count=4)
+    node = protocol["nodes"][2]
+    node["id"] = NODE_UUID
+    node["data"]["descricao"] = ""
+    node["data"]["templateMarkdown"] = "<p>  template  </p>"
+    question = node["data"]["questions"][0]
+    question.update({"id": QUESTION_UUID, "nodeId": NODE_UUID})
+    question["options"] = [
+        {"iid": "a60bb34f-2880-4875-8c87-0e53887b07f7", "id": "sim", "label": "Sim"},
+        {"iid": "c5d23210-5c39-4da3-b2e9-49a5c3b631d5", "id": "nao", "label": "Não"},
+    ]
+    protocol["edges"][1]["target"] = NODE_UUID
+    protocol["edges"][2]["source"] = NODE_UUID
+    protocol["edges"][2]["id"] = f"e-{NODE_UUID}-conduta-1"
+    return protocol
+
+
+class FakePatchLLM:
+    """LLM falso: guarda o prompt e devolve um patch fixo."""
+
+    def __init__(self, patch):
+        self.patch = patch
+        self.prompts = []
+
+    async def analyze_async(self, prompt):
+        self.prompts.append(prompt)
+        return {"patch": copy.deepcopy(self.patch)}
+
+
+class TestProtocolProjection(unittest.TestCase):
+    """Projeção compacta do protocolo nos prompts."""
+
+    def test_projection_is_compact_and_reversible(self):
+        """Campos de interface, vazios e UUIDs saem; restore reconstrói o original."""
+        protocol = get_uuid_protocol()
+        projection = ProtocolProjection(protocol)
+        compact = projection.to_json()
+
+        for removed in ("position", "iid", "templateMarkdown", "descricao", NODE_UUID, QUESTION_UUID, "\n"):
+            self.assertNotIn(removed, compact)
+        node_alias = projection.alias(NODE_UUID)
+        self.assertEqual(projection.data["nodes"][2]["id"], node_alias)
+        self.assertEqual(projection.data["edges"][2], {"source": node_alias, "target": projection.alias("conduta-1")})
+        # uid e id das opções são referenciados pelas expressões: ficam inalterados
+        self.assertIn('"uid":"pergunta_2"', compact)
+
+        self.assertEqual(projection.restore(json.loads(compact)), protocol)
+        suggestion = {"specific_location": {"node_id": node_alias}, "implementation_path": {
+            "json_path": f"nodes[?id=={node_alias}].data.questions"}}
+        restored = projection.restore_ids(suggestion)
+        self.assertEqual(restored["specific_location"]["node_id"], NODE_UUID)
+        self.assertEqual(restored["implementation_path"]["json_path"], f"nodes[?id=={NODE_UUID}].data.questions")
+
+    def test_section_patch_on_aliases_keeps_dropped_fields(self):
+        """Patch gerado sobre a projeção é traduzido e preserva iid/templateMarkdown."""
+        protocol = get_uuid_protocol()
+        section = {
+            "section_id": "section_1",
+            "type": "nodes",
+            "node_ids": {NODE_UUID, "conduta-1"},
+            "nodes": protocol["nodes"][2:],
+            "edges": protocol["edges"][2:],
+            "relevant_suggestions": [{"id": "sug_001", "specific_location": {"node_id": NODE_UUID}}],
+            "metadata_context": protocol["metadata"],
+        }
+        projection = ProtocolProjection(section["nodes"])
+        alias = projection.alias(NODE_UUID)
+        options = projection.data[0]["data"]["questions"][0]["options"]
+        reconstructor = ProtocolReconstructor()
+        reconstructor.llm_client = FakePatchLLM([
+            {"op": "replace", "path": f"/{alias}/data/questions/0/options",
+             "value": [dict(options[0], label="Sim (confirmado)"), options[1]]},
+            {"op": "replace", "path": f"/{alias}/data/descricao", "value": "Atualizado"},
+        ])
+
+        nodes = asyncio.run(reconstructor._reconstruct_section_patch_async(section, "1.0.1"))
+
+        prompt = reconstructor.llm_client.prompts[0]
+        self.assertNotIn(NODE_UUID, prompt)
+        self.assertIn(f"Target Node: {alias}", prompt)
+        node = nodes[0]
+        self.assertEqual(node["id"], NODE_UUID)
+        self.assertEqual(node["position"], protocol["nodes"][2]["position"])
+        self.assertEqual(node["data"]["templateMarkdown"], "<p>  template  </p>")
+        self.assertEqual(node["data"]["descricao"], "Atualizado")
+        new_options = node["data"]["questions"][0]["options"]
+        self.assertEqual([o["iid"] for o in new_options],
+                         [o["iid"] for o in protocol["nodes"][2]["data"]["questions"][0]["options"]])
+        self.assertEqual(new_options[0]["label"], "Sim (confirmado)")
+
+    def test_restore_ids_translates_aliases_in_free_text(self):
+        """Aliases em títulos, justificativas e valores serializados voltam ao ID original."""
+        protocol = get_uuid_protocol()
+        protocol["nodes"][0]["data"]["label"] = "Referência @N1"
+        projection = ProtocolProjection(protocol)
+        node_alias = projection.alias(NODE_UUID)
+        question_alias = projection.alias(QUESTION_UUID)
+        # "@N1" já aparece no texto do protocolo: não vira alias
+        self.assertNotIn("@N1", projection.aliases)
+
+        restored = projection.restore_ids({
+            "title": f"Ajustar pergunta {question_alias} do nó {node_alias}",
+            "proposed_value": json.dumps({"node": node_alias}),
+        })
+
+        self.assertEqual(restored["title"], f"Ajustar pergunta {QUESTION_UUID} do nó {NODE_UUID}")
+        self.assertEqual(json.loads(restored["proposed_value"]), {"node": NODE_UUID})
+
+    def test_restore_ids_keeps_clinical_text(self):
+        """Texto clínico com N1/I2/Q1 (sem "@") não é confundido com aliases."""
+        protocol = get_uuid_protocol()
+        protocol["nodes"][3]["data"]["condutaDataNode"]["mensagem"][0]["id"] = (
+            "expr-24f06be2-8a0e-4b8e-9d51-3c1f0f6b2a11"
+        )
+        projection = ProtocolProjection(protocol)
+        self.assertTrue(all(alias.startswith("@") for alias in projection.aliases))
+        text = "Recomendação classe I1, nível B; estadiamento N1 e I2 (ver Q1 e N2)."
+        suggestion = {
+            "title": text,
+            "description": text,
+            "playbook_reference": f'"{text}"',
+            "specific_location": {"node_id": projection.alias(NODE_UUID)},
+        }
+
+        restored = projection.restore_ids(suggestion)
+
+        self.assertEqual(restored["title"], text)
+        self.assertEqual(restored["description"], text)
+        self.assertEqual(restored["playbook_reference"], f'"{text}"')
+        self.assertEqual(restored["specific_location"]["node_id"], NODE_UUID)
+
+    def test_section_projection_reuses_protocol_aliases(self):
+        """A seção usa os mesmos aliases da projeção do protocolo inteiro (análise)."""
+        protocol = get_uuid_protocol()
+        analysis_projection = ProtocolProjection(protocol)
+        reconstructor = ProtocolReconstructor()
+        reconstructor._protocol_projection = ProtocolProjection(protocol)
+        section = {"type": "nodes", "nodes": protocol["nodes"][2:]}
+
+        projection = reconstructor._section_projection(section)
+
+        self.assertEqual(projection.data[0]["id"], analysis_projection.alias(NODE_UUID))
+        self.assertEqual(projection.alias("conduta-1"), analysis_projection.alias("conduta-1"))
+        self.assertEqual(projection.restore_ids(analysis_projection.alias(QUESTION_UUID)), QUESTION_UUID)
+
+    def test_new_elements_get_derived_fields(self):
+        """Perguntas/opções novas (patch add ou reemissão) recebem nodeId e iid."""
+        protocol = get_uuid_protocol()
+        section = {
+            "section_id": "section_1",
+            "type": "nodes",
+            "node_ids": {NODE_UUID, "conduta-1"},
+            "nodes": protocol["nodes"][2:],
+            "edges": protocol["edges"][2:],
+            "relevant_suggestions": [{"id": "sug_001", "specific_location": {"node_id": NODE_UUID}}],
+            "metadata_context": protocol["metadata"],
+        }
+        projection = ProtocolProjection(section["nodes"])
+        alias = projection.alias(NODE_UUID)
+        new_question = {"id": "P_nova", "uid": "pergunta_nova", "nome": "Nova?", "select": "choice",
+                        "options": [{"id": "sim", "label": "Sim"}]}
+        reconstructor = ProtocolReconstructor()
+        reconstructor.llm_client = FakePatchLLM([
+            {"op": "add", "path": f"/{alias}/data/questions/-", "value": new_question},
+        ])
+
+        nodes = asyncio.run(reconstructor._reconstruct_section_patch_async(section, "1.0.1"))
+
+        added = nodes[0]["data"]["questions"][-1]
+        self.assertEqual(added["nodeId"], NODE_UUID)
+        self.assertTrue(added["options"][0]["iid"])
+
+        # Reemissão: pergunta nova sem par no original
+        emitted = json.loads(projection.to_json())
+        emitted[0]["data"]["questions"].append(copy.deepcopy(new_question))
+        restored = projection.restore(emitted)
+        self.assertEqual(restored[0]["data"]["questions"][0], protocol["nodes"][2]["data"]["questions"][0])
+        self.assertEqual(restored[0]["data"]["questions"][1]["nodeId"], NODE_UUID)
+        self.assertTrue(restored[0]["data"]["questions"][1]["options"][0]["iid"])
+        # Protocolo sem nodeId nas perguntas: nada é inventado
+        self.assertNotIn("nodeId", ProtocolProjection(protocol["nodes"][:1]).restore(
+            [dict(protocol["nodes"][0], data=dict(protocol["nodes"][0]["data"], questions=[new_question]))]
+        )[0]["data"]["questions"][0])
+
+
+if __name__ == '__main__':
+    unittest.main()